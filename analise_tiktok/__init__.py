@@ -0,0 +1,11 @@
+"""
+ANALISE_TIKTOK: Leitura e análise das capturas do Zeeschuimer (TikTok)
+
+Módulos reutilizados por aula_04/, aula_05/ e projeto2/. Os scripts e
+notebooks são executados de dentro da própria pasta, então adicionam a raiz
+do repositório ao `sys.path` antes de importar daqui:
+
+    import sys
+    sys.path.append("..")
+    from analise_tiktok.leitura import ler_ndjson
+"""
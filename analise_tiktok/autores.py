@@ -0,0 +1,158 @@
+"""
+TABELA DE ENGAJAMENTO POR AUTOR, CALCULADA UMA VEZ
+
+A aula_05 e o projeto2 repetem `groupby('author.uniqueId')` para cada
+métrica (médias, medianas, contagens, comentários por like, seguidores),
+chamando `pd.to_numeric` de novo antes de cada um. `agregar_autores` faz
+tudo em uma passada agrupada, com os nomes de coluna do projeto2:
+
+    posts, likes_media, likes_mediana, comentarios_media, ...,
+    media_prop_comments_por_like, qtd_posts_validos, seguidores
+
+`TabelaAutores` guarda o resultado ao lado do cache das capturas
+(`.cache_tiktok/autores/`) e o mantém em dia quando chegam posts novos:
+
+- autores.parquet: a tabela pronta, lida direto pelas análises
+- posts.parquet: só as colunas usadas na conta, um retrato por vídeo (as
+  medianas não se atualizam sem os valores)
+- capturas.json: impressão digital das capturas já incluídas
+
+Posts novos (ou retratos mais recentes de vídeos já vistos) só fazem
+recalcular as linhas dos autores deles.
+
+Uso:
+
+    autores = TabelaAutores.da_captura("../bases/jiujitsu.ndjson")
+    autores.atualizar_captura("../bases/jiujitsu.ndjson")   # só lê se mudou
+    autores.ler().sort_values("likes_media", ascending=False).head(20)
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .cache import PASTA_CACHE, CacheDatasets
+from .esquema import concatenar
+from .historico import gravar_parquet
+from .ingestao import COLUNA_COLETA, manter_mais_recente
+
+COLUNA_AUTOR = "author.uniqueId"
+COLUNA_SEGUIDORES = "authorStats.followerCount"
+METRICAS: Dict[str, str] = {
+    "likes": "statsV2.diggCount",
+    "comentarios": "statsV2.commentCount",
+    "compart": "statsV2.shareCount",
+    "plays": "statsV2.playCount",
+}
+PROPORCAO = "prop_comments_por_like"
+COLUNAS_POSTS = ["id", COLUNA_AUTOR, *METRICAS.values(), COLUNA_SEGUIDORES]
+
+
+def agregar_autores(df: pd.DataFrame, autor: str = COLUNA_AUTOR,
+                    seguidores: str = COLUNA_SEGUIDORES) -> pd.DataFrame:
+    """
+    Uma linha por autor: número de posts; média e mediana de likes,
+    comentários, compartilhamentos e plays; média de comentários por like
+    (posts sem like ficam de fora) e quantos posts entraram nela; maior
+    número de seguidores visto
+    """
+    # Converte cada coluna uma vez só
+    numeros = pd.DataFrame({nome: pd.to_numeric(df[coluna], errors="coerce").astype("float64")
+                            for nome, coluna in METRICAS.items()}, index=df.index)
+    numeros[PROPORCAO] = (numeros["comentarios"] / numeros["likes"]).where(numeros["likes"] > 0)
+    numeros["seguidores"] = (pd.to_numeric(df[seguidores], errors="coerce").astype("float64")
+                             if seguidores in df.columns else np.nan)
+
+    agregacoes = {"posts": ("likes", "size")}
+    for nome in METRICAS:
+        agregacoes[f"{nome}_media"] = (nome, "mean")
+        agregacoes[f"{nome}_mediana"] = (nome, "median")
+    agregacoes["media_prop_comments_por_like"] = (PROPORCAO, "mean")
+    agregacoes["qtd_posts_validos"] = (PROPORCAO, "count")
+    agregacoes["seguidores"] = ("seguidores", "max")
+    tabela = numeros.groupby(df[autor].astype("str"), sort=False).agg(**agregacoes)
+    return tabela.rename_axis(autor).sort_index()
+
+
+class TabelaAutores:
+    """Agregados por autor guardados em Parquet e atualizados aos poucos"""
+
+    def __init__(self, pasta: Union[str, Path]):
+        self.pasta = Path(pasta)
+        self.arquivo_tabela = self.pasta / "autores.parquet"
+        self.arquivo_posts = self.pasta / "posts.parquet"
+        self.arquivo_capturas = self.pasta / "capturas.json"
+
+    @classmethod
+    def da_captura(cls, caminho: Union[str, Path]) -> "TabelaAutores":
+        """A tabela da pasta de uma captura (no cache, ao lado do NDJSON)"""
+        return cls(Path(caminho).resolve().parent / PASTA_CACHE / "autores")
+
+    def ler(self) -> pd.DataFrame:
+        """A tabela por autor (vazia se nada foi registrado)"""
+        if not self.arquivo_tabela.exists():
+            return agregar_autores(pd.DataFrame(columns=COLUNAS_POSTS))
+        return pd.read_parquet(self.arquivo_tabela).set_index(COLUNA_AUTOR)
+
+    def posts(self) -> pd.DataFrame:
+        """Os posts usados na conta (um retrato por vídeo)"""
+        if not self.arquivo_posts.exists():
+            return pd.DataFrame(columns=COLUNAS_POSTS)
+        return pd.read_parquet(self.arquivo_posts)
+
+    def atualizar(self, novos: pd.DataFrame) -> int:
+        """
+        Inclui os posts de `novos` (com COLUNAS_POSTS; com timestamp_collected,
+        vale o retrato mais recente de cada vídeo; sem, o de `novos`).
+        Recalcula só os autores desses posts e devolve quantos foram.
+        """
+        colunas = [c for c in COLUNAS_POSTS + [COLUNA_COLETA] if c in novos.columns]
+        novos = novos[colunas]
+        antigos = self.posts()
+        if len(antigos):
+            todos = concatenar([antigos, novos])
+            if COLUNA_COLETA in todos.columns and todos[COLUNA_COLETA].notna().all():
+                todos = manter_mais_recente(todos)
+            else:
+                todos = todos.drop_duplicates("id", keep="last").reset_index(drop=True)
+        else:
+            todos = novos.drop_duplicates("id", keep="last").reset_index(drop=True)
+
+        # Autores dos posts novos e, se um vídeo mudou de dono, o dono anterior
+        afetados = set(novos[COLUNA_AUTOR].astype("str"))
+        if len(antigos):
+            mudaram = antigos[antigos["id"].isin(novos["id"])]
+            afetados |= set(mudaram[COLUNA_AUTOR].astype("str"))
+        autores = todos[COLUNA_AUTOR].astype("str")
+        recalculados = agregar_autores(todos[autores.isin(afetados)])
+        tabela = self.ler()
+        tabela = pd.concat([tabela[~tabela.index.isin(afetados)], recalculados]).sort_index()
+
+        gravar_parquet(todos, self.arquivo_posts)
+        gravar_parquet(tabela.reset_index(), self.arquivo_tabela)
+        return len(afetados)
+
+    def _capturas(self) -> dict:
+        if not self.arquivo_capturas.exists():
+            return {}
+        return json.loads(self.arquivo_capturas.read_text())
+
+    def atualizar_captura(self, caminho: Union[str, Path], cache: Optional[CacheDatasets] = None) -> int:
+        """
+        Inclui uma captura do Zeeschuimer (lida pelo cache de datasets), a
+        não ser que esta mesma versão dela já tenha sido incluída
+        """
+        cache = cache or CacheDatasets()
+        chave = str(Path(caminho).resolve())
+        digital = cache.impressao_digital(caminho)
+        capturas = self._capturas()
+        if capturas.get(chave) == digital:
+            return 0
+        afetados = self.atualizar(cache.carregar(caminho, COLUNAS_POSTS, metadados=[COLUNA_COLETA]))
+        capturas[chave] = digital
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.arquivo_capturas.write_text(json.dumps(capturas, indent=1))
+        return afetados
@@ -0,0 +1,181 @@
+"""
+CACHE PARQUET DAS CAPTURAS JÁ LIDAS
+
+Cada script ou notebook lia e normalizava o mesmo `bases/*.ndjson` do
+zero. O `CacheDatasets` guarda o DataFrame já lido e tipado em Parquet e,
+nas próximas vezes, lê o Parquet (colunar e comprimido) no lugar do NDJSON.
+
+- Um arquivo por captura + combinação de colunas:
+  `<pasta do ndjson>/.cache_tiktok/<nome>-<chave>.parquet`
+- A chave é o caminho do NDJSON, as colunas, os tipos e a versão do formato
+- Dentro do Parquet vai a impressão digital do NDJSON (tamanho e mtime, ou
+  um hash do conteúdo com `verificar_conteudo=True`). Se o NDJSON mudou, o
+  cache é refeito e sobrescrito sozinho
+- `estatisticas` conta acertos, faltas e invalidações
+
+Uso:
+
+    dados = carregar_ndjson("../bases/israel.ndjson")   # 1ª vez: NDJSON
+    dados = carregar_ndjson("../bases/israel.ndjson")   # depois: Parquet
+
+    cache = CacheDatasets(verificar_conteudo=True)
+    dados = cache.carregar(caminho, colunas=["id", "statsV2.playCount"])
+    print(cache.estatisticas)
+"""
+
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .esquema import TIPOS_COMPACTOS
+from .leitura import COLUNAS_TIKTOK, TAMANHO_BLOCO, ler_ndjson
+
+VERSAO = 1  # mude se o formato do cache mudar
+PASTA_CACHE = ".cache_tiktok"
+CHAVE_METADADOS = b"analise_tiktok.origem"
+
+
+def hash_do_arquivo(caminho: Union[str, Path], tamanho_leitura: int = 1 << 20) -> str:
+    """blake2b do conteúdo, lido aos pedaços"""
+    resumo = hashlib.blake2b(digest_size=16)
+    with open(caminho, "rb") as arquivo:
+        while pedaco := arquivo.read(tamanho_leitura):
+            resumo.update(pedaco)
+    return resumo.hexdigest()
+
+
+def _listas(serie: pd.Series) -> pd.Series:
+    # O Parquet devolve listas como arrays do NumPy; as aulas esperam listas
+    return pd.Series([v.tolist() if isinstance(v, np.ndarray) else v for v in serie.tolist()],
+                     index=serie.index, dtype=object, name=serie.name)
+
+
+class CacheDatasets:
+    """
+    Cache em Parquet dos DataFrames lidos com `ler_ndjson`
+
+    - **pasta**: onde guardar (padrão: .cache_tiktok ao lado de cada NDJSON)
+    - **verificar_conteudo**: compara um hash do conteúdo em vez do mtime
+      (mais lento, mas não refaz o cache se o arquivo só foi copiado/tocado)
+    - **compressao**: codec do Parquet
+    """
+
+    def __init__(self, pasta: Optional[Union[str, Path]] = None, verificar_conteudo: bool = False,
+                 compressao: str = "zstd"):
+        self.pasta = Path(pasta) if pasta is not None else None
+        self.verificar_conteudo = verificar_conteudo
+        self.compressao = compressao
+        self.estatisticas = {"acertos": 0, "faltas": 0, "invalidados": 0}
+
+    def arquivo_cache(self, caminho: Union[str, Path], colunas: Sequence[str] = COLUNAS_TIKTOK,
+                      tipos: Optional[Dict[str, str]] = None, raiz: Optional[str] = "data",
+                      metadados: Sequence[str] = ()) -> Path:
+        """Caminho do Parquet para esta captura e esta combinação de colunas"""
+        caminho = Path(caminho).resolve()
+        tipos = TIPOS_COMPACTOS if tipos is None else tipos
+        chave = json.dumps([VERSAO, str(caminho), list(colunas), sorted(tipos.items()), raiz, list(metadados)])
+        pasta = self.pasta or caminho.parent / PASTA_CACHE
+        return pasta / f"{caminho.name}-{hashlib.sha256(chave.encode()).hexdigest()[:16]}.parquet"
+
+    def impressao_digital(self, caminho: Union[str, Path]) -> dict:
+        """O que identifica a versão atual do NDJSON"""
+        info = os.stat(caminho)
+        if self.verificar_conteudo:
+            return {"tamanho": info.st_size, "conteudo": hash_do_arquivo(caminho)}
+        return {"tamanho": info.st_size, "mtime_ns": info.st_mtime_ns}
+
+    @staticmethod
+    def _origem_gravada(arquivo: Path) -> Optional[dict]:
+        try:
+            metadados = pq.read_schema(arquivo).metadata or {}
+        except (OSError, pa.ArrowInvalid):
+            return None
+        origem = metadados.get(CHAVE_METADADOS)
+        return json.loads(origem) if origem else None
+
+    @staticmethod
+    def ler(arquivo: Union[str, Path]) -> pd.DataFrame:
+        """DataFrame de um arquivo do cache"""
+        tabela = pq.read_table(arquivo)
+        df = tabela.to_pandas()
+        for campo in tabela.schema:
+            if pa.types.is_list(campo.type) or pa.types.is_large_list(campo.type):
+                df[campo.name] = _listas(df[campo.name])
+        return df
+
+    def _consultar(self, caminho, colunas, tamanho_bloco, tipos, raiz, metadados):
+        # Devolve (arquivo do cache, DataFrame recém-lido ou None se acertou)
+        arquivo = self.arquivo_cache(caminho, colunas, tipos, raiz, metadados)
+        digital = self.impressao_digital(caminho)
+        origem = self._origem_gravada(arquivo) if arquivo.exists() else None
+        if origem == digital:
+            self.estatisticas["acertos"] += 1
+            return arquivo, None
+        self.estatisticas["faltas"] += 1
+        if origem is not None:
+            self.estatisticas["invalidados"] += 1
+        df = ler_ndjson(caminho, colunas, tamanho_bloco, tipos, raiz, metadados)
+        self._gravar(df, arquivo, digital)
+        return arquivo, df
+
+    def carregar(self, caminho: Union[str, Path], colunas: Sequence[str] = COLUNAS_TIKTOK,
+                 tamanho_bloco: int = TAMANHO_BLOCO, tipos: Optional[Dict[str, str]] = None,
+                 raiz: Optional[str] = "data", metadados: Sequence[str] = ()) -> pd.DataFrame:
+        """Como `ler_ndjson`, mas usando (e mantendo) o cache em Parquet"""
+        arquivo, df = self._consultar(caminho, colunas, tamanho_bloco, tipos, raiz, metadados)
+        return self.ler(arquivo) if df is None else df
+
+    def garantir(self, caminho: Union[str, Path], colunas: Sequence[str] = COLUNAS_TIKTOK,
+                 tamanho_bloco: int = TAMANHO_BLOCO, tipos: Optional[Dict[str, str]] = None,
+                 raiz: Optional[str] = "data", metadados: Sequence[str] = ()) -> Path:
+        """Deixa o cache em dia (lendo o NDJSON só se preciso) e devolve o arquivo"""
+        return self._consultar(caminho, colunas, tamanho_bloco, tipos, raiz, metadados)[0]
+
+    def _gravar(self, df: pd.DataFrame, arquivo: Path, digital: dict):
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        tabela = tabela.replace_schema_metadata({**(tabela.schema.metadata or {}),
+                                                 CHAVE_METADADOS: json.dumps(digital).encode()})
+        arquivo.parent.mkdir(parents=True, exist_ok=True)
+        # Um temporário por escrita (outro processo pode estar gravando o mesmo arquivo)
+        temporario = arquivo.with_name(f"{arquivo.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            pq.write_table(tabela, temporario, compression=self.compressao)
+            temporario.replace(arquivo)  # quem lê nunca vê um arquivo pela metade
+        finally:
+            temporario.unlink(missing_ok=True)
+
+    def limpar(self, caminho: Optional[Union[str, Path]] = None) -> int:
+        """Apaga o cache de uma captura (ou de todas da pasta); devolve quantos"""
+        if caminho is not None:
+            caminho = Path(caminho).resolve()
+            pasta, padrao = self.pasta or caminho.parent / PASTA_CACHE, f"{caminho.name}-*.parquet"
+        elif self.pasta is not None:
+            pasta, padrao = self.pasta, "*.parquet"
+        else:
+            raise ValueError("Informe o caminho da captura ou a pasta do cache")
+        arquivos = list(pasta.glob(padrao))
+        for arquivo in arquivos:
+            arquivo.unlink()
+        return len(arquivos)
+
+
+_cache_padrao = CacheDatasets()
+
+
+def carregar_ndjson(caminho: Union[str, Path], colunas: Sequence[str] = COLUNAS_TIKTOK,
+                    **opcoes) -> pd.DataFrame:
+    """`ler_ndjson` com o cache padrão (.cache_tiktok ao lado do NDJSON)"""
+    return _cache_padrao.carregar(caminho, colunas, **opcoes)
+
+
+def estatisticas_cache() -> dict:
+    """Acertos, faltas e invalidações do cache padrão"""
+    return dict(_cache_padrao.estatisticas)
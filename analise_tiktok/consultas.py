@@ -0,0 +1,207 @@
+"""
+CONSULTAS SEM CARREGAR TUDO NA MEMÓRIA (DuckDB)
+
+As perguntas da aula_04 (vídeo com mais likes via idxmax, média de
+comentários, mediana de compartilhamentos, total de posts) e os groupby
+da aula_05 precisam do DataFrame inteiro na memória. Com capturas maiores
+que a RAM, não dá.
+
+Aqui as mesmas contas são feitas pelo DuckDB direto sobre os arquivos
+(NDJSON do Zeeschuimer ou Parquet do cache/ingestão), em fluxo e com
+limite de memória (o que passar do limite vai para o disco):
+
+- Do NDJSON só são lidos os caminhos pedidos (o esquema é declarado, o
+  resto de cada linha é ignorado)
+- A view `posts` tem as mesmas colunas dos DataFrames das aulas
+  ("statsV2.diggCount", "author.uniqueId"...), com contagens inteiras e
+  "challenges[].title" como lista de hashtags
+- Com vários arquivos, `deduplicar=True` deixa só o retrato mais recente
+  de cada vídeo (como em ingestao.py)
+
+Uso:
+
+    consulta = ConsultaTikTok("../bases/*.ndjson", memoria_maxima="1GB")
+    consulta.mais_curtido()                  # {'url': ..., 'valor': ...}
+    consulta.media("statsV2.commentCount")
+    consulta.mediana("statsV2.shareCount")
+    consulta.total_posts()
+    consulta.agregar("author.uniqueId", {"statsV2.diggCount": "mean", "id": "count"})
+    consulta.sql('SELECT "author.uniqueId", max("statsV2.playCount") FROM posts GROUP BY 1')
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import duckdb
+import pandas as pd
+
+from .esquema import CONTAGENS_AUTOR, CONTAGENS_VIDEO
+from .ingestao import COLUNA_COLETA
+from .leitura import COLUNAS_TIKTOK
+
+# Colunas padrão: as das aulas, com as hashtags no lugar dos objetos de challenges
+COLUNAS_CONSULTA = [c if c != "challenges" else "challenges[].title" for c in COLUNAS_TIKTOK]
+
+# Tipo de cada coluna na view. No NDJSON, números são lidos como texto
+# (o statsV2 vem assim) e convertidos com TRY_CAST: valor inválido vira NULL
+TIPOS_SQL: Dict[str, str] = {
+    "createTime": "BIGINT",
+    "video.duration": "INTEGER",
+    "author.verified": "BOOLEAN",
+    **{f"authorStats.{c}": "BIGINT" for c in CONTAGENS_AUTOR},
+    **{f"statsV2.{c}": "BIGINT" for c in CONTAGENS_VIDEO},
+}
+
+# Funções do pandas .agg() -> SQL
+AGREGACOES = {"mean": "avg", "median": "median", "sum": "sum", "count": "count", "min": "min",
+              "max": "max", "std": "stddev_samp", "nunique": "count(DISTINCT {})"}
+
+URL_SQL = """'https://www.tiktok.com/@' || "author.uniqueId" || '/video/' || "id\""""
+
+
+def nome_sql(nome: str) -> str:
+    """Identificador entre aspas (os nomes têm ponto; "desc" é palavra reservada)"""
+    return '"' + nome.replace('"', '""') + '"'
+
+
+def _esquema_json(colunas: Sequence[str]) -> str:
+    # ["author.uniqueId", "challenges[].title"] ->
+    #   STRUCT("author" STRUCT("uniqueId" VARCHAR), "challenges" STRUCT("title" VARCHAR)[])
+    arvore: dict = {}
+    for coluna in colunas:
+        lista, separador, campo = coluna.partition("[].")
+        no = arvore
+        partes = lista.split(".")
+        for parte in partes[:-1]:
+            no = no.setdefault(parte, {})
+        if separador:
+            no[partes[-1]] = ("lista", campo.split("."))
+        else:
+            no[partes[-1]] = "BOOLEAN" if TIPOS_SQL.get(coluna) == "BOOLEAN" else "VARCHAR"
+
+    def tipo(no) -> str:
+        if isinstance(no, str):
+            return no
+        if isinstance(no, tuple):
+            interno: dict = {}
+            for parte in reversed(no[1]):
+                interno = {parte: interno or "VARCHAR"}
+            return tipo(interno) + "[]"
+        return "STRUCT(" + ", ".join(f"{nome_sql(k)} {tipo(v)}" for k, v in no.items()) + ")"
+
+    return tipo(arvore)
+
+
+def _expressao(coluna: str, raiz: str = "data") -> str:
+    lista, separador, campo = coluna.partition("[].")
+    acesso = ".".join(nome_sql(p) for p in [raiz] + lista.split("."))
+    if separador:
+        return f"list_transform({acesso}, c -> c.{'.'.join(nome_sql(p) for p in campo.split('.'))})"
+    tipo = TIPOS_SQL.get(coluna)
+    if tipo and tipo != "BOOLEAN":
+        return f"TRY_CAST({acesso} AS {tipo})"
+    return acesso
+
+
+class ConsultaTikTok:
+    """
+    Consultas sobre capturas (NDJSON) ou Parquets, pelo DuckDB
+
+    - **fontes**: arquivo, padrão glob ("../bases/*.ndjson") ou lista deles;
+      todos NDJSON ou todos Parquet
+    - **colunas**: caminhos lidos do NDJSON (no Parquet, as colunas do arquivo)
+    - **deduplicar**: um post por vídeo, o de maior timestamp_collected
+    - **memoria_maxima**: limite do DuckDB ("1GB", "500MB"...); acima disso
+      ele usa arquivos temporários
+    """
+
+    def __init__(self, fontes: Union[str, Path, Sequence[Union[str, Path]]],
+                 colunas: Sequence[str] = COLUNAS_CONSULTA, deduplicar: bool = False,
+                 memoria_maxima: str = "1GB", threads: Optional[int] = None,
+                 pasta_temporaria: Optional[Union[str, Path]] = None):
+        self.fontes = [str(f) for f in ([fontes] if isinstance(fontes, (str, Path)) else fontes)]
+        self.colunas = list(colunas)
+        configuracao = {"memory_limit": memoria_maxima, "preserve_insertion_order": False,
+                        "temp_directory": str(pasta_temporaria or Path(tempfile.gettempdir()) / "duckdb_tiktok")}
+        if threads:
+            configuracao["threads"] = threads
+        self.conexao = duckdb.connect(config=configuracao)
+        self.conexao.execute(f"CREATE VIEW posts AS {self._consulta_base(deduplicar)}")
+
+    def _consulta_base(self, deduplicar: bool) -> str:
+        lista = "[" + ", ".join("'" + f.replace("'", "''") + "'" for f in self.fontes) + "]"
+        if all(f.endswith(".parquet") for f in self.fontes):
+            origem = f"SELECT * FROM read_parquet({lista}, union_by_name = true)"
+        else:
+            esquema = _esquema_json(self.colunas).replace("'", "''")
+            colunas_json = f"{{'data': '{esquema}', '{COLUNA_COLETA}': 'BIGINT'}}"
+            selecao = ", ".join(f"{_expressao(c)} AS {nome_sql(c)}" for c in self.colunas)
+            origem = (f"SELECT {selecao}, {nome_sql(COLUNA_COLETA)} FROM read_json({lista}, "
+                      f"format = 'newline_delimited', columns = {colunas_json})")
+        if deduplicar:
+            origem = (f"SELECT * FROM ({origem}) QUALIFY row_number() OVER "
+                      f"(PARTITION BY \"id\" ORDER BY {nome_sql(COLUNA_COLETA)} DESC) = 1")
+        return origem
+
+    # ------------------------------------------------------------------
+
+    def sql(self, consulta: str, parametros: Optional[list] = None) -> pd.DataFrame:
+        """Qualquer consulta sobre a view `posts`"""
+        return self.conexao.execute(consulta, parametros).df()
+
+    def _valor(self, consulta: str):
+        return self.conexao.execute(consulta).fetchone()[0]
+
+    def total_posts(self) -> int:
+        return self._valor("SELECT count(*) FROM posts")
+
+    def media(self, coluna: str) -> float:
+        return self._valor(f"SELECT avg({nome_sql(coluna)}) FROM posts")
+
+    def mediana(self, coluna: str) -> float:
+        return self._valor(f"SELECT median({nome_sql(coluna)}) FROM posts")
+
+    def mais_curtido(self, coluna: str = "statsV2.diggCount") -> dict:
+        """O post com o maior valor de `coluna` (o idxmax da aula_04)"""
+        linha = self.conexao.execute(
+            f"SELECT \"id\", \"author.uniqueId\", {URL_SQL}, {nome_sql(coluna)} FROM posts "
+            f"WHERE {nome_sql(coluna)} IS NOT NULL ORDER BY {nome_sql(coluna)} DESC LIMIT 1").fetchone()
+        return dict(zip(["id", "autor", "url", "valor"], linha)) if linha else {}
+
+    def agregar(self, por: Union[str, List[str]], metricas: Dict[str, Union[str, List[str]]],
+                ordenar_por: Optional[str] = None, decrescente: bool = True,
+                limite: Optional[int] = None) -> pd.DataFrame:
+        """
+        O `df.groupby(por).agg(metricas)` das aulas, feito pelo DuckDB.
+        Com uma função por coluna, o resultado tem o nome da coluna; com uma
+        lista, "<coluna>_<função>".
+        """
+        por = [por] if isinstance(por, str) else list(por)
+        selecao = [nome_sql(p) for p in por]
+        for coluna, funcoes in metricas.items():
+            unica = isinstance(funcoes, str)
+            for funcao in ([funcoes] if unica else funcoes):
+                modelo = AGREGACOES[funcao]
+                expressao = modelo.format(nome_sql(coluna)) if "{}" in modelo else f"{modelo}({nome_sql(coluna)})"
+                selecao.append(f"{expressao} AS {nome_sql(coluna if unica else f'{coluna}_{funcao}')}")
+        consulta = f"SELECT {', '.join(selecao)} FROM posts GROUP BY ALL"
+        if ordenar_por:
+            consulta += f" ORDER BY {nome_sql(ordenar_por)} {'DESC' if decrescente else 'ASC'}"
+        if limite:
+            consulta += f" LIMIT {int(limite)}"
+        return self.sql(consulta).set_index(por)
+
+    def posts_por_mes(self) -> pd.DataFrame:
+        """Número de posts por mês de criação"""
+        return self.sql("SELECT strftime(to_timestamp(\"createTime\"), '%Y-%m') AS mes, count(*) AS posts "
+                        "FROM posts GROUP BY mes ORDER BY mes")
+
+    def fechar(self):
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
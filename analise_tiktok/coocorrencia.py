@@ -0,0 +1,119 @@
+"""
+HASHTAGS QUE APARECEM JUNTAS (COOCORRÊNCIA ESPARSA)
+
+Contar os pares post a post em Python (`itertools.combinations` de cada
+lista) custa posts x hashtags² operações do interpretador. Aqui:
+
+1. os posts viram uma matriz de incidência esparsa X (post x hashtag, 1
+   quando o post usa a hashtag), com as hashtags codificadas como inteiros
+   (hashtags.py)
+2. a coocorrência sai de UM produto esparso: C = Xᵀ X. C[a, b] é o número
+   de posts com a e b; a diagonal, o número de posts de cada hashtag
+
+Nada passa por matriz densa: C só guarda os pares que existem, então
+centenas de milhares de hashtags distintas cabem na memória.
+
+PMI (informação mútua pontual) de um par: log(P(a, b) / (P(a) P(b))).
+Positivo quando as duas aparecem juntas mais do que o acaso explicaria. Pares
+raros têm PMI alto por sorte: use `minimo` para exigir um número mínimo de
+posts com o par.
+
+Uso:
+
+    co = CoocorrenciaHashtags(dados)
+    co.pares(20)                                # pares mais frequentes
+    co.pares(20, por="pmi", minimo=50)          # mais associados
+    co.vizinhos("bjj", 10)                      # com quem "bjj" aparece
+    co.vizinhos(n=5)                            # os 5 vizinhos de cada hashtag
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from .hashtags import Dados, codificar
+
+COLUNAS_PARES = ["hashtag_a", "hashtag_b", "posts", "pmi"]
+
+
+def matriz_incidencia(dados: Dados, normalizado: bool = True):
+    """(X, vocabulario): X é uma csr_matrix post x hashtag de 0 e 1"""
+    posts, codigos, vocabulario = codificar(dados, normalizado)
+    n_posts = len(dados)
+    incidencia = sp.csr_matrix((np.ones(len(posts), dtype=np.int32), (posts, codigos)),
+                               shape=(n_posts, len(vocabulario)))
+    incidencia.sum_duplicates()
+    incidencia.data[:] = 1  # hashtag repetida no mesmo post conta uma vez
+    return incidencia, vocabulario
+
+
+class CoocorrenciaHashtags:
+    """Coocorrência de hashtags a partir dos posts (DataFrame ou Series de listas)"""
+
+    def __init__(self, dados: Dados, normalizado: bool = True):
+        self.incidencia, self.vocabulario = matriz_incidencia(dados, normalizado)
+        self.n_posts = self.incidencia.shape[0]
+        self.coocorrencia = (self.incidencia.T @ self.incidencia).tocsr()
+        self.coocorrencia.sort_indices()
+        self.frequencia = self.coocorrencia.diagonal().astype(np.int64)
+
+    def pmi(self, a: np.ndarray, b: np.ndarray, juntos: np.ndarray) -> np.ndarray:
+        """PMI dos pares de códigos (a, b) que aparecem juntos em `juntos` posts"""
+        esperado = self.frequencia[a] * self.frequencia[b].astype(np.float64) / self.n_posts
+        return np.log(juntos / esperado)
+
+    def _tabela(self, a, b, juntos, por: str, n: Optional[int]) -> pd.DataFrame:
+        pmi = self.pmi(a, b, juntos)
+        chave = juntos if por == "posts" else pmi
+        if n is not None and n < len(chave):
+            escolhidos = np.argpartition(-chave, n)[:n]
+            a, b, juntos = a[escolhidos], b[escolhidos], juntos[escolhidos]
+            pmi, chave = pmi[escolhidos], chave[escolhidos]
+        ordem = np.lexsort((b, a, -chave))
+        return pd.DataFrame(dict(zip(COLUNAS_PARES, (self.vocabulario[a[ordem]], self.vocabulario[b[ordem]],
+                                                     juntos[ordem].astype(np.int64), pmi[ordem]))))
+
+    def pares(self, n: Optional[int] = 20, por: str = "posts", minimo: int = 1) -> pd.DataFrame:
+        """
+        Os `n` pares (hashtag_a < hashtag_b no vocabulário) com mais posts
+        juntos (`por="posts"`) ou maior PMI (`por="pmi"`), entre os que
+        aparecem juntos em pelo menos `minimo` posts
+        """
+        superior = sp.triu(self.coocorrencia, k=1, format="coo")
+        manter = superior.data >= minimo
+        return self._tabela(superior.row[manter], superior.col[manter], superior.data[manter], por, n)
+
+    def vizinhos(self, hashtag: Optional[str] = None, n: int = 10, por: str = "posts",
+                 minimo: int = 1) -> pd.DataFrame:
+        """
+        As `n` hashtags que mais aparecem com `hashtag`. Sem `hashtag`, a
+        lista de vizinhos de todas (até `n` por hashtag)
+        """
+        if hashtag is not None:
+            codigo = self.vocabulario.get_loc(hashtag)
+            linha = self.coocorrencia.getrow(codigo).tocoo()
+            manter = (linha.col != codigo) & (linha.data >= minimo)
+            b, juntos = linha.col[manter], linha.data[manter]
+            return self._tabela(np.full(len(b), codigo), b, juntos, por, n)
+
+        todos = self.coocorrencia.tocoo()
+        manter = (todos.row != todos.col) & (todos.data >= minimo)
+        a, b, juntos = todos.row[manter], todos.col[manter], todos.data[manter]
+        # Ordena por (hashtag, vizinho mais forte primeiro, vizinho) com uma só
+        # ordenação de inteiros: a força vira um desempate inteiro dentro da
+        # hashtag (as linhas da csr já vêm com os vizinhos em ordem)
+        if por == "posts":
+            desempate = self.n_posts - juntos.astype(np.int64)
+        else:
+            desempate = np.empty(len(a), dtype=np.int64)
+            desempate[np.argsort(-self.pmi(a, b, juntos), kind="stable")] = np.arange(len(a))
+        ordem = np.argsort(a.astype(np.int64) * (int(desempate.max(initial=0)) + 1) + desempate, kind="stable")
+        a, b, juntos = a[ordem], b[ordem], juntos[ordem]
+        # posição de cada vizinho dentro da sua hashtag (0, 1, 2...)
+        inicio_grupo = np.r_[0, np.flatnonzero(np.diff(a)) + 1]
+        posicao = np.arange(len(a)) - np.repeat(inicio_grupo, np.diff(np.r_[inicio_grupo, len(a)]))
+        a, b, juntos = a[posicao < n], b[posicao < n], juntos[posicao < n]
+        return pd.DataFrame(dict(zip(COLUNAS_PARES, (self.vocabulario[a], self.vocabulario[b],
+                                                     juntos.astype(np.int64), self.pmi(a, b, juntos)))))
@@ -0,0 +1,95 @@
+"""
+COLUNAS DERIVADAS SEM APPLY LINHA A LINHA
+
+As aulas criavam as colunas derivadas chamando uma função Python por linha:
+
+    dados3['createdAt'] = dados3['createTime'].apply(lambda x: pd.Timestamp(x, unit='s'))
+    dados3['url'] = dados3.apply(preenche_url, axis=1)
+    dados['hashtags'] = dados['challenges'].apply(get_hashtags)
+
+Com 1 milhão de posts isso leva segundos (o apply com axis=1 monta uma
+Series para cada linha). Aqui cada coluna sai de uma operação sobre a
+coluna inteira:
+
+- createdAt: `pd.to_datetime(unit='s')`
+- url: concatenação de colunas de texto
+- hashtags: títulos extraídos das listas de challenges numa única
+  passada, com o coletor de lixo pausado (veja `hashtags`). Melhor ainda: peça
+  a coluna "challenges[].title" a `ler_ndjson` e as listas saem prontas da
+  leitura, sem guardar os objetos de challenges
+
+O resultado é idêntico ao das aulas (a única diferença: autor ou id
+ausente dá url ausente, e não um texto com "None").
+
+Uso:
+
+    dados = derivar_colunas(ler_ndjson(caminho))
+"""
+
+import gc
+from typing import Iterable
+
+import pandas as pd
+
+COLUNA_HASHTAGS = "challenges[].title"
+DERIVADAS = ("createdAt", "url", "hashtags")
+
+
+def criado_em(create_time: pd.Series) -> pd.Series:
+    """Data de criação a partir do createTime (segundos desde 1970)"""
+    return pd.to_datetime(create_time, unit="s")
+
+
+def url_do_video(df: pd.DataFrame) -> pd.Series:
+    """https://www.tiktok.com/@<author.uniqueId>/video/<id>"""
+    return ("https://www.tiktok.com/@" + df["author.uniqueId"].astype("str")
+            + "/video/" + df["id"].astype("str"))
+
+
+def _titulos_ate_invalido(lista: list) -> list:
+    # Como o get_hashtags das aulas: para no primeiro item que não é um dict
+    # com "title" e fica com os títulos lidos até ali
+    titulos = []
+    for item in lista:
+        if not isinstance(item, dict) or "title" not in item:
+            break
+        titulos.append(item["title"])
+    return titulos
+
+
+def hashtags(challenges: pd.Series) -> pd.Series:
+    """Lista de títulos dos challenges de cada post ([] se não houver)"""
+    # Criar 1 milhão de listas dispara o coletor de ciclos do Python dezenas
+    # de vezes (é o que mais pesa aqui). Listas de textos não formam ciclos,
+    # então ele fica desligado durante a extração.
+    estava_ligado = gc.isenabled()
+    gc.disable()
+    try:
+        titulos = []
+        for lista in challenges.tolist():
+            if not isinstance(lista, list):
+                titulos.append([])
+                continue
+            try:
+                titulos.append([item["title"] for item in lista])
+            except (KeyError, TypeError):
+                titulos.append(_titulos_ate_invalido(lista))
+    finally:
+        if estava_ligado:
+            gc.enable()
+    return pd.Series(titulos, index=challenges.index, dtype=object, name="hashtags")
+
+
+def derivar_colunas(df: pd.DataFrame, colunas: Iterable[str] = DERIVADAS) -> pd.DataFrame:
+    """Acrescenta as colunas derivadas pedidas (createdAt, url, hashtags) a `df`"""
+    colunas = set(colunas)
+    if "createdAt" in colunas:
+        df["createdAt"] = criado_em(df["createTime"])
+    if "url" in colunas:
+        df["url"] = url_do_video(df)
+    if "hashtags" in colunas:
+        if COLUNA_HASHTAGS in df.columns:
+            df["hashtags"] = df[COLUNA_HASHTAGS]
+        else:
+            df["hashtags"] = hashtags(df["challenges"])
+    return df
@@ -0,0 +1,142 @@
+"""
+ESQUEMA DE TIPOS DAS CAPTURAS DO TIKTOK
+
+Depois do json_normalize, as contagens do statsV2 chegam como texto (e as
+aulas fazem `astype(float)`), ids e nomes de autor são textos Python
+repetidos em cada post e `author.verified` é `object`. Isso ocupa várias
+vezes a memória necessária.
+
+`TIPOS_COMPACTOS` declara o tipo de cada coluna:
+
+- contagens: inteiro com sinal de 16 ou 32 bits (Int16/Int32), nulável
+  (post sem a contagem continua inteiro, sem virar float). Se algum valor
+  não couber, a coluna é promovida para Int64 naquele bloco, nunca truncada.
+  Com sinal de propósito: `b - a` com a > b dá negativo, não dá a volta
+  para 4 bilhões como num UInt32 (produtos de duas contagens ainda podem
+  passar de 32 bits: converta para float64 ou Int64 antes de multiplicar)
+- autor e música (ids, nomes, título): `category`, cada texto guardado uma vez
+- flags: `bool` (`boolean`, nulável, se houver ausentes)
+
+`TIPOS_TIKTOK` reproduz os tipos das aulas (statsV2 em float64, int64).
+
+Uso:
+
+    df = ler_ndjson(caminho)                           # já usa TIPOS_COMPACTOS
+    df = ler_ndjson(caminho, tipos=TIPOS_TIKTOK)       # tipos das aulas
+    compacto = aplicar_tipos(df.copy(), TIPOS_COMPACTOS)
+    print(relatorio_memoria(df, compacto))
+"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+CONTAGENS_AUTOR = ("followingCount", "followerCount", "heartCount", "videoCount", "diggCount", "heart")
+CONTAGENS_VIDEO = ("collectCount", "commentCount", "diggCount", "playCount", "shareCount")
+
+# Os tipos das aulas: statsV2 como o astype(float), inteiros em int64
+TIPOS_TIKTOK: Dict[str, str] = {
+    "createTime": "int64",
+    "video.duration": "int64",
+    "author.verified": "bool",
+    **{f"authorStats.{c}": "int64" for c in CONTAGENS_AUTOR},
+    **{f"statsV2.{c}": "float64" for c in CONTAGENS_VIDEO},
+}
+
+TIPOS_COMPACTOS: Dict[str, str] = {
+    "createTime": "Int64",         # segundos desde 1970 (Int32 só vai até 2038)
+    "video.duration": "Int16",     # segundos: até 9 horas
+    "author.id": "category",
+    "author.uniqueId": "category",
+    "author.nickname": "category",
+    "author.verified": "bool",
+    "music.title": "category",
+    **{f"authorStats.{c}": "Int32" for c in CONTAGENS_AUTOR},
+    **{f"statsV2.{c}": "Int32" for c in CONTAGENS_VIDEO},
+}
+
+PROMOCAO_INTEIRO = "Int64"
+
+
+def _converter_inteiro(serie: pd.Series, tipo: str) -> pd.Series:
+    serie = pd.to_numeric(serie, errors="coerce")
+    dtype = pd.api.types.pandas_dtype(tipo)
+    nulavel = not isinstance(dtype, np.dtype)
+    if not nulavel and serie.isna().any():
+        return serie.astype("float64")  # int do NumPy não guarda ausentes
+    limites = np.iinfo(dtype.numpy_dtype if nulavel else dtype)
+    if len(serie) and serie.notna().any() and (serie.min() < limites.min or serie.max() > limites.max):
+        return serie.astype(PROMOCAO_INTEIRO if nulavel else "int64")
+    return serie.astype(tipo)
+
+
+def aplicar_tipos(df: pd.DataFrame, tipos: Dict[str, str]) -> pd.DataFrame:
+    """Converte as colunas de `tipos` presentes em `df`"""
+    for coluna, tipo in tipos.items():
+        if coluna not in df.columns:
+            continue
+        serie = df[coluna]
+        if tipo == "bool":
+            # com ausentes, o bool nulável do pandas
+            df[coluna] = serie.astype("boolean" if serie.isna().any() else bool)
+        elif pd.api.types.is_integer_dtype(tipo):
+            df[coluna] = _converter_inteiro(serie, tipo)
+        elif pd.api.types.is_numeric_dtype(tipo) and tipo != "boolean":
+            df[coluna] = pd.to_numeric(serie, errors="coerce").astype(tipo)
+        else:
+            df[coluna] = serie.astype(tipo)
+    return df
+
+
+def concatenar(blocos: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    pd.concat que mantém as colunas `category` (blocos com categorias
+    diferentes viram texto no concat comum)
+    """
+    if len(blocos) == 1:
+        return blocos[0]
+    for coluna in blocos[0].columns:
+        if all(isinstance(b[coluna].dtype, pd.CategoricalDtype) for b in blocos):
+            categorias = union_categoricals([b[coluna] for b in blocos], sort_categories=True).categories
+            for bloco in blocos:
+                bloco[coluna] = bloco[coluna].cat.set_categories(categorias)
+    return pd.concat(blocos, ignore_index=True)
+
+
+def uso_memoria(df: pd.DataFrame) -> pd.Series:
+    """Bytes por coluna (contando o conteúdo dos textos)"""
+    return df.memory_usage(deep=True, index=False)
+
+
+def relatorio_memoria(antes: pd.DataFrame, depois: pd.DataFrame) -> pd.DataFrame:
+    """Memória e tipo de cada coluna antes e depois, em MiB, com o total"""
+    relatorio = pd.DataFrame({
+        "tipo_antes": antes.dtypes.astype(str),
+        "MiB_antes": uso_memoria(antes) / 2**20,
+        "tipo_depois": depois.dtypes.astype(str),
+        "MiB_depois": uso_memoria(depois) / 2**20,
+    })
+    relatorio.loc["TOTAL"] = ["", relatorio["MiB_antes"].sum(), "", relatorio["MiB_depois"].sum()]
+    relatorio["reducao"] = relatorio["MiB_antes"] / relatorio["MiB_depois"]
+    return relatorio
+
+
+def agregados(df: pd.DataFrame, colunas: Iterable[str] = tuple(f"statsV2.{c}" for c in CONTAGENS_VIDEO),
+              por: str = "author.uniqueId") -> Dict[str, object]:
+    """
+    As contas das aulas (soma, média, mediana, idxmax e média por autor),
+    feitas nos tipos de `df`, para conferir que a troca de tipos não muda
+    os resultados
+    """
+    colunas = list(colunas)
+    por_autor = df.groupby(por, observed=True)[colunas].mean()
+    por_autor.index = por_autor.index.astype(str)
+    return {
+        "soma": [float(df[c].sum()) for c in colunas],
+        "media": [float(df[c].mean()) for c in colunas],
+        "mediana": [float(df[c].median()) for c in colunas],
+        "idxmax": [df[c].idxmax() for c in colunas],
+        "media_por_autor": por_autor.sort_index().astype("float64").round(9).to_dict("list"),
+    }
@@ -0,0 +1,230 @@
+"""
+GRÁFICOS DE DISTRIBUIÇÃO A PARTIR DE CONTAGENS
+
+A aula_05 desenha direto do DataFrame: `sns.histplot(..., kde=True)`,
+`sns.scatterplot` e `sns.pairplot`. Com milhões de posts, a KDE avalia
+uma gaussiana por post em cada ponto da curva e o scatter desenha um
+marcador por post: minutos e muita memória para um gráfico de 800 px.
+
+Aqui os dados viram contagens com o NumPy primeiro e o matplotlib só
+desenha as contagens:
+
+- `histograma`: np.histogram, com caixas lineares ou logarítmicas
+  (`log=True`, para likes, plays etc., que vão de 0 a milhões)
+- `hexagonos`: contagem 2D em hexágonos (a mesma grade do `plt.hexbin`),
+  no lugar do scatter
+- `kde_amostra`: KDE sobre uma amostra (padrão 20 mil posts), com a
+  largura de banda que a KDE dos dados completos usaria (regra de Scott
+  com o desvio padrão e o n de todos os dados). Assim a amostra estima a
+  MESMA curva do seaborn e o erro é só o da amostragem. Em cada ponto a
+  KDE é a média de m gaussianas (m = tamanho da amostra), então o erro
+  padrão é o desvio padrão dessas m contribuições / √m; vem em
+  `Densidade.erro_padrao` e pode ser desenhado como faixa. Nas caudas,
+  onde quase nenhum valor da amostra cai, ele subestima o erro; lá o erro
+  absoluto é pequeno perto do pico (veja benchmarks/tiktok_graficos.py)
+- `plotar_histograma`, `plotar_hexbin`, `plotar_pares`: os gráficos
+  prontos (histograma + KDE, dispersão, pairplot)
+
+Em escala log, valores <= 0 ficam de fora (o número vai em `fora`).
+
+Uso:
+
+    plotar_histograma(dados['statsV2.diggCount'], bins=100, log=True, color='green')
+    plotar_hexbin(dados['statsV2.shareCount'], dados['statsV2.diggCount'], log=True)
+    plotar_pares(dados, ['statsV2.playCount', 'statsV2.diggCount'])
+"""
+
+import math
+from typing import NamedTuple, Sequence, Tuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.transforms import nonsingular
+
+N_AMOSTRA_KDE = 20_000
+
+
+class Histograma(NamedTuple):
+    contagens: np.ndarray
+    bordas: np.ndarray
+    fora: int  # ausentes (e <= 0 em escala log)
+
+
+class Densidade(NamedTuple):
+    x: np.ndarray
+    densidade: np.ndarray
+    erro_padrao: np.ndarray
+    n_amostra: int
+    banda: float  # h, na escala em que a KDE foi feita (log10 se log=True)
+
+
+class Hexagonos(NamedTuple):
+    x: np.ndarray  # centros dos hexágonos com contagem > 0
+    y: np.ndarray
+    contagens: np.ndarray
+    gridsize: int
+    extent: Tuple[float, float, float, float]  # em log10 nos eixos em escala log
+    log: bool
+    fora: int
+
+
+def _numeros(valores, log: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    # (valores válidos em float64, máscara dos válidos)
+    numeros = pd.to_numeric(pd.Series(valores), errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    validos = ~np.isnan(numeros)
+    if log:
+        validos &= numeros > 0
+    return numeros, validos
+
+
+def histograma(valores, bins: int = 50, log: bool = False) -> Histograma:
+    """Contagens em `bins` caixas iguais (ou iguais em escala log com `log=True`)"""
+    numeros, validos = _numeros(valores, log)
+    numeros = numeros[validos]
+    if log and len(numeros):
+        bordas = np.geomspace(numeros.min(), numeros.max(), bins + 1)
+    else:
+        bordas = np.histogram_bin_edges(numeros, bins)
+    contagens, bordas = np.histogram(numeros, bordas)
+    return Histograma(contagens, bordas, int((~validos).sum()))
+
+
+def kde_amostra(valores, n_amostra: int = N_AMOSTRA_KDE, pontos: int = 200, log: bool = False,
+                semente: int = 0) -> Densidade:
+    """
+    KDE gaussiana de uma amostra de `n_amostra` valores, com a banda dos
+    dados completos (veja o começo do arquivo). Com `log=True`, a KDE é de
+    log10(valores) e `x` volta na escala original.
+    """
+    numeros, validos = _numeros(valores, log)
+    numeros = numeros[validos]
+    if log:
+        numeros = np.log10(numeros)
+    n = len(numeros)
+    if n < 2 or numeros.std() == 0:
+        vazio = np.array([])
+        return Densidade(vazio, vazio, vazio, n, math.nan)
+    # Regra de Scott com o n de todos os dados (a do scipy/seaborn sobre tudo)
+    banda = numeros.std(ddof=1) * n ** (-1 / 5)
+    rng = np.random.default_rng(semente)
+    amostra = numeros if n <= n_amostra else rng.choice(numeros, n_amostra, replace=False)
+    # Mesma grade do seaborn: 3 bandas além dos extremos (cut=3)
+    grade = np.linspace(numeros.min() - 3 * banda, numeros.max() + 3 * banda, pontos)
+    # Contribuição de cada valor da amostra em cada ponto (m x pontos; 32 MB para 20 mil x 200)
+    contribuicoes = np.exp(-0.5 * ((grade[None, :] - amostra[:, None]) / banda) ** 2)
+    contribuicoes /= banda * math.sqrt(2 * math.pi)
+    densidade = contribuicoes.mean(axis=0)
+    erro_padrao = contribuicoes.std(axis=0, ddof=1) / math.sqrt(len(amostra))
+    return Densidade(10 ** grade if log else grade, densidade, erro_padrao, len(amostra), banda)
+
+
+def hexagonos(x, y, gridsize: int = 50, log: bool = False) -> Hexagonos:
+    """
+    Contagem de pontos por hexágono, com a grade do `plt.hexbin(x, y,
+    gridsize)` (com `log=True`, a do `xscale='log', yscale='log'`)
+    """
+    x, validos_x = _numeros(x, log)
+    y, validos_y = _numeros(y, log)
+    validos = validos_x & validos_y
+    tx, ty = x[validos], y[validos]
+    if log:
+        tx, ty = np.log10(tx), np.log10(ty)
+    nx = gridsize
+    ny = int(nx / math.sqrt(3))
+    xmin, xmax = nonsingular(*((tx.min(), tx.max()) if len(tx) else (0, 1)), expander=0.1)
+    ymin, ymax = nonsingular(*((ty.min(), ty.max()) if len(ty) else (0, 1)), expander=0.1)
+    extent = (float(xmin), float(xmax), float(ymin), float(ymax))
+
+    # Dois reticulados de centros (o segundo deslocado meia célula); cada
+    # ponto vai para o centro mais próximo na métrica do hexágono
+    folga = 1e-9 * (xmax - xmin)
+    xmin, xmax = xmin - folga, xmax + folga
+    sx, sy = (xmax - xmin) / nx, (ymax - ymin) / ny
+    ix, iy = (tx - xmin) / sx, (ty - ymin) / sy
+    ix1, iy1 = np.round(ix).astype(np.int64), np.round(iy).astype(np.int64)
+    ix2, iy2 = np.floor(ix).astype(np.int64), np.floor(iy).astype(np.int64)
+    primeiro = (ix - ix1) ** 2 + 3.0 * (iy - iy1) ** 2 < (ix - ix2 - 0.5) ** 2 + 3.0 * (iy - iy2 - 0.5) ** 2
+    contagens1 = np.bincount(ix1[primeiro] * (ny + 1) + iy1[primeiro], minlength=(nx + 1) * (ny + 1))
+    contagens2 = np.bincount(ix2[~primeiro] * ny + iy2[~primeiro], minlength=nx * ny)
+
+    cx = np.r_[np.repeat(np.arange(nx + 1), ny + 1), np.repeat(np.arange(nx) + 0.5, ny)] * sx + xmin
+    cy = np.r_[np.tile(np.arange(ny + 1), nx + 1), np.tile(np.arange(ny) + 0.5, nx)] * sy + ymin
+    contagens = np.r_[contagens1, contagens2]
+    usados = contagens > 0
+    cx, cy = cx[usados], cy[usados]
+    if log:
+        cx, cy = 10 ** cx, 10 ** cy
+    return Hexagonos(cx, cy, contagens[usados], gridsize, extent, log, int((~validos).sum()))
+
+
+# ----------------------------------------------------------------------
+# Gráficos
+# ----------------------------------------------------------------------
+
+def plotar_histograma(valores, bins: int = 50, kde: bool = True, log: bool = False, ax=None,
+                      n_amostra: int = N_AMOSTRA_KDE, faixa_erro: bool = False, color=None, **estilo):
+    """
+    O `sns.histplot(x=valores, bins=bins, kde=kde)` desenhado das
+    contagens. A KDE (de uma amostra) vem na escala de contagem, como no
+    seaborn; `faixa_erro=True` desenha ± 2 erros padrão em volta dela.
+    """
+    ax = ax or plt.gca()
+    contas = histograma(valores, bins, log)
+    artista = ax.stairs(contas.contagens, contas.bordas, fill=True, alpha=0.5, color=color, **estilo)
+    ax.stairs(contas.contagens, contas.bordas, color=artista.get_facecolor(), alpha=1, linewidth=0.5)
+    if log:
+        ax.set_xscale("log")
+    if kde:
+        densidade = kde_amostra(valores, n_amostra, log=log)
+        # densidade -> contagem por caixa (caixas iguais em x, ou em log10(x))
+        largura = (np.log10(contas.bordas[1] / contas.bordas[0]) if log
+                   else contas.bordas[1] - contas.bordas[0]) if len(contas.bordas) > 1 else 1
+        escala = contas.contagens.sum() * largura
+        cor = artista.get_facecolor()[:3]
+        ax.plot(densidade.x, densidade.densidade * escala, color=cor)
+        if faixa_erro:
+            ax.fill_between(densidade.x, (densidade.densidade - 2 * densidade.erro_padrao) * escala,
+                            (densidade.densidade + 2 * densidade.erro_padrao) * escala, color=cor, alpha=0.2)
+    ax.set_ylabel("Count")
+    if isinstance(valores, pd.Series) and valores.name is not None:
+        ax.set_xlabel(str(valores.name))
+    return ax
+
+
+def plotar_hexbin(x, y, gridsize: int = 50, log: bool = False, ax=None, cmap: str = "viridis",
+                  cores_log: bool = True, **estilo):
+    """
+    Dispersão como contagens por hexágono (no lugar do `sns.scatterplot`):
+    o matplotlib recebe só os centros e as contagens. `cores_log` usa
+    escala log nas cores (poucos hexágonos concentram quase todos os posts).
+    """
+    ax = ax or plt.gca()
+    hexes = hexagonos(x, y, gridsize, log)
+    escala = "log" if log else "linear"
+    colecao = ax.hexbin(hexes.x, hexes.y, C=hexes.contagens, reduce_C_function=np.sum, gridsize=gridsize,
+                        extent=hexes.extent, xscale=escala, yscale=escala, bins="log" if cores_log else None,
+                        cmap=cmap, mincnt=1, **estilo)
+    if isinstance(x, pd.Series) and x.name is not None:
+        ax.set_xlabel(str(x.name))
+    if isinstance(y, pd.Series) and y.name is not None:
+        ax.set_ylabel(str(y.name))
+    return colecao
+
+
+def plotar_pares(df: pd.DataFrame, colunas: Sequence[str], bins: int = 50, gridsize: int = 30,
+                 log: bool = True, tamanho: float = 2.5, kde: bool = False):
+    """O `sns.pairplot(df, vars=colunas)` com histogramas na diagonal e hexágonos fora dela"""
+    n = len(colunas)
+    fig, eixos = plt.subplots(n, n, figsize=(tamanho * n, tamanho * n), squeeze=False)
+    for i, linha in enumerate(colunas):
+        for j, coluna in enumerate(colunas):
+            ax = eixos[i, j]
+            if i == j:
+                plotar_histograma(df[coluna], bins, kde=kde, log=log, ax=ax)
+            else:
+                plotar_hexbin(df[coluna], df[linha], gridsize, log=log, ax=ax)
+            ax.set_xlabel(coluna if i == n - 1 else "")
+            ax.set_ylabel(linha if j == 0 else "")
+    fig.tight_layout()
+    return fig
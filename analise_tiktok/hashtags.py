@@ -0,0 +1,149 @@
+"""
+CONTAGEM DE HASHTAGS SEM SOMAR LISTAS
+
+A aula_05 conta as hashtags com `dados['hashtags'].sum()`: somar uma Series
+de listas concatena lista com lista, post a post, e cada soma copia tudo o
+que já foi somado (tempo quadrático: com 1 milhão de posts não termina). E
+faz isso duas vezes, uma para o Counter e outra para a nuvem de palavras.
+
+Aqui as listas são percorridas UMA vez: encadeadas num Counter, ou
+transformadas numa tabela longa (uma linha por post x hashtag) com as
+hashtags codificadas como inteiros, que pode ser contada e filtrada
+quantas vezes for preciso:
+
+- `tabela_hashtags(dados)`: colunas "post" (posição da linha em `dados`) e
+  "hashtag" (category), normalizadas (minúsculas, sem "#" nem espaços)
+- `contar_hashtags(dados, k=30)`: as k mais comuns, em ordem decrescente
+  (`dados` também pode ser a tabela longa)
+- `frequencias(contagens, k=100)`: dict pronto para
+  `WordCloud.generate_from_frequencies`
+- `ContadorHashtags` / `contar_hashtags_arquivo`: contagem em fluxo,
+  bloco a bloco, para capturas que não cabem na memória
+
+`dados` pode ser o DataFrame (usa "challenges[].title", "hashtags" ou
+"challenges", nessa ordem) ou uma Series de listas de títulos.
+
+Uso:
+
+    contagens = contar_hashtags(dados, k=30)
+    WordCloud(...).generate_from_frequencies(frequencias(contagens, k=100))
+"""
+
+import itertools
+from collections import Counter
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .derivadas import COLUNA_HASHTAGS, hashtags
+from .leitura import TAMANHO_BLOCO, ler_ndjson_em_blocos
+
+Dados = Union[pd.DataFrame, pd.Series]
+
+
+def listas_de_hashtags(dados: Dados) -> pd.Series:
+    """Series com a lista de hashtags de cada post"""
+    if isinstance(dados, pd.Series):
+        return dados
+    if COLUNA_HASHTAGS in dados.columns:
+        return dados[COLUNA_HASHTAGS]
+    if "hashtags" in dados.columns:
+        return dados["hashtags"]
+    return hashtags(dados["challenges"])
+
+
+def normalizar(titulos: pd.Index) -> pd.Index:
+    """Minúsculas, sem espaços nas pontas e sem "#" no começo"""
+    return titulos.str.strip().str.lstrip("#").str.strip().str.lower()
+
+
+def codificar(dados: Dados, normalizado: bool = True):
+    """
+    Tabela longa em forma de arrays: (posts, codigos, vocabulario), com
+    `vocabulario[codigos[i]]` a i-ésima hashtag e `posts[i]` a posição do
+    post dela. Títulos ausentes (ou vazios depois de normalizar) são descartados.
+    """
+    listas = [lista if isinstance(lista, (list, np.ndarray)) else () for lista in listas_de_hashtags(dados).tolist()]
+    tamanhos = np.fromiter(map(len, listas), dtype=np.int64, count=len(listas))
+    titulos = np.fromiter(itertools.chain.from_iterable(listas), dtype=object, count=int(tamanhos.sum()))
+    posts = np.repeat(np.arange(len(listas), dtype=np.int64), tamanhos)
+    # Normaliza só os títulos distintos (milhares), não as ocorrências (milhões)
+    codigos, vocabulario = pd.factorize(titulos)
+    vocabulario = pd.Index(vocabulario, dtype="str")
+    if normalizado:
+        normalizados = normalizar(vocabulario)
+        novos, vocabulario = pd.factorize(normalizados.where(normalizados != ""))
+        codigos = np.where(codigos >= 0, novos[codigos], -1)
+    validos = codigos >= 0
+    return posts[validos], codigos[validos], vocabulario
+
+
+def tabela_hashtags(dados: Dados, normalizado: bool = True) -> pd.DataFrame:
+    """Uma linha por (post, hashtag); "post" é a posição da linha em `dados`"""
+    posts, codigos, vocabulario = codificar(dados, normalizado)
+    return pd.DataFrame({"post": posts, "hashtag": pd.Categorical.from_codes(codigos, vocabulario)})
+
+
+def _ordenar(contagens: pd.Series, k: Optional[int]) -> pd.Series:
+    contagens = contagens[contagens > 0].sort_values(ascending=False, kind="stable")
+    contagens = contagens.rename("contagem").rename_axis("hashtag").astype("int64")
+    return contagens if k is None else contagens.head(k)
+
+
+def contar_hashtags(dados: Dados, k: Optional[int] = None, normalizado: bool = True) -> pd.Series:
+    """
+    Quantas vezes cada hashtag aparece, da mais comum para a menos comum
+    (as `k` primeiras). Com uma tabela de `tabela_hashtags`, é um
+    value_counts sobre os códigos; com as listas, um Counter sobre todas as
+    listas encadeadas (uma passada, sem somar listas), normalizando depois
+    só os títulos distintos.
+    """
+    if isinstance(dados, pd.DataFrame) and "hashtag" in dados.columns:
+        return _ordenar(dados["hashtag"].value_counts(sort=False), k)
+    listas = listas_de_hashtags(dados).tolist()
+    contagens = Counter(itertools.chain.from_iterable(l for l in listas if isinstance(l, (list, np.ndarray))))
+    contagens.pop(None, None)
+    contagens = pd.Series(contagens, index=pd.Index(contagens, dtype="str"), dtype="int64")
+    if normalizado and len(contagens):
+        contagens = contagens.groupby(normalizar(contagens.index), sort=False).sum()
+        contagens = contagens[contagens.index != ""]
+    return _ordenar(contagens, k)
+
+
+def frequencias(contagens: Union[pd.Series, Counter], k: Optional[int] = None) -> Dict[str, int]:
+    """Dict hashtag -> contagem das `k` mais comuns, para `WordCloud.generate_from_frequencies`"""
+    if isinstance(contagens, Counter):
+        return dict(contagens.most_common(k))
+    contagens = contagens.sort_values(ascending=False, kind="stable")
+    return {str(h): int(n) for h, n in (contagens if k is None else contagens.head(k)).items()}
+
+
+class ContadorHashtags:
+    """Contagem acumulada bloco a bloco (só o vocabulário fica na memória)"""
+
+    def __init__(self, normalizado: bool = True):
+        self.normalizado = normalizado
+        self.contagens: Counter = Counter()
+        self.posts = 0
+
+    def atualizar(self, dados: Dados) -> "ContadorHashtags":
+        self.contagens.update(contar_hashtags(dados, normalizado=self.normalizado).to_dict())
+        self.posts += len(dados)
+        return self
+
+    def mais_comuns(self, k: Optional[int] = None) -> pd.Series:
+        mais_comuns = self.contagens.most_common(k)
+        return pd.Series(dict(mais_comuns), name="contagem", dtype="int64").rename_axis("hashtag")
+
+    def frequencias(self, k: Optional[int] = None) -> Dict[str, int]:
+        return frequencias(self.contagens, k)
+
+
+def contar_hashtags_arquivo(caminho, k: Optional[int] = None, normalizado: bool = True,
+                            tamanho_bloco: int = TAMANHO_BLOCO) -> pd.Series:
+    """Conta as hashtags de uma captura lendo só "challenges[].title", bloco a bloco"""
+    contador = ContadorHashtags(normalizado)
+    for bloco in ler_ndjson_em_blocos(caminho, [COLUNA_HASHTAGS], tamanho_bloco, tipos={}):
+        contador.atualizar(bloco)
+    return contador.mais_comuns(k)
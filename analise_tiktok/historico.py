@@ -0,0 +1,218 @@
+"""
+HISTÓRICO DAS ESTATÍSTICAS DE CADA VÍDEO AO LONGO DAS CAPTURAS
+
+Capturas repetidas do mesmo vídeo trazem `statsV2.*` diferentes (mais
+plays, mais likes...), mas as análises só viam um retrato parado. O
+`HistoricoEstatisticas` guarda uma série temporal por vídeo:
+
+    historico/
+      estado.parquet                       # último valor de cada vídeo
+      partes/parte-<hora>-<uuid>.parquet   # só as MUDANÇAS, em ordem de chegada
+
+- Só acrescenta: registrar uma captura grava um arquivo novo em `partes/`
+  com as linhas que mudaram. O que já foi gravado nunca é reescrito
+- Vídeo que não mudou desde o último registro não ocupa espaço: o
+  armazenamento cresce com as mudanças, não com cópias inteiras
+- Registrar a mesma captura de novo não muda nada; retratos mais antigos
+  que o último guardado de um vídeo são ignorados (registre em ordem de
+  coleta; `registrar_pasta` já faz isso)
+- `estado.parquet` (um registro por vídeo) é o único arquivo regravado
+
+Consultas:
+
+    historico = HistoricoEstatisticas("../bases/historico")
+    historico.registrar_pasta("../bases")        # ou registrar_captura / registrar
+    historico.serie("7300000000000000000")       # retratos de um vídeo
+    historico.crescimento()                      # ganho por vídeo no período
+    historico.crescimento(por="author.uniqueId", desde="2025-01-01")
+"""
+
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .esquema import CONTAGENS_VIDEO, TIPOS_COMPACTOS, aplicar_tipos, concatenar
+from .ingestao import COLUNA_COLETA
+from .leitura import ler_ndjson
+
+ESTATISTICAS = [f"statsV2.{c}" for c in CONTAGENS_VIDEO]
+COLUNA_AUTOR = "author.uniqueId"
+COLUNAS_HISTORICO = ["id", COLUNA_AUTOR, COLUNA_COLETA] + ESTATISTICAS
+ULTIMA_COLETA = "ultima_coleta"  # no estado: última captura em que o vídeo apareceu
+
+ArgumentoData = Union[str, date, datetime, int, None]
+
+
+def _milissegundos(valor: ArgumentoData) -> Optional[int]:
+    if valor is None or isinstance(valor, int):
+        return valor
+    return int(pd.Timestamp(valor).timestamp() * 1000)
+
+
+def gravar_parquet(df: pd.DataFrame, arquivo: Path):
+    """Grava `df` em Parquet (zstd) de forma atômica"""
+    arquivo.parent.mkdir(parents=True, exist_ok=True)
+    # Nome único por escrita: dois processos gravando o mesmo arquivo não
+    # escrevem no mesmo temporário
+    temporario = arquivo.with_name(f"{arquivo.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temporario, compression="zstd")
+        temporario.replace(arquivo)  # quem lê nunca vê um arquivo pela metade
+    finally:
+        temporario.unlink(missing_ok=True)
+
+
+class HistoricoEstatisticas:
+    """Série temporal das estatísticas de cada vídeo, só com as mudanças"""
+
+    def __init__(self, pasta: Union[str, Path]):
+        self.pasta = Path(pasta)
+        self.arquivo_estado = self.pasta / "estado.parquet"
+        self.pasta_partes = self.pasta / "partes"
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    def estado(self) -> pd.DataFrame:
+        """Último valor guardado de cada vídeo"""
+        if not self.arquivo_estado.exists():
+            return pd.DataFrame(columns=COLUNAS_HISTORICO + [ULTIMA_COLETA])
+        return pq.read_table(self.arquivo_estado).to_pandas()
+
+    def registrar(self, capturas: pd.DataFrame) -> int:
+        """
+        Acrescenta ao histórico os retratos de `capturas` (colunas
+        COLUNAS_HISTORICO; pode ter vários retratos do mesmo vídeo) que
+        mudaram em relação ao anterior. Devolve quantas linhas foram gravadas.
+        """
+        novos = (capturas[COLUNAS_HISTORICO]
+                 .sort_values(["id", COLUNA_COLETA], kind="stable")
+                 .drop_duplicates(["id", COLUNA_COLETA], keep="last")
+                 .reset_index(drop=True))
+        estado = self.estado().set_index("id")
+
+        # Descarta retratos que não são mais novos que o último guardado
+        if len(estado):
+            ultimo = novos["id"].map(estado[COLUNA_COLETA])
+            novos = novos[ultimo.isna() | (novos[COLUNA_COLETA] > ultimo)].reset_index(drop=True)
+
+        # Compara cada retrato com o anterior do mesmo vídeo (o primeiro de
+        # cada vídeo, com o estado). Ausente é comparado como -1.
+        numeros = novos[ESTATISTICAS].astype("Int64").fillna(-1)
+        anteriores = numeros.groupby(novos["id"], sort=False).shift(1)
+        primeiro = anteriores.isna().all(axis=1)
+        if len(estado):
+            do_estado = estado[ESTATISTICAS].astype("Int64").fillna(-1).reindex(novos["id"]).set_axis(novos.index)
+            anteriores[primeiro] = do_estado[primeiro]
+        mudou = (numeros != anteriores.astype("Int64").fillna(-2)).any(axis=1)
+        alteracoes = novos[mudou]
+
+        if len(alteracoes):
+            nome = f"parte-{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:8]}.parquet"
+            gravar_parquet(alteracoes, self.pasta_partes / nome)
+
+        if len(novos):
+            ultimos = alteracoes.drop_duplicates("id", keep="last").set_index("id")
+            vistos = novos.groupby("id", sort=False)[COLUNA_COLETA].max()
+            # Int64 na atualização: o estado pode estar em Int32 e o bloco novo em Int64
+            novo_estado = (estado.astype({c: "Int64" for c in ESTATISTICAS})
+                           .reindex(estado.index.union(vistos.index)))
+            novo_estado.loc[ultimos.index, ultimos.columns] = ultimos
+            novo_estado.loc[vistos.index, ULTIMA_COLETA] = vistos
+            # Contagens no tipo do esquema, promovidas para Int64 se algum
+            # valor não couber (como na leitura), nunca truncadas
+            novo_estado = aplicar_tipos(novo_estado.rename_axis("id").reset_index(),
+                                        {COLUNA_COLETA: "int64", ULTIMA_COLETA: "int64",
+                                         **{c: TIPOS_COMPACTOS[c] for c in ESTATISTICAS}})
+            gravar_parquet(novo_estado, self.arquivo_estado)
+        return len(alteracoes)
+
+    def registrar_captura(self, caminho: Union[str, Path]) -> int:
+        """Lê uma captura do Zeeschuimer (só as colunas do histórico) e registra"""
+        colunas = [c for c in COLUNAS_HISTORICO if c != COLUNA_COLETA]
+        return self.registrar(ler_ndjson(caminho, colunas, metadados=[COLUNA_COLETA]))
+
+    def registrar_pasta(self, pasta: Union[str, Path], padrao: str = "*.ndjson") -> int:
+        """Registra todas as capturas da pasta, juntas (a ordem vem de timestamp_collected)"""
+        colunas = [c for c in COLUNAS_HISTORICO if c != COLUNA_COLETA]
+        capturas = [ler_ndjson(a, colunas, metadados=[COLUNA_COLETA]) for a in sorted(Path(pasta).glob(padrao))]
+        return self.registrar(concatenar(capturas)) if capturas else 0
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+
+    def _partes(self) -> List[str]:
+        return sorted(str(p) for p in self.pasta_partes.glob("*.parquet"))
+
+    def ler(self, ids: Optional[Sequence[str]] = None, autores: Optional[Sequence[str]] = None,
+            desde: ArgumentoData = None, ate: ArgumentoData = None,
+            colunas: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Retratos guardados (filtrados por vídeo, autor e período de coleta)"""
+        partes = self._partes()
+        if not partes:
+            return pd.DataFrame(columns=list(colunas or COLUNAS_HISTORICO))
+        filtro = None
+        condicoes = []
+        if ids is not None:
+            condicoes.append(ds.field("id").isin(list(ids)))
+        if autores is not None:
+            condicoes.append(ds.field(COLUNA_AUTOR).isin(list(autores)))
+        if _milissegundos(desde) is not None:
+            condicoes.append(ds.field(COLUNA_COLETA) >= _milissegundos(desde))
+        if _milissegundos(ate) is not None:
+            condicoes.append(ds.field(COLUNA_COLETA) <= _milissegundos(ate))
+        for condicao in condicoes:
+            filtro = condicao if filtro is None else filtro & condicao
+        # Cada parte guarda as contagens no tipo do seu bloco (Int32 ou, se
+        # algum valor não coube, Int64): lê todas como Int64, sem os tipos
+        # pandas gravados na primeira parte
+        esquema = pq.read_schema(partes[0]).remove_metadata()
+        for coluna in ESTATISTICAS:
+            esquema = esquema.set(esquema.get_field_index(coluna), pa.field(coluna, pa.int64()))
+        tabela = ds.dataset(partes, schema=esquema, format="parquet").to_table(
+            columns=list(colunas) if colunas else None, filter=filtro)
+        df = tabela.to_pandas(types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+        if COLUNA_COLETA in df.columns:
+            df[COLUNA_COLETA] = df[COLUNA_COLETA].astype("int64")
+        return df.sort_values(["id", COLUNA_COLETA], kind="stable").reset_index(drop=True)
+
+    def serie(self, video_id: str) -> pd.DataFrame:
+        """Retratos de um vídeo em ordem de coleta, com a data da coleta"""
+        df = self.ler(ids=[video_id])
+        df.insert(0, "coletado_em", pd.to_datetime(df[COLUNA_COLETA], unit="ms"))
+        return df
+
+    def crescimento(self, por: str = "id", desde: ArgumentoData = None,
+                    ate: ArgumentoData = None) -> pd.DataFrame:
+        """
+        Ganho de cada estatística entre o primeiro e o último retrato
+        guardado de cada vídeo no período, e o ganho por dia entre eles. Com `por="author.uniqueId"`, a
+        soma dos ganhos dos vídeos de cada autor.
+        """
+        df = self.ler(desde=desde, ate=ate)
+        grupos = df.groupby("id", sort=False)
+        primeiro, ultimo = grupos.first(), grupos.last()
+        ganho = (ultimo[ESTATISTICAS].astype("float64") - primeiro[ESTATISTICAS].astype("float64"))
+        dias = (ultimo[COLUNA_COLETA] - primeiro[COLUNA_COLETA]) / 86_400_000
+        ganho["retratos"] = grupos.size()
+        ganho["dias"] = dias
+        ganho[COLUNA_AUTOR] = ultimo[COLUNA_AUTOR]
+        if por != "id":
+            ganho = ganho.groupby(por, observed=True).agg(
+                {**{c: "sum" for c in ESTATISTICAS}, "retratos": "sum", "dias": "max"})
+            ganho.insert(0, "videos", df.groupby(por, observed=True)["id"].nunique())
+        for coluna in ESTATISTICAS:
+            ganho[f"{coluna}_por_dia"] = ganho[coluna] / ganho["dias"].where(ganho["dias"] > 0)
+        return ganho.sort_values("statsV2.playCount", ascending=False)
+
+    def tamanho_em_disco(self) -> int:
+        """Bytes ocupados (partes + estado)"""
+        return sum(p.stat().st_size for p in self.pasta.rglob("*.parquet"))
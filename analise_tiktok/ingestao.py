@@ -0,0 +1,122 @@
+"""
+INGESTÃO DE VÁRIAS CAPTURAS EM PARALELO, SEM DUPLICADOS
+
+As capturas do Zeeschuimer se sobrepõem (`jiujitsu.ndjson`,
+`israel.ndjson`, ... e coletas repetidas do mesmo tema), então o mesmo
+vídeo aparece em vários arquivos, com estatísticas de momentos diferentes.
+
+`ingerir` lê uma pasta inteira:
+
+1. Cada arquivo é lido por um processo de um pool (um por núcleo). O
+   processo grava o resultado no cache Parquet (cache.py) e devolve só o
+   caminho, para não copiar DataFrames entre processos. Arquivos que não
+   mudaram nem são relidos
+2. Os Parquets são juntados e cada vídeo (`id`) fica com o retrato mais
+   recente (maior `timestamp_collected`; empate: o arquivo que vem depois
+   na ordem dos nomes)
+
+Uso:
+
+    resultado = ingerir("../bases")                  # todos os *.ndjson
+    resultado.dados                                  # um post por vídeo
+    print(resultado.duplicados, resultado.segundos)
+
+    # Linha de comando (grava o resultado em Parquet):
+    python -m analise_tiktok.ingestao bases --saida bases/tiktok.parquet --processos 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+
+import pandas as pd
+
+from .cache import CacheDatasets
+from .esquema import concatenar
+from .leitura import COLUNAS_TIKTOK, TAMANHO_BLOCO
+
+COLUNA_COLETA = "timestamp_collected"  # milissegundos, na raiz de cada linha
+COLUNA_ORIGEM = "arquivo"
+
+
+class Ingestao(NamedTuple):
+    dados: pd.DataFrame
+    arquivos: List[Path]
+    linhas_lidas: int
+    duplicados: int
+    segundos: float
+
+
+def _preparar(caminho: str, colunas: Sequence[str], tipos: Optional[Dict[str, str]], tamanho_bloco: int,
+              pasta_cache: Optional[str], verificar_conteudo: bool) -> str:
+    # Roda em um processo do pool: lê o NDJSON (se preciso) e grava o cache
+    cache = CacheDatasets(pasta_cache, verificar_conteudo=verificar_conteudo)
+    return str(cache.garantir(caminho, colunas, tamanho_bloco, tipos, metadados=[COLUNA_COLETA]))
+
+
+def manter_mais_recente(df: pd.DataFrame, chave: str = "id", coluna_tempo: str = COLUNA_COLETA) -> pd.DataFrame:
+    """Uma linha por `chave`: a de maior `coluna_tempo` (empate: a última; sem data perde)"""
+    ordenado = df.sort_values(coluna_tempo, kind="stable", na_position="first")
+    return ordenado.drop_duplicates(chave, keep="last").sort_index().reset_index(drop=True)
+
+
+def ingerir(pasta: Union[str, Path], padrao: str = "*.ndjson", colunas: Sequence[str] = COLUNAS_TIKTOK,
+            tipos: Optional[Dict[str, str]] = None, processos: Optional[int] = None,
+            tamanho_bloco: int = TAMANHO_BLOCO, pasta_cache: Optional[Union[str, Path]] = None,
+            verificar_conteudo: bool = False) -> Ingestao:
+    """
+    Lê todas as capturas `padrao` de `pasta` e junta sem vídeos repetidos
+
+    - **processos**: tamanho do pool (padrão: um por núcleo; 1 = sem pool)
+    - **pasta_cache**: onde guardar os Parquets (padrão: .cache_tiktok ao
+      lado dos NDJSON)
+    """
+    inicio = time.perf_counter()
+    arquivos = sorted(Path(pasta).glob(padrao))
+    if not arquivos:
+        raise FileNotFoundError(f"Nenhum arquivo {padrao} em {pasta}")
+    colunas = list(colunas)
+    if "id" not in colunas:
+        colunas.insert(0, "id")
+    tarefas = [(str(a), colunas, tipos, tamanho_bloco, str(pasta_cache) if pasta_cache else None,
+                verificar_conteudo) for a in arquivos]
+
+    processos = min(processos or os.cpu_count() or 1, len(arquivos))
+    if processos == 1:
+        caches = [_preparar(*tarefa) for tarefa in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=processos) as pool:
+            caches = list(pool.map(_preparar, *zip(*tarefas)))
+
+    blocos = []
+    for arquivo, cache in zip(arquivos, caches):
+        bloco = CacheDatasets.ler(cache)
+        bloco[COLUNA_ORIGEM] = pd.Categorical([arquivo.name] * len(bloco))
+        blocos.append(bloco)
+    todos = concatenar(blocos)
+    dados = manter_mais_recente(todos)
+    return Ingestao(dados, arquivos, len(todos), len(todos) - len(dados), time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Junta as capturas do Zeeschuimer de uma pasta, sem duplicados")
+    parser.add_argument("pasta")
+    parser.add_argument("--padrao", default="*.ndjson")
+    parser.add_argument("--saida", help="arquivo Parquet com o resultado")
+    parser.add_argument("--processos", type=int, default=None, help="padrão: um por núcleo")
+    args = parser.parse_args()
+
+    resultado = ingerir(args.pasta, args.padrao, processos=args.processos)
+    print(f"📂 {len(resultado.arquivos)} arquivos, {resultado.linhas_lidas} posts lidos, "
+          f"{resultado.duplicados} duplicados removidos -> {len(resultado.dados)} vídeos "
+          f"em {resultado.segundos:.1f} s")
+    if args.saida:
+        resultado.dados.to_parquet(args.saida, index=False, compression="zstd")
+        print(f"💾 {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+LEITURA EM BLOCOS DAS CAPTURAS DO ZEESCHUIMER (NDJSON)
+
+O caminho da aula_04 é:
+
+    dados = pd.read_json('../bases/israel.ndjson', lines=True)  # arquivo inteiro
+    dados2 = pd.json_normalize(dados['data'])                    # ~80 colunas
+    dados3 = dados2[colunas_desejadas]                           # fica com ~20
+
+Quase tudo o que é lido e normalizado é jogado fora, e no pico a memória
+chega a várias vezes o tamanho do arquivo.
+
+Aqui o arquivo é lido linha a linha, em blocos de `tamanho_bloco` posts.
+Cada linha é decodificada (com orjson, se instalado) e, na mesma passada,
+só os caminhos pedidos (ex.: "statsV2.diggCount", "author.uniqueId") são
+extraídos. O extrator de cada combinação de colunas é montado uma única vez.
+Cada bloco vira um DataFrame já com os tipos do esquema (esquema.py).
+
+Uso:
+
+    df = ler_ndjson("../bases/israel.ndjson")                 # COLUNAS_TIKTOK
+    df = ler_ndjson(caminho, colunas=["id", "statsV2.playCount"])
+    df = ler_ndjson(caminho, colunas=["id", "challenges[].title"])  # lista de títulos por post
+
+    for bloco in ler_ndjson_em_blocos(caminho, tamanho_bloco=100_000):
+        ...                                                   # agregue e descarte
+
+    listar_caminhos(caminho)   # caminhos disponíveis (como as colunas do json_normalize)
+"""
+
+import gc
+import gzip
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from .esquema import TIPOS_COMPACTOS, aplicar_tipos, concatenar
+
+try:
+    import orjson  # opcional: decodificador JSON bem mais rápido
+    _decodificar = orjson.loads
+except ImportError:
+    _decodificar = json.loads
+
+TAMANHO_BLOCO = 50_000
+
+# As colunas usadas nas aulas (colunas_desejadas da aula_04)
+COLUNAS_TIKTOK = [
+    "id", "desc", "challenges", "createTime", "video.duration", "video.cover", "author.id",
+    "author.nickname", "author.uniqueId", "author.verified", "music.title", "authorStats.followingCount",
+    "authorStats.followerCount", "authorStats.heartCount", "authorStats.videoCount",
+    "authorStats.diggCount", "authorStats.heart", "statsV2.collectCount", "statsV2.commentCount",
+    "statsV2.diggCount", "statsV2.playCount", "statsV2.shareCount",
+]
+
+_extratores: Dict[tuple, Callable[[List[bytes]], List[tuple]]] = {}
+
+
+def _abrir(caminho):
+    caminho = Path(caminho)
+    return gzip.open(caminho, "rb") if caminho.suffix == ".gz" else open(caminho, "rb")
+
+
+def _acesso(chaves: Sequence[str]) -> Callable[[object], object]:
+    # ["author", "uniqueId"] -> função que desce no["author"]["uniqueId"]; se
+    # algum nível faltar ou não for um objeto JSON, devolve None. Caminhos de
+    # 1 e 2 níveis (quase todas as colunas) têm versões sem laço
+    chaves = tuple(chaves)
+    if len(chaves) == 1:
+        (chave,) = chaves
+
+        def obter(no):
+            return no.get(chave) if isinstance(no, dict) else None
+    elif len(chaves) == 2:
+        primeira, segunda = chaves
+
+        def obter(no):
+            if not isinstance(no, dict):
+                return None
+            no = no.get(primeira)
+            return no.get(segunda) if isinstance(no, dict) else None
+    else:
+        def obter(no):
+            for chave in chaves:
+                if not isinstance(no, dict):
+                    return None
+                no = no.get(chave)
+            return no
+    return obter
+
+
+def _acesso_coluna(caminho: str) -> Callable[[object], object]:
+    # "challenges[].title" -> [c["title"] de cada c em no["challenges"]] ([] se não for lista)
+    lista, separador, campo = caminho.partition("[].")
+    if not separador:
+        return _acesso(caminho.split("."))
+    obter_lista, obter_campo = _acesso(lista.split(".")), _acesso(campo.split("."))
+
+    def obter(no):
+        itens = obter_lista(no)
+        return [obter_campo(item) for item in itens] if isinstance(itens, list) else []
+    return obter
+
+
+def extrator(colunas: Sequence[str], raiz: Optional[str] = "data",
+             metadados: Sequence[str] = ()) -> Callable[[List[bytes]], List[tuple]]:
+    """
+    Função que decodifica uma lista de linhas e devolve uma tupla por linha
+    com os valores de `colunas` (caminhos com ponto, relativos a `raiz`)
+    seguidos dos de `metadados` (campos da raiz da linha, ex.:
+    "timestamp_collected"). Caminhos ausentes (ou que passam por um valor
+    que não é objeto JSON) viram None.
+
+    "lista[].campo" extrai `campo` de cada elemento de uma lista (ex.:
+    "challenges[].title" são as hashtags do post; ausente vira []).
+    """
+    chave = (tuple(colunas), raiz, tuple(metadados))
+    funcao = _extratores.get(chave)
+    if funcao is None:
+        obter_raiz = _acesso([raiz]) if raiz else None
+        acessos = [_acesso_coluna(c) for c in colunas]
+        acessos_metadados = [_acesso([m]) for m in metadados]
+
+        def funcao(linhas):
+            # Milhares de dicts e tuplas por bloco disparam o coletor de ciclos
+            # várias vezes; JSON decodificado não forma ciclos (veja derivadas.py)
+            estava_ligado = gc.isenabled()
+            gc.disable()
+            try:
+                tuplas = []
+                for registro in map(_decodificar, linhas):
+                    no = obter_raiz(registro) if obter_raiz else registro
+                    valores = [obter(no) for obter in acessos]
+                    if acessos_metadados:
+                        valores += [obter(registro) for obter in acessos_metadados]
+                    tuplas.append(tuple(valores))
+            finally:
+                if estava_ligado:
+                    gc.enable()
+            return tuplas
+        _extratores[chave] = funcao
+    return funcao
+
+
+def _linhas(arquivo) -> Iterator[bytes]:
+    return (linha for linha in arquivo if linha.strip())
+
+
+def ler_ndjson_em_blocos(caminho, colunas: Sequence[str] = COLUNAS_TIKTOK,
+                         tamanho_bloco: int = TAMANHO_BLOCO,
+                         tipos: Optional[Dict[str, str]] = None, raiz: Optional[str] = "data",
+                         metadados: Sequence[str] = ()) -> Iterator[pd.DataFrame]:
+    """
+    DataFrames de até `tamanho_bloco` posts de um arquivo NDJSON (ou .ndjson.gz)
+
+    - **colunas**: caminhos com ponto dentro de `raiz` ("data" no Zeeschuimer)
+    - **tipos**: coluna -> dtype (padrão: TIPOS_COMPACTOS; TIPOS_TIKTOK para
+      os tipos das aulas)
+    - **metadados**: campos da raiz de cada linha, ex.: ["timestamp_collected"]
+    """
+    tipos = TIPOS_COMPACTOS if tipos is None else tipos
+    nomes = list(colunas) + list(metadados)
+    extrair = extrator(colunas, raiz, metadados)
+    with _abrir(caminho) as arquivo:
+        linhas = _linhas(arquivo)
+        while True:
+            lote = list(islice(linhas, tamanho_bloco))
+            if not lote:
+                break
+            df = pd.DataFrame.from_records(extrair(lote), columns=nomes)
+            yield aplicar_tipos(df, tipos)
+
+
+def ler_ndjson(caminho, colunas: Sequence[str] = COLUNAS_TIKTOK, tamanho_bloco: int = TAMANHO_BLOCO,
+               tipos: Optional[Dict[str, str]] = None, raiz: Optional[str] = "data",
+               metadados: Sequence[str] = ()) -> pd.DataFrame:
+    """Como ler_ndjson_em_blocos, mas devolve um único DataFrame"""
+    blocos = list(ler_ndjson_em_blocos(caminho, colunas, tamanho_bloco, tipos, raiz, metadados))
+    if not blocos:
+        return pd.DataFrame(columns=list(colunas) + list(metadados))
+    return concatenar(blocos)
+
+
+def _caminhos(objeto: dict, prefixo: str = "") -> Iterator[str]:
+    for chave, valor in objeto.items():
+        if isinstance(valor, dict) and valor:
+            yield from _caminhos(valor, f"{prefixo}{chave}.")
+        else:
+            yield f"{prefixo}{chave}"
+
+
+def listar_caminhos(caminho, n_linhas: int = 100, raiz: Optional[str] = "data") -> List[str]:
+    """Caminhos encontrados nas primeiras `n_linhas` (os nomes do json_normalize)"""
+    encontrados: Dict[str, None] = {}
+    with _abrir(caminho) as arquivo:
+        for linha in islice(_linhas(arquivo), n_linhas):
+            registro = _decodificar(linha)
+            encontrados.update(dict.fromkeys(_caminhos((registro.get(raiz) or {}) if raiz else registro)))
+    return list(encontrados)
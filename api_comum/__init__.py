@@ -0,0 +1,7 @@
+"""
+API_COMUM: Componentes compartilhados pelas APIs das aulas
+
+Módulos reutilizados por aula_14/ e aula_api/. Como os exemplos são
+executados de dentro da própria pasta (ex.: `uvicorn avancado:app`), cada
+app adiciona a raiz do repositório ao `sys.path` antes de importar daqui.
+"""
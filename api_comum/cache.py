@@ -0,0 +1,166 @@
+"""
+CACHE STALE-WHILE-REVALIDATE PARA ENDPOINTS CAROS
+
+O decorador `cache_swr` guarda o último resultado de um endpoint assíncrono:
+
+- Resultado recente: devolvido na hora (X-Cache: HIT)
+- Resultado velho (mais que `max_idade` segundos): devolvido na hora
+  (X-Cache: STALE) e UM recálculo é disparado em segundo plano
+- Sem resultado ainda: a primeira chamada calcula (X-Cache: MISS); chamadas
+  simultâneas esperam o mesmo cálculo
+
+A idade do resultado vai no header padrão `Age` (em segundos). Endpoints de
+escrita chamam `endpoint.invalidar()` para que o recálculo comece na hora.
+
+Uso:
+
+    @app.get("/estatisticas")
+    @cache_swr(max_idade=60)
+    async def estatisticas():
+        ...
+
+    estatisticas.invalidar()  # depois de alterar os dados
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from fastapi import Response
+
+
+class _Entrada:
+    __slots__ = ("kwargs", "valor", "calculado_em", "geracao", "tarefa")
+
+    def __init__(self, kwargs: Dict[str, Any]):
+        self.kwargs = kwargs
+        self.valor: Any = None
+        self.calculado_em: Optional[float] = None  # None = ainda sem valor
+        self.geracao = -1  # geração dos dados usada no último cálculo
+        self.tarefa: Optional[asyncio.Task] = None
+
+
+def _chave(kwargs: Dict[str, Any]):
+    itens = tuple(sorted(kwargs.items()))
+    try:
+        hash(itens)
+        return itens
+    except TypeError:
+        return repr(itens)
+
+
+def cache_swr(max_idade: float = 30.0, max_chaves: int = 128):
+    """
+    Decorador stale-while-revalidate para funções `async` do FastAPI
+
+    - **max_idade**: segundos até o resultado ser considerado velho
+    - **max_chaves**: quantas combinações de parâmetros manter em cache
+    """
+
+    def decorador(funcao):
+        entradas: "OrderedDict[Any, _Entrada]" = OrderedDict()
+        # geracao aumenta a cada invalidar(); um resultado calculado com uma
+        # geração antiga já nasce velho
+        estado = {"loop": None, "geracao": 0, "recalculos": 0}
+
+        async def calcular(entrada: _Entrada):
+            geracao = estado["geracao"]
+            try:
+                valor = await funcao(**entrada.kwargs)
+            finally:
+                entrada.tarefa = None
+            entrada.valor = valor
+            entrada.calculado_em = time.monotonic()
+            entrada.geracao = geracao
+            estado["recalculos"] += 1
+            # Os dados mudaram durante o cálculo: recalcula de novo
+            if geracao != estado["geracao"]:
+                disparar(entrada)
+            return valor
+
+        def disparar(entrada: _Entrada) -> asyncio.Task:
+            if entrada.tarefa is None:
+                entrada.tarefa = asyncio.ensure_future(calcular(entrada))
+                # Falhas em segundo plano mantêm o último valor válido
+                entrada.tarefa.add_done_callback(lambda t: t.cancelled() or t.exception())
+            return entrada.tarefa
+
+        @functools.wraps(funcao)
+        async def wrapper(*args, _resposta_cache: Response = None, **kwargs):
+            estado["loop"] = asyncio.get_running_loop()
+            kwargs.update(zip(parametros, args))
+            chave = _chave(kwargs)
+
+            entrada = entradas.get(chave)
+            if entrada is None:
+                entrada = entradas[chave] = _Entrada(kwargs)
+                if len(entradas) > max_chaves:
+                    entradas.popitem(last=False)
+            entradas.move_to_end(chave)
+
+            if entrada.calculado_em is None:
+                status = "MISS"
+                valor = await asyncio.shield(disparar(entrada))
+            else:
+                valor = entrada.valor
+                velho = (entrada.geracao != estado["geracao"]
+                         or time.monotonic() - entrada.calculado_em > max_idade)
+                if velho:
+                    status = "STALE"
+                    disparar(entrada)
+                else:
+                    status = "HIT"
+
+            if _resposta_cache is not None:
+                idade = time.monotonic() - entrada.calculado_em
+                _resposta_cache.headers["Age"] = str(int(idade))
+                _resposta_cache.headers["X-Cache"] = status
+            return valor
+
+        def invalidar():
+            """Marca tudo como velho e recalcula em segundo plano imediatamente"""
+            estado["geracao"] += 1
+
+            loop = estado["loop"]
+            if loop is None or loop.is_closed():
+                return
+
+            def recalcular_tudo():
+                for entrada in list(entradas.values()):
+                    if entrada.calculado_em is not None:
+                        disparar(entrada)
+
+            # Pode ser chamado de endpoints síncronos (que rodam em threads)
+            try:
+                rodando = asyncio.get_running_loop()
+            except RuntimeError:
+                rodando = None
+            if rodando is loop:
+                recalcular_tudo()
+            else:
+                loop.call_soon_threadsafe(recalcular_tudo)
+
+        def info():
+            agora = time.monotonic()
+            return {
+                "chaves": len(entradas),
+                "recalculos": estado["recalculos"],
+                "idades": [agora - e.calculado_em for e in entradas.values() if e.calculado_em is not None],
+            }
+
+        # O FastAPI lê a assinatura para montar os parâmetros: acrescentamos
+        # um Response para poder escrever os headers Age e X-Cache
+        assinatura = inspect.signature(funcao)
+        parametros = list(assinatura.parameters)
+        wrapper.__signature__ = assinatura.replace(parameters=[
+            *assinatura.parameters.values(),
+            inspect.Parameter("_resposta_cache", inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+        ])
+        wrapper.invalidar = invalidar
+        wrapper.info = info
+        return wrapper
+
+    return decorador
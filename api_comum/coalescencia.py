@@ -0,0 +1,114 @@
+"""
+SINGLE-FLIGHT: uma computação para várias requisições idênticas
+
+Quando muitos clientes pedem o mesmo relatório ao mesmo tempo, cada
+requisição recalcularia a mesma resposta. O `SingleFlightMiddleware` deixa
+passar só a primeira (a "líder"); as idênticas que chegam enquanto ela está
+em andamento esperam e recebem uma cópia da mesma resposta.
+
+Duas requisições são idênticas quando têm o mesmo método, caminho, query
+string e os mesmos headers de HEADERS_CHAVE: Authorization e Cookie (quem é
+o usuário) e Origin (o CORS, que fica por dentro deste middleware, responde
+com headers que dependem dela). Só GET e HEAD são agrupados. Se a líder falhar ou for cancelada, cada seguidora executa por
+conta própria.
+
+Uso:
+
+    coalescencia = SingleFlight()
+    app.add_middleware(SingleFlightMiddleware, grupo=coalescencia,
+                       caminhos=["/relatorios/vendas"])
+
+    coalescencia.metricas()  # {"/relatorios/vendas": {"requisicoes": ..., "coalescidas": ...}}
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+# Headers que mudam a resposta: entram na chave de agrupamento
+HEADERS_CHAVE = (b"authorization", b"cookie", b"origin")
+
+
+class SingleFlight:
+    """Requisições em andamento e contadores de coalescência"""
+
+    def __init__(self):
+        self.em_andamento: Dict[tuple, asyncio.Future] = {}
+        self._contadores = defaultdict(lambda: {"requisicoes": 0, "coalescidas": 0})
+
+    def registrar(self, caminho: str, coalescida: bool) -> None:
+        contador = self._contadores[caminho]
+        contador["requisicoes"] += 1
+        if coalescida:
+            contador["coalescidas"] += 1
+
+    def metricas(self) -> Dict[str, Dict[str, int]]:
+        return {caminho: dict(contador) for caminho, contador in self._contadores.items()}
+
+
+class SingleFlightMiddleware:
+    """
+    Middleware ASGI que agrupa requisições idênticas em andamento
+
+    - **grupo**: instância de SingleFlight (guarda o estado e as métricas)
+    - **caminhos**: caminhos agrupados; None agrupa todos os GETs
+    """
+
+    def __init__(self, app, grupo: SingleFlight, caminhos: Optional[Iterable[str]] = None):
+        self.app = app
+        self.grupo = grupo
+        self.caminhos = set(caminhos) if caminhos is not None else None
+
+    async def __call__(self, scope, receive, send):
+        if (scope["type"] != "http"
+                or scope["method"] not in ("GET", "HEAD")
+                or (self.caminhos is not None and scope["path"] not in self.caminhos)):
+            await self.app(scope, receive, send)
+            return
+
+        # Todas as ocorrências de cada header (pode haver mais de um Cookie)
+        variantes = tuple(tuple(valor for nome, valor in scope["headers"] if nome == cabecalho)
+                          for cabecalho in HEADERS_CHAVE)
+        chave = (scope["method"], scope["path"], scope["query_string"], variantes)
+
+        futuro = self.grupo.em_andamento.get(chave)
+        if futuro is not None:
+            self.grupo.registrar(scope["path"], coalescida=True)
+            # shield: se esta seguidora for cancelada, a líder continua
+            mensagens = await asyncio.shield(futuro)
+            if mensagens is None:
+                await self.app(scope, receive, send)
+                return
+            await self._repetir(mensagens, send)
+            return
+
+        self.grupo.registrar(scope["path"], coalescida=False)
+        futuro = asyncio.get_running_loop().create_future()
+        self.grupo.em_andamento[chave] = futuro
+        mensagens: List[dict] = []
+
+        async def capturar(mensagem):
+            mensagens.append(mensagem)
+
+        try:
+            await self.app(scope, receive, capturar)
+        except BaseException:
+            futuro.set_result(None)  # seguidoras executam sozinhas
+            raise
+        else:
+            futuro.set_result(mensagens)
+        finally:
+            del self.grupo.em_andamento[chave]
+
+        for mensagem in mensagens:
+            await send(mensagem)
+
+    @staticmethod
+    async def _repetir(mensagens: List[dict], send):
+        for mensagem in mensagens:
+            if mensagem["type"] == "http.response.start":
+                mensagem = {
+                    **mensagem,
+                    "headers": [*mensagem.get("headers", []), (b"x-single-flight", b"coalescida")],
+                }
+            await send(mensagem)
@@ -0,0 +1,149 @@
+"""
+PROJEÇÃO DE CAMPOS (?fields=) PARA ENDPOINTS DE LISTAGEM
+
+Clientes que só precisam de alguns campos pedem, por exemplo,
+`GET /usuarios?fields=id,nome`. Para cada combinação de campos é montado
+(uma única vez) um serializador específico, com `operator.itemgetter` (ou
+`attrgetter`), que lê apenas aqueles campos de cada registro. A resposta é
+codificada direto em JSON: menos CPU e resposta menor.
+
+Um Response pronto não passa pelo response_model do endpoint. Quando os
+registros já são instâncias validadas do modelo de resposta, passe o modelo
+(`modelo=`): `resposta` serializa os registros com o serializador do próprio
+Pydantic (`dump_json` com `include`), sem validar de novo, direto em bytes.
+O ganho aí é a resposta menor: o `include` do Pydantic custa quase o mesmo
+que serializar o registro inteiro. Sem `modelo`, os campos saem como estão
+nos registros: use só com dados que já entraram validados.
+
+Uso:
+
+    PROJECAO_USUARIOS = Projecao(["id", "nome", "email", "idade"])
+    PROJECAO_TAREFAS = Projecao(["id", "titulo", "concluida"], por_atributo=True, modelo=Tarefa)
+
+    @app.get("/usuarios")
+    def listar_usuarios(fields: Optional[str] = None):
+        if fields:
+            return resposta_json(PROJECAO_USUARIOS.aplicar(usuarios_db.values(), fields))
+        ...
+
+    @app.get("/tarefas")
+    def listar_tarefas(fields: Optional[str] = None):
+        if fields:
+            return PROJECAO_TAREFAS.resposta(TAREFAS.values(), fields)
+        ...
+"""
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+from uuid import UUID
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson  # opcional: codificador JSON bem mais rápido
+except ImportError:
+    orjson = None
+
+DESCRICAO_FIELDS = "Campos a retornar, separados por vírgula (ex.: id,nome)"
+
+
+def _padrao_json(valor: Any):
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, UUID):
+        return str(valor)
+    if isinstance(valor, Enum):
+        return valor.value
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+
+def codificar_json(conteudo: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(conteudo, default=_padrao_json)
+    return json.dumps(conteudo, default=_padrao_json, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def resposta_json(conteudo: Any, status_code: int = 200) -> Response:
+    """Resposta JSON já codificada (o FastAPI não revalida um Response)"""
+    return Response(content=codificar_json(conteudo), status_code=status_code,
+                    media_type="application/json")
+
+
+class Projecao:
+    """
+    Serializadores de subconjuntos de campos, compilados sob demanda
+
+    - **campos_permitidos**: campos que podem ser pedidos em ?fields=
+    - **por_atributo**: True para objetos (registro.campo), False para
+      dicionários (registro["campo"])
+    - **modelo**: modelo de resposta, do qual os registros são instâncias;
+      `resposta` usa o serializador dele (campos fora do modelo não podem
+      ser pedidos)
+    - **max_serializadores**: limite de combinações guardadas
+    """
+
+    def __init__(self, campos_permitidos: Sequence[str], por_atributo: bool = False,
+                 modelo: Optional[Type[BaseModel]] = None, max_serializadores: int = 256):
+        if modelo is not None:
+            campos_permitidos = [c for c in campos_permitidos if c in modelo.model_fields]
+        self.campos_permitidos = tuple(campos_permitidos)
+        self.por_atributo = por_atributo
+        self.modelo = modelo
+        self.max_serializadores = max_serializadores
+        self._adaptador = TypeAdapter(List[modelo]) if modelo is not None else None
+        self._serializadores: Dict[Tuple[str, ...], Callable] = {}
+
+    def _campos(self, fields: str) -> Tuple[str, ...]:
+        campos = tuple(dict.fromkeys(c.strip() for c in fields.split(",") if c.strip()))
+        invalidos = [c for c in campos if c not in self.campos_permitidos]
+        if invalidos or not campos:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos inválidos em fields: {', '.join(invalidos) or '(vazio)'}. "
+                       f"Permitidos: {', '.join(self.campos_permitidos)}",
+            )
+        return campos
+
+    def _compilar(self, campos: Tuple[str, ...]) -> Callable[[Iterable], List[dict]]:
+        # obter(r) devolve a tupla dos campos, na ordem de `campos`
+        obter = (attrgetter if self.por_atributo else itemgetter)(*campos)
+        if len(campos) == 1:
+            campo = campos[0]
+
+            def projetar(registros):
+                return [{campo: obter(r)} for r in registros]
+        else:
+            def projetar(registros):
+                return [dict(zip(campos, obter(r))) for r in registros]
+        return projetar
+
+    def serializador(self, fields: str) -> Callable[[Iterable], List[dict]]:
+        """Devolve (compilando na primeira vez) o serializador para `fields`"""
+        campos = self._campos(fields)
+        serializador = self._serializadores.get(campos)
+        if serializador is None:
+            if len(self._serializadores) >= self.max_serializadores:
+                self._serializadores.pop(next(iter(self._serializadores)))
+            serializador = self._serializadores[campos] = self._compilar(campos)
+        return serializador
+
+    def aplicar(self, registros: Iterable, fields: str) -> List[dict]:
+        return self.serializador(fields)(registros)
+
+    def serializar(self, registros: Iterable, fields: str) -> bytes:
+        """
+        JSON da lista projetada. Com `modelo`, pelo serializador do Pydantic
+        (os registros já foram validados quando entraram: não valida de novo)
+        """
+        if self._adaptador is None:
+            return codificar_json(self.aplicar(registros, fields))
+        campos = self._campos(fields)
+        return self._adaptador.dump_json(list(registros), include={"__all__": set(campos)})
+
+    def resposta(self, registros: Iterable, fields: str) -> Response:
+        return Response(content=self.serializar(registros, fields), media_type="application/json")
@@ -0,0 +1,328 @@
+"""
+SERVIDOR DE PRODUÇÃO PARA AS APIS DAS AULAS
+
+Os `__main__` das aulas usam `uvicorn.run(..., reload=True)` ou um único
+processo: ótimo para desenvolver, ruim para servir de verdade. Este módulo
+executa qualquer uma das apps com:
+
+- N processos (workers); por padrão 1, veja abaixo
+- uvloop e httptools quando instalados (`pip install uvicorn[standard]`)
+- keep-alive e backlog ajustáveis
+- drenagem no SIGTERM: o worker para de aceitar conexões, termina as
+  requisições em andamento (até `--tempo-drenagem` segundos) e só então sai
+- ganchos de inicialização (rodam em cada worker antes de ele ficar pronto)
+  e verificações de prontidão (consultadas em GET /prontidao)
+- tempo de inicialização de cada worker, no terminal e em /prontidao
+
+Workers são processos separados, cada um com a SUA memória. As apps das
+aulas guardam tudo em dicionários do processo (produtos, usuários, estoque,
+IDs): com vários workers, um POST cai num worker e o GET seguinte pode cair
+em outro, que não conhece o registro (404), os IDs se repetem entre
+workers e a reserva de estoque só vale dentro de cada um. Por isso:
+
+- o padrão é 1 worker (que já ganha com uvloop/httptools e keep-alive)
+- para essas apps (APPS_COM_ESTADO_LOCAL), `--workers` acima de 1 é recusado,
+  a não ser com `--permitir-estado-por-worker` (ex.: benchmarks de cenários
+  que não dependem de dados criados em outra requisição)
+- vários workers de verdade pedem o estado fora do processo (banco de dados,
+  Redis...)
+
+Uso (a partir da raiz do repositório):
+
+    python -m api_comum.servidor fastapi_completo
+    python -m api_comum.servidor basico --workers 4           # sem estado: pode
+    python -m api_comum.servidor medio --ao-iniciar medio:estatisticas_usuarios \
+        --verificacao medio:banco_ok
+
+`/prontidao` responde 200 quando o worker terminou a inicialização e todas as
+verificações passam; 503 durante a inicialização, a drenagem ou se alguma
+verificação falhar.
+"""
+
+import argparse
+import importlib
+import inspect
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from api_comum.projecao import codificar_json
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# Apps conhecidas: nome -> (pasta, "modulo:atributo")
+APPS: Dict[str, Tuple[str, str]] = {
+    "basico": ("aula_14", "basico:app"),
+    "medio": ("aula_14", "medio:app"),
+    "avancado": ("aula_14", "avancado:app"),
+    "exemplo_simples": ("aula_api", "exemplo_simples:app"),
+    "fastapi_completo": ("aula_api", "fastapi_completo:app"),
+}
+
+# Apps que guardam os dados na memória do processo: cada worker teria os seus
+APPS_COM_ESTADO_LOCAL = {"medio", "avancado", "exemplo_simples", "fastapi_completo"}
+
+CAMINHO_PRONTIDAO = "/prontidao"
+
+# A configuração chega aos workers (processos novos) por variáveis de ambiente
+VAR_APP = "SERVIDOR_APP"
+VAR_AO_INICIAR = "SERVIDOR_AO_INICIAR"
+VAR_VERIFICACOES = "SERVIDOR_VERIFICACOES"
+
+
+def resolver_app(alvo: str) -> Tuple[Path, str]:
+    """'avancado' ou 'aula_14/avancado:app' -> (pasta, 'modulo:atributo')"""
+    if alvo in APPS:
+        pasta, modulo = APPS[alvo]
+        return RAIZ / pasta, modulo
+    caminho, _, atributo = alvo.partition(":")
+    caminho = Path(caminho.removesuffix(".py"))
+    return RAIZ / caminho.parent, f"{caminho.name}:{atributo or 'app'}"
+
+
+def importar(referencia: str):
+    """'modulo:atributo' -> objeto"""
+    modulo, _, atributo = referencia.partition(":")
+    if not atributo:
+        raise ValueError(f"Referência inválida (esperado modulo:atributo): {referencia}")
+    objeto = importlib.import_module(modulo)
+    for parte in atributo.split("."):
+        objeto = getattr(objeto, parte)
+    return objeto
+
+
+def _lista_env(nome: str) -> List[str]:
+    return [item for item in os.environ.get(nome, "").split(",") if item]
+
+
+async def _chamar(funcao: Callable):
+    resultado = funcao()
+    if inspect.isawaitable(resultado):
+        resultado = await resultado
+    return resultado
+
+
+class AppGerenciada:
+    """
+    Envolve a app ASGI: roda os ganchos, responde /prontidao e mede a
+    inicialização do worker
+
+    - **app**: a app FastAPI original (o lifespan dela continua valendo)
+    - **ao_iniciar**: funções chamadas (uma vez por worker) antes de ficar pronto
+    - **verificacoes**: funções que devolvem True se o worker pode receber tráfego
+    - **inicio**: perf_counter() do começo da inicialização do worker
+    """
+
+    def __init__(self, app, ao_iniciar: List[Callable] = (), verificacoes: List[Callable] = (),
+                 inicio: Optional[float] = None):
+        self.app = app
+        self.ao_iniciar = list(ao_iniciar)
+        self.verificacoes = list(verificacoes)
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.inicializacao_ms: Optional[float] = None
+        self.pronto = False
+        self.drenando = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(scope, receive, send)
+        elif scope["type"] == "http" and scope["path"] == CAMINHO_PRONTIDAO:
+            await self._prontidao(send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _lifespan(self, scope, receive, send):
+        async def receber():
+            mensagem = await receive()
+            if mensagem["type"] == "lifespan.startup":
+                for gancho in self.ao_iniciar:
+                    await _chamar(gancho)
+            elif mensagem["type"] == "lifespan.shutdown":
+                self._marcar_drenagem()
+            return mensagem
+
+        async def enviar(mensagem):
+            if mensagem["type"] == "lifespan.startup.complete":
+                self._marcar_pronto()
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receber, enviar)
+        except Exception:
+            # App sem suporte a lifespan: os ganchos já rodaram em receber()
+            if not self.pronto:
+                self._marcar_pronto()
+            raise
+
+    def _marcar_pronto(self):
+        self.inicializacao_ms = (time.perf_counter() - self.inicio) * 1000
+        self.pronto = True
+        self._interceptar_sinais()
+        print(f"✅ Worker {os.getpid()} pronto em {self.inicializacao_ms:.0f} ms", flush=True)
+
+    def _marcar_drenagem(self):
+        if not self.drenando:
+            self.drenando = True
+            print(f"⏳ Worker {os.getpid()} drenando conexões...", flush=True)
+
+    def _interceptar_sinais(self):
+        # O uvicorn já instalou os handlers dele (que iniciam a drenagem);
+        # encadeamos um que tira o worker da prontidão no mesmo instante
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            anterior = signal.getsignal(sinal)
+            if not callable(anterior):
+                continue
+
+            def handler(sig, frame, anterior=anterior):
+                self._marcar_drenagem()
+                anterior(sig, frame)
+
+            try:
+                signal.signal(sinal, handler)
+            except ValueError:  # fora da thread principal
+                return
+
+    async def _prontidao(self, send):
+        falhas = []
+        if self.pronto and not self.drenando:
+            for verificacao in self.verificacoes:
+                try:
+                    ok = await _chamar(verificacao)
+                except Exception as erro:
+                    ok = False
+                    falhas.append(f"{verificacao.__name__}: {erro}")
+                    continue
+                if not ok:
+                    falhas.append(verificacao.__name__)
+
+        if self.drenando:
+            status = "drenando"
+        elif not self.pronto:
+            status = "iniciando"
+        else:
+            status = "falhou" if falhas else "pronto"
+
+        corpo = codificar_json({
+            "status": status,
+            "pid": os.getpid(),
+            "inicializacao_ms": self.inicializacao_ms,
+            "falhas": falhas,
+        })
+        await send({
+            "type": "http.response.start",
+            "status": 200 if status == "pronto" else 503,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(corpo)).encode())],
+        })
+        await send({"type": "http.response.body", "body": corpo})
+
+
+def criar_app() -> AppGerenciada:
+    """Fábrica executada em cada worker (uvicorn --factory)"""
+    inicio = time.perf_counter()
+    pasta, referencia = resolver_app(os.environ[VAR_APP])
+    if str(pasta) not in sys.path:
+        sys.path.insert(0, str(pasta))
+    return AppGerenciada(
+        importar(referencia),
+        ao_iniciar=[importar(r) for r in _lista_env(VAR_AO_INICIAR)],
+        verificacoes=[importar(r) for r in _lista_env(VAR_VERIFICACOES)],
+        inicio=inicio,
+    )
+
+
+def implementacoes_rapidas() -> Dict[str, str]:
+    """Loop e parser HTTP que serão usados (os rápidos, se instalados)"""
+    escolha = {}
+    for chave, modulo, rapido, padrao in (("loop", "uvloop", "uvloop", "asyncio"),
+                                          ("http", "httptools", "httptools", "h11")):
+        try:
+            importlib.import_module(modulo)
+            escolha[chave] = rapido
+        except ImportError:
+            escolha[chave] = padrao
+    return escolha
+
+
+def executar(alvo: str, host: str = "0.0.0.0", port: int = 8000, workers: Optional[int] = None,
+             keep_alive: int = 30, backlog: int = 2048, tempo_drenagem: int = 30,
+             limite_concorrencia: Optional[int] = None, ao_iniciar: List[str] = (),
+             verificacoes: List[str] = (), log_level: str = "info",
+             permitir_estado_por_worker: bool = False):
+    """Sobe a app `alvo` com a configuração de produção"""
+    import uvicorn
+
+    resolver_app(alvo)  # valida cedo, antes de subir os workers
+    workers = workers or 1
+    if workers > 1:
+        if alvo in APPS_COM_ESTADO_LOCAL and not permitir_estado_por_worker:
+            raise SystemExit(
+                f"❌ {alvo} guarda os dados na memória do processo: com {workers} workers, cada um "
+                f"teria os seus (registros criados num worker dão 404 nos outros, IDs se repetem). "
+                f"Use --workers 1 ou, sabendo disso, --permitir-estado-por-worker.")
+        if alvo in APPS_COM_ESTADO_LOCAL or alvo not in APPS:
+            print(f"⚠️  ATENÇÃO: {workers} workers, cada um com a sua memória. Dados guardados em "
+                  f"variáveis do processo NÃO são compartilhados entre eles.", flush=True)
+    os.environ[VAR_APP] = alvo
+    os.environ[VAR_AO_INICIAR] = ",".join(ao_iniciar)
+    os.environ[VAR_VERIFICACOES] = ",".join(verificacoes)
+
+    escolha = implementacoes_rapidas()
+    print(f"🚀 {alvo} em http://{host}:{port} | {workers} worker(s) | "
+          f"loop={escolha['loop']} http={escolha['http']} | "
+          f"keep-alive={keep_alive}s backlog={backlog} drenagem={tempo_drenagem}s", flush=True)
+
+    uvicorn.run(
+        "api_comum.servidor:criar_app",
+        factory=True,
+        app_dir=str(RAIZ),
+        host=host,
+        port=port,
+        workers=workers,
+        loop=escolha["loop"],
+        http=escolha["http"],
+        timeout_keep_alive=keep_alive,
+        backlog=backlog,
+        timeout_graceful_shutdown=tempo_drenagem,
+        limit_concurrency=limite_concorrencia,
+        lifespan="on",
+        access_log=False,  # o log de acesso custa caro sob carga
+        log_level=log_level,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa uma API das aulas em modo de produção")
+    parser.add_argument("app", help=f"{', '.join(APPS)} ou pasta/modulo:app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processos (padrão: 1; acima disso só para apps sem estado em memória)")
+    parser.add_argument("--permitir-estado-por-worker", action="store_true",
+                        help=f"aceita mais de 1 worker em {', '.join(sorted(APPS_COM_ESTADO_LOCAL))} "
+                             "(cada worker terá os seus dados)")
+    parser.add_argument("--keep-alive", type=int, default=30, help="segundos com a conexão ociosa aberta")
+    parser.add_argument("--backlog", type=int, default=2048, help="conexões na fila do socket")
+    parser.add_argument("--tempo-drenagem", type=int, default=30,
+                        help="segundos para terminar requisições em andamento no SIGTERM")
+    parser.add_argument("--limite-concorrencia", type=int,
+                        help="conexões simultâneas por worker antes de responder 503")
+    parser.add_argument("--ao-iniciar", action="append", default=[], metavar="MODULO:FUNCAO",
+                        help="função chamada em cada worker na inicialização (pode repetir)")
+    parser.add_argument("--verificacao", action="append", default=[], metavar="MODULO:FUNCAO",
+                        help=f"função de prontidão consultada em {CAMINHO_PRONTIDAO} (pode repetir)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    executar(args.app, host=args.host, port=args.port, workers=args.workers,
+             keep_alive=args.keep_alive, backlog=args.backlog, tempo_drenagem=args.tempo_drenagem,
+             limite_concorrencia=args.limite_concorrencia, ao_iniciar=args.ao_iniciar,
+             verificacoes=args.verificacao, log_level=args.log_level,
+             permitir_estado_por_worker=args.permitir_estado_por_worker)
+
+
+if __name__ == "__main__":
+    main()
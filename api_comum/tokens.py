@@ -0,0 +1,264 @@
+"""
+TOKENS ASSINADOS: autenticação sem sessão compartilhada
+
+Um token é `payload.assinatura`, ambos em base64url. O payload é um JSON
+compacto com o usuário (`sub`), a expiração (`exp`) e um identificador curto
+(`jti`); a assinatura é um HMAC-SHA256 do payload com a chave secreta.
+
+Qualquer processo (ou worker do uvicorn) que conheça a chave consegue validar
+o token sozinho, sem consultar um dicionário de sessões. Tokens já
+verificados ficam num cache LRU pequeno, então a verificação repetida custa
+apenas uma consulta a dicionário.
+
+Cada app usa o seu `nome`: a chave do HMAC é derivada do segredo e do nome,
+então um token de um app não vale em outro, mesmo com o mesmo segredo.
+
+O logout usa uma lista de revogação que também precisa valer para todos os
+workers: um dict jti -> expiração na memória de cada processo, gravado num
+arquivo JSON por app (`<nome>.json` na pasta da variável API_TOKENS_REVOGADOS;
+padrão: uma pasta no diretório temporário da máquina). Cada worker relê o
+arquivo só quando ele muda, conferindo no máximo uma vez por
+`intervalo_recarga` segundos: um logout feito em outro worker vale ali em até
+esse tempo. Revogados já expirados saem do arquivo a cada novo logout. Com
+workers em máquinas diferentes, aponte a variável para um disco compartilhado.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Chave usada quando a variável de ambiente não está definida.
+# Em produção, defina API_TOKEN_SEGREDO com o mesmo valor em todos os workers!
+SEGREDO_DESENVOLVIMENTO = "segredo-de-desenvolvimento-troque-em-producao"
+PASTA_REVOGADOS = Path(tempfile.gettempdir()) / "api_tokens_revogados"
+
+
+class TokenInvalido(ValueError):
+    """Token malformado, com assinatura errada, expirado ou revogado"""
+
+
+def _b64_codificar(dados: bytes) -> str:
+    return base64.urlsafe_b64encode(dados).rstrip(b"=").decode("ascii")
+
+
+def _b64_decodificar(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+
+@contextmanager
+def _trava_entre_processos(arquivo: Path):
+    # Lock exclusivo num arquivo ao lado (fcntl; no Windows não há, e dois
+    # logouts simultâneos em workers diferentes podem perder um dos registros)
+    with open(arquivo.with_name(arquivo.name + ".lock"), "a") as trava:
+        if fcntl is not None:
+            fcntl.flock(trava, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(trava, fcntl.LOCK_UN)
+
+
+class ListaRevogacao:
+    """
+    Tokens revogados (jti -> exp) na memória, sincronizados entre os
+    processos por um único arquivo JSON
+    """
+
+    def __init__(self, arquivo: Union[str, Path], intervalo_recarga: float = 1.0):
+        self.arquivo = Path(arquivo)
+        self.arquivo.parent.mkdir(parents=True, exist_ok=True)
+        self.intervalo_recarga = intervalo_recarga
+        self._revogados: Dict[str, int] = {}
+        self._versao = None  # (inode, tamanho, mtime) do arquivo lido por último
+        self._proxima_checagem = 0.0
+        self._recarregar()
+
+    def _ler_arquivo(self) -> Dict[str, int]:
+        try:
+            dados = json.loads(self.arquivo.read_text())
+        except (OSError, ValueError):
+            return {}
+        return dados if isinstance(dados, dict) else {}
+
+    def _recarregar(self) -> None:
+        try:
+            info = os.stat(self.arquivo)
+        except OSError:
+            return
+        versao = (info.st_ino, info.st_size, info.st_mtime_ns)
+        if versao != self._versao:
+            self._revogados = self._ler_arquivo()  # troca o dict inteiro: quem lê não vê pela metade
+            self._versao = versao
+
+    def _gravar(self, revogados: Dict[str, int]) -> None:
+        temporario = self.arquivo.with_name(f"{self.arquivo.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporario.write_text(json.dumps(revogados, separators=(",", ":")))
+        os.replace(temporario, self.arquivo)
+
+    def _atualizar(self, mudar) -> int:
+        # Lê o arquivo (pode ter registros de outros workers), muda e regrava,
+        # tirando os já expirados; devolve quantos expirados saíram
+        with _trava_entre_processos(self.arquivo):
+            revogados = self._ler_arquivo()
+            mudar(revogados)
+            agora = time.time()
+            validos = {jti: exp for jti, exp in revogados.items() if exp >= agora}
+            self._gravar(validos)
+            self._revogados = validos
+            info = os.stat(self.arquivo)
+            self._versao = (info.st_ino, info.st_size, info.st_mtime_ns)
+        return len(revogados) - len(validos)
+
+    def adicionar(self, jti: str, exp: int) -> None:
+        self._atualizar(lambda revogados: revogados.__setitem__(jti, exp))
+
+    def limpar_expirados(self) -> int:
+        """Tira do arquivo os revogados que já expiraram e devolve quantos foram"""
+        return self._atualizar(lambda revogados: None)
+
+    def __contains__(self, jti: str) -> bool:
+        agora = time.monotonic()
+        if agora >= self._proxima_checagem:
+            self._proxima_checagem = agora + self.intervalo_recarga
+            self._recarregar()
+        return jti in self._revogados
+
+    def __len__(self) -> int:
+        return len(self._revogados)
+
+
+class AssinadorTokens:
+    """
+    Gera, verifica e revoga tokens assinados com HMAC
+
+    - **nome**: nome do app; separa a chave e a lista de revogação de cada app
+    - **segredo**: segredo do HMAC (padrão: variável API_TOKEN_SEGREDO)
+    - **validade_segundos**: tempo de vida de cada token
+    - **tamanho_cache**: quantos tokens verificados manter no cache LRU
+    - **arquivo_revogados**: arquivo da lista de revogação (padrão:
+      `<nome>.json` na pasta da variável API_TOKENS_REVOGADOS); precisa ser
+      o mesmo em todos os workers
+    """
+
+    def __init__(
+        self,
+        nome: str,
+        segredo: Optional[str] = None,
+        validade_segundos: int = 86400,
+        tamanho_cache: int = 1024,
+        arquivo_revogados: Optional[Union[str, Path]] = None,
+    ):
+        segredo = segredo or os.environ.get("API_TOKEN_SEGREDO", SEGREDO_DESENVOLVIMENTO)
+        # Chave própria do app: HMAC(segredo, nome)
+        self._chave = hmac.new(segredo.encode("utf-8"), nome.encode("utf-8"), hashlib.sha256).digest()
+        self.validade_segundos = validade_segundos
+        self.tamanho_cache = tamanho_cache
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # verificar() roda em várias threads (dependências síncronas do FastAPI)
+        self._trava_cache = threading.Lock()
+        if arquivo_revogados is None:
+            pasta = Path(os.environ.get("API_TOKENS_REVOGADOS", PASTA_REVOGADOS))
+            arquivo_revogados = pasta / f"{nome}.json"
+        self._revogados = ListaRevogacao(arquivo_revogados)
+
+    def _assinar(self, payload: bytes) -> str:
+        return _b64_codificar(hmac.new(self._chave, payload, hashlib.sha256).digest())
+
+    def gerar(self, sujeito: str, **extras: Any) -> str:
+        """Gera um token para o `sujeito` (normalmente o ID do usuário)"""
+        dados = {
+            "sub": sujeito,
+            "exp": int(time.time()) + self.validade_segundos,
+            "jti": secrets.token_hex(8),
+            **extras,
+        }
+        payload = json.dumps(dados, separators=(",", ":")).encode("utf-8")
+        return f"{_b64_codificar(payload)}.{self._assinar(payload)}"
+
+    def verificar(self, token: str) -> Dict[str, Any]:
+        """
+        Retorna os dados do token ou levanta TokenInvalido
+
+        Tokens já verificados saem direto do cache; só a expiração e a lista
+        de revogação são conferidas de novo.
+        """
+        agora = time.time()
+        with self._trava_cache:
+            dados = self._cache.get(token)
+            if dados is not None:
+                self._cache.move_to_end(token)
+        if dados is None:
+            dados = self._decodificar(token)
+            with self._trava_cache:
+                self._cache[token] = dados
+                if len(self._cache) > self.tamanho_cache:
+                    self._cache.popitem(last=False)
+
+        if agora > dados["exp"]:
+            with self._trava_cache:
+                self._cache.pop(token, None)
+            raise TokenInvalido("Token expirado")
+        if dados["jti"] in self._revogados:
+            raise TokenInvalido("Token revogado")
+        return dados
+
+    def _decodificar(self, token: str) -> Dict[str, Any]:
+        try:
+            payload_b64, assinatura = token.split(".")
+            payload = _b64_decodificar(payload_b64)
+            assinatura_bytes = assinatura.encode("ascii")
+        except ValueError:  # inclui UnicodeEncodeError (caracteres fora do ASCII)
+            raise TokenInvalido("Token malformado")
+
+        if not hmac.compare_digest(assinatura_bytes, self._assinar(payload).encode("ascii")):
+            raise TokenInvalido("Assinatura inválida")
+
+        try:
+            dados = json.loads(payload)
+        except ValueError:
+            raise TokenInvalido("Token malformado")
+        if not isinstance(dados, dict) or not {"sub", "exp", "jti"} <= dados.keys():
+            raise TokenInvalido("Token malformado")
+        if not isinstance(dados["jti"], str) or not isinstance(dados["exp"], (int, float)):
+            raise TokenInvalido("Token malformado")
+        return dados
+
+    def revogar(self, token: str) -> None:
+        """Invalida um token (logout) até a sua expiração natural"""
+        dados = self.verificar(token)
+        self._revogados.adicionar(dados["jti"], int(dados["exp"]))
+        with self._trava_cache:
+            self._cache.pop(token, None)
+
+    def limpar_expirados(self) -> int:
+        """Remove da lista de revogação e do cache o que já expirou"""
+        agora = time.time()
+        removidos = self._revogados.limpar_expirados()
+        with self._trava_cache:
+            for token in [t for t, d in self._cache.items() if agora > d["exp"]]:
+                del self._cache[token]
+        return removidos
+
+    @property
+    def total_revogados(self) -> int:
+        return len(self._revogados)
+
+    @property
+    def total_em_cache(self) -> int:
+        return len(self._cache)
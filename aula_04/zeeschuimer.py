@@ -1,22 +1,48 @@
-import pandas as pd
+import sys
+
 import matplotlib.pyplot as plt
 
-dados = pd.read_json('../bases/israel.ndjson', lines=True)
-print(dados.head())
+sys.path.append('..')
+from analise_tiktok.cache import carregar_ndjson, estatisticas_cache
+from analise_tiktok.consultas import ConsultaTikTok
+from analise_tiktok.derivadas import derivar_colunas
+from analise_tiktok.leitura import COLUNAS_TIKTOK, listar_caminhos
 
-dados2 = pd.json_normalize(dados['data'])
-print(dados2.head())
+# python zeeschuimer.py --duckdb: responde as perguntas pelo DuckDB, sem
+# carregar o DataFrame (para capturas maiores que a RAM)
+USAR_DUCKDB = '--duckdb' in sys.argv
 
-for posicao, item in enumerate(dados2.columns):
-    print(posicao, item)
 
-colunas_desejadas = ['id', 'desc', 'challenges', 'createTime', 'video.duration', 'video.cover', 'author.id',
-                    'author.nickname', 'author.uniqueId','author.verified', 'music.title', 'authorStats.followingCount',
-                    'authorStats.followerCount', 'authorStats.heartCount', 'authorStats.videoCount',
-                    'authorStats.diggCount', 'authorStats.heart', 'statsV2.collectCount', 'statsV2.commentCount',
-                    'statsV2.diggCount', 'statsV2.playCount', 'statsV2.shareCount']
+def responder_com_duckdb(caminho):
+    """As mesmas perguntas de baixo, com o DuckDB lendo o NDJSON em fluxo e com limite de memória"""
+    with ConsultaTikTok(caminho, memoria_maxima='1GB') as consulta:
+        mais_curtido = consulta.mais_curtido()
+        print(f"O vídeo com mais likes é: {mais_curtido['url']}, com {mais_curtido['valor']} likes")
+        print(f'A média de comentários é {consulta.media("statsV2.commentCount")}')
+        print(f'A mediana de compartilhamentos (shares) é {consulta.mediana("statsV2.shareCount")}')
+        print(f'O total de posts é {consulta.total_posts()}')
+
 
-dados3 = dados2[colunas_desejadas]
+if USAR_DUCKDB:
+    responder_com_duckdb('../bases/israel.ndjson')
+    sys.exit()
+
+# Caminhos disponíveis em cada post (os nomes que o json_normalize geraria)
+for posicao, item in enumerate(listar_caminhos('../bases/israel.ndjson')):
+    print(posicao, item)
+
+colunas_desejadas = COLUNAS_TIKTOK
+
+# Lê o arquivo em blocos, extraindo só as colunas desejadas, já com os tipos
+# compactos (os números do statsV2 vêm como texto e viram inteiros; autores
+# viram category; veja analise_tiktok/esquema.py). Antes:
+#   dados = pd.read_json('../bases/israel.ndjson', lines=True)
+#   dados2 = pd.json_normalize(dados['data'])
+#   dados3 = dados2[colunas_desejadas]
+# Da segunda execução em diante o resultado vem do cache em Parquet
+# (bases/.cache_tiktok/), refeito sozinho se o NDJSON mudar
+dados3 = carregar_ndjson('../bases/israel.ndjson', colunas=colunas_desejadas)
+print(estatisticas_cache())
 print(dados3)
 
 print(dados3.info())
@@ -24,18 +50,8 @@ print(dados3.info())
 for coluna in colunas_desejadas:
     print(f'{coluna}: {dados3[coluna][30]}')
 
-dados3['createdAt'] = dados3['createTime'].apply(lambda x: pd.Timestamp(x, unit='s'))
-
-def preenche_url(item):
-    return f"https://www.tiktok.com/@{item['author.uniqueId']}/video/{item['id']}"
-
-dados3['url'] = dados3.apply(preenche_url, axis=1)
-
-dados3['statsV2.diggCount'] = dados3['statsV2.diggCount'].astype(float)
-dados3['statsV2.playCount'] = dados3['statsV2.playCount'].astype(float)
-dados3['statsV2.shareCount'] = dados3['statsV2.shareCount'].astype(float)
-dados3['statsV2.commentCount'] = dados3['statsV2.commentCount'].astype(float)
-dados3['statsV2.collectCount'] = dados3['statsV2.collectCount'].astype(float)
+# createdAt e url calculados sobre as colunas inteiras (sem apply linha a linha)
+dados3 = derivar_colunas(dados3, ['createdAt', 'url'])
 
 indice_mais_like = dados3['statsV2.diggCount'].idxmax()
 
@@ -45,4 +61,4 @@ print(f'A média de comentários é {dados3["statsV2.commentCount"].mean()}')
 
 print(f'A mediana de compartilhamentos (shares) é {dados3["statsV2.shareCount"].median()}')
 
-print(f'O total de posts é {dados3.shape[0]}')
\ No newline at end of file
+print(f'O total de posts é {dados3.shape[0]}')
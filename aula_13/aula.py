@@ -19,11 +19,15 @@ Data: 2025
 # IMPORTAÇÕES NECESSÁRIAS
 # =============================================================================
 
-import requests
 import pandas as pd
 import json
-from datetime import datetime
+import os
 import time
+from pathlib import Path
+
+from cache_http import CacheHTTP
+from coleta import ColetorHTTP
+from exportacao import exportar_dataset, listar_execucoes, ler_dataset
 
 # =============================================================================
 # CONCEITOS BÁSICOS DE APIs
@@ -64,17 +68,49 @@ print("="*60)
 # URL base da API
 url_base = "https://potterapi-fedeperin.vercel.app/pt"
 
-# 1. BUSCAR LIVROS
-print("\n📚 1. Buscando livros...")
 url_livros = f"{url_base}/books"
+url_personagens = f"{url_base}/characters"
+url_feiticos = f"{url_base}/spells"
+
+# Cache em disco: livros e feitiços quase nunca mudam (valem 1 dia sem
+# consultar a API); personagens são sempre revalidados (ETag/Last-Modified).
+# Sem internet? Rode com AULA_OFFLINE=1 para usar só o que já foi baixado.
+cache = CacheHTTP(
+    Path(__file__).resolve().parent / ".cache_http",
+    ttls={"*/books": 24 * 3600, "*/spells": 24 * 3600},
+    offline=os.environ.get("AULA_OFFLINE") == "1",
+)
+
+# 0. BUSCAR TUDO DE UMA VEZ
+# As três requisições são independentes: em vez de esperar uma terminar para
+# começar a próxima, o ColetorHTTP (coleta.py) dispara as três ao mesmo tempo,
+# reaproveitando as conexões. O tempo total cai para o da mais lenta.
+print("\n🌐 Buscando livros, personagens e feitiços em paralelo...")
+inicio = time.perf_counter()
+with ColetorHTTP(max_paralelo=3, cache=cache) as coletor:
+    resultados = coletor.buscar_varios({
+        "livros": url_livros,
+        "personagens": url_personagens,
+        "feiticos": url_feiticos,
+    })
+for resultado in resultados.values():
+    print(f"   {resultado.url}: {resultado.segundos:.2f}s")
+print(f"⏱️  Tempo total: {time.perf_counter() - inicio:.2f}s "
+      f"(soma das requisições: {sum(r.segundos for r in resultados.values()):.2f}s)")
+print(f"💾 Cache: {cache.estatisticas}")
+
+# Os dados vão para datasets Parquet em aula_13/dados/ (um por tipo de dado,
+# particionados pela data de execução). Cada execução acrescenta um arquivo.
+pasta_dados = Path(__file__).resolve().parent / "dados"
+
+# 1. LIVROS
+print("\n📚 1. Livros...")
+resultado = resultados["livros"]
 
 try:
-    print(f"Fazendo requisição para: {url_livros}")
-    response = requests.get(url_livros)
-    
-    if response.status_code == 200:
+    if resultado.ok:
         print("✅ Requisição realizada com sucesso!")
-        livros_json = response.json()
+        livros_json = resultado.dados
         print(f"Encontrados {len(livros_json)} livros")
         print("Primeiro livro:", livros_json[0]['title'] if livros_json else "N/A")
         
@@ -84,29 +120,24 @@ try:
         print("\nDataFrame dos livros:")
         print(df_livros.head())
         
-        # Exportar dados
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        arquivo = f"harry_potter_livros_{timestamp}.csv"
-        df_livros.to_csv(arquivo, index=False, encoding='utf-8')
+        # Exportar dados (acrescenta ao dataset "livros", partição de hoje)
+        arquivo = exportar_dataset(df_livros, "livros", raiz=pasta_dados)
         print(f"✅ Dados exportados para: {arquivo}")
         
     else:
-        print(f"❌ Erro na requisição. Código: {response.status_code}")
+        print(f"❌ Erro na requisição: {resultado.erro}")
         
 except Exception as e:
-    print(f"❌ Erro na requisição: {e}")
+    print(f"❌ Erro ao processar os livros: {e}")
 
-# 2. BUSCAR PERSONAGENS
-print("\n👥 2. Buscando personagens...")
-url_personagens = f"{url_base}/characters"
+# 2. PERSONAGENS
+print("\n👥 2. Personagens...")
+resultado = resultados["personagens"]
 
 try:
-    print(f"Fazendo requisição para: {url_personagens}")
-    response = requests.get(url_personagens)
-    
-    if response.status_code == 200:
+    if resultado.ok:
         print("✅ Requisição realizada com sucesso!")
-        personagens_json = response.json()
+        personagens_json = resultado.dados
         print(f"Encontrados {len(personagens_json)} personagens")
         
         # Converter para DataFrame
@@ -121,28 +152,23 @@ try:
             print(df_personagens['house'].value_counts())
         
         # Exportar dados
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        arquivo = f"harry_potter_personagens_{timestamp}.xlsx"
-        df_personagens.to_excel(arquivo, index=False)
+        arquivo = exportar_dataset(df_personagens, "personagens", raiz=pasta_dados)
         print(f"✅ Dados exportados para: {arquivo}")
         
     else:
-        print(f"❌ Erro na requisição. Código: {response.status_code}")
+        print(f"❌ Erro na requisição: {resultado.erro}")
         
 except Exception as e:
-    print(f"❌ Erro na requisição: {e}")
+    print(f"❌ Erro ao processar os personagens: {e}")
 
-# 3. BUSCAR FEITIÇOS
-print("\n✨ 3. Buscando feitiços...")
-url_feiticos = f"{url_base}/spells"
+# 3. FEITIÇOS
+print("\n✨ 3. Feitiços...")
+resultado = resultados["feiticos"]
 
 try:
-    print(f"Fazendo requisição para: {url_feiticos}")
-    response = requests.get(url_feiticos)
-    
-    if response.status_code == 200:
+    if resultado.ok:
         print("✅ Requisição realizada com sucesso!")
-        feiticos_json = response.json()
+        feiticos_json = resultado.dados
         print(f"Encontrados {len(feiticos_json)} feitiços")
         
         # Converter para DataFrame
@@ -152,16 +178,24 @@ try:
         print(df_feiticos.head())
         
         # Exportar dados
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        arquivo = f"harry_potter_feiticos_{timestamp}.json"
-        df_feiticos.to_json(arquivo, orient='records', indent=2, force_ascii=False)
+        arquivo = exportar_dataset(df_feiticos, "feiticos", raiz=pasta_dados)
         print(f"✅ Dados exportados para: {arquivo}")
         
     else:
-        print(f"❌ Erro na requisição. Código: {response.status_code}")
+        print(f"❌ Erro na requisição: {resultado.erro}")
         
 except Exception as e:
-    print(f"❌ Erro na requisição: {e}")
+    print(f"❌ Erro ao processar os feitiços: {e}")
+
+# 4. LER DE VOLTA
+# Todas as execuções de um dataset são lidas como um único DataFrame
+# (a coluna "data" diz de qual execução veio cada linha)
+try:
+    print(f"\n📂 Execuções com livros salvos: {listar_execucoes('livros', raiz=pasta_dados)}")
+    df_historico = ler_dataset("livros", raiz=pasta_dados, colunas=["title", "data"])
+    print(f"✅ {len(df_historico)} linhas lidas de todas as execuções")
+except FileNotFoundError:
+    print("❌ Nenhum livro exportado ainda")
 
 # =============================================================================
 # REFLEXÃO: QUANDO CRIAR FUNÇÕES
@@ -190,6 +224,23 @@ def buscar_dados_api(url, nome_dataset):
 # E então usar:
 df_livros = buscar_dados_api(f"{url_base}/books", "livros")
 df_personagens = buscar_dados_api(f"{url_base}/characters", "personagens")
+
+A versão "de verdade" dessa função está em coleta_paginada.py: ela percorre
+APIs com milhares de páginas (página, offset ou cursor), várias ao mesmo
+tempo, tenta de novo quando a API responde 429/5xx e salva o progresso para
+continuar de onde parou se a coleta for interrompida:
+
+from coleta_paginada import PorPagina, buscar_dados_api
+caminho = buscar_dados_api(url, "itens", PorPagina(tamanho=100))
+df = pd.read_json(caminho, lines=True)
+
+E se UMA resposta tiver vários GB? response.json() + pd.DataFrame guardam o
+corpo, os objetos Python e o DataFrame ao mesmo tempo. Em json_streaming.py
+a resposta é lida em fluxo e vira DataFrames em blocos:
+
+from json_streaming import buscar_em_blocos
+for bloco in buscar_em_blocos(url, tamanho_bloco=50_000):
+    exportar_dataset(bloco, "itens")
 """)
 
 
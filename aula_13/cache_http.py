@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CACHE HTTP EM DISCO: não baixar de novo o que não mudou
+=========================================================
+
+Cada execução da aula baixava os mesmos dados outra vez. O `CacheHTTP`
+guarda as respostas em disco (comprimidas com gzip) e, na próxima vez:
+
+1. Dentro do TTL do endpoint: usa o disco, SEM ir à rede
+2. TTL vencido: pergunta ao servidor "mudou?" com os headers
+   If-None-Match (ETag) e If-Modified-Since. Se não mudou, o servidor
+   responde 304 sem corpo e o cache é renovado
+3. Modo offline: usa o que estiver no disco, mesmo vencido; sem cache,
+   levanta `SemCacheOffline`
+
+A chave é a URL + os parâmetros da query. Para cada chave existem dois
+arquivos: `<chave>.json` (metadados: ETag, Last-Modified, quando foi salvo)
+e `<chave>.gz` (o corpo da resposta).
+
+Uso (com o ColetorHTTP de coleta.py):
+
+    cache = CacheHTTP(".cache_http", ttls={"*/books": 24 * 3600}, offline=False)
+    with ColetorHTTP(cache=cache) as coletor:
+        coletor.buscar_varios({...})
+    print(cache.estatisticas)
+
+Autor: Prof. Matheus C. Pestana
+Data: 2025
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Optional, Union
+from urllib.parse import urlencode
+
+
+class SemCacheOffline(Exception):
+    """Modo offline e a URL nunca foi baixada"""
+
+
+class EntradaCache:
+    """Uma resposta guardada em disco"""
+    __slots__ = ("chave", "url", "etag", "last_modified", "salvo_em", "_corpo", "_arquivo")
+
+    def __init__(self, chave: str, url: str, etag: Optional[str], last_modified: Optional[str],
+                 salvo_em: float, arquivo_corpo: Path, corpo: Optional[bytes] = None):
+        self.chave = chave
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.salvo_em = salvo_em
+        self._arquivo = arquivo_corpo
+        self._corpo = corpo
+
+    @property
+    def idade(self) -> float:
+        return time.time() - self.salvo_em
+
+    @property
+    def corpo(self) -> bytes:
+        # O corpo só é lido (e descomprimido) quando alguém precisa dele
+        if self._corpo is None:
+            self._corpo = gzip.decompress(self._arquivo.read_bytes())
+        return self._corpo
+
+    def json(self):
+        return json.loads(self.corpo)
+
+
+class CacheHTTP:
+    """
+    Cache de respostas HTTP em disco, com revalidação condicional
+
+    - **pasta**: onde os arquivos ficam
+    - **ttl_padrao**: segundos em que uma resposta vale sem consultar o
+      servidor (0 = sempre revalidar com ETag/If-Modified-Since)
+    - **ttls**: TTL por endpoint, com padrões estilo glob sobre a URL
+      (ex.: {"*/books": 86400}); o primeiro padrão que casar vale
+    - **offline**: nunca vai à rede; serve o que estiver em disco
+    - **nivel_compressao**: nível do gzip (1 = rápido ... 9 = menor)
+    """
+
+    def __init__(self, pasta: Union[str, Path] = ".cache_http", ttl_padrao: float = 0,
+                 ttls: Optional[Dict[str, float]] = None, offline: bool = False,
+                 nivel_compressao: int = 6):
+        self.pasta = Path(pasta)
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.ttl_padrao = ttl_padrao
+        self.ttls = dict(ttls or {})
+        self.offline = offline
+        self.nivel_compressao = nivel_compressao
+        self._trava = threading.Lock()
+        self.estatisticas = {"frescos": 0, "revalidados": 0, "baixados": 0, "offline": 0}
+
+    # ---------------------------------------------------------------- chaves
+    @staticmethod
+    def chave(url: str, params: Optional[dict] = None) -> str:
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def ttl(self, url: str) -> float:
+        for padrao, segundos in self.ttls.items():
+            if fnmatch(url, padrao):
+                return segundos
+        return self.ttl_padrao
+
+    def _arquivos(self, chave: str):
+        return self.pasta / f"{chave}.json", self.pasta / f"{chave}.gz"
+
+    def _contar(self, evento: str):
+        with self._trava:
+            self.estatisticas[evento] += 1
+
+    # ---------------------------------------------------------- leitura/escrita
+    def ler(self, url: str, params: Optional[dict] = None) -> Optional[EntradaCache]:
+        chave = self.chave(url, params)
+        arquivo_meta, arquivo_corpo = self._arquivos(chave)
+        try:
+            meta = json.loads(arquivo_meta.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return None
+        if not arquivo_corpo.exists():
+            return None
+        return EntradaCache(chave, meta["url"], meta.get("etag"), meta.get("last_modified"),
+                            meta["salvo_em"], arquivo_corpo)
+
+    def fresca(self, entrada: EntradaCache) -> bool:
+        return entrada.idade < self.ttl(entrada.url)
+
+    @staticmethod
+    def cabecalhos_condicionais(entrada: Optional[EntradaCache]) -> Dict[str, str]:
+        cabecalhos = {}
+        if entrada is not None:
+            if entrada.etag:
+                cabecalhos["If-None-Match"] = entrada.etag
+            if entrada.last_modified:
+                cabecalhos["If-Modified-Since"] = entrada.last_modified
+        return cabecalhos
+
+    @staticmethod
+    def _gravar_atomico(arquivo: Path, conteudo: bytes):
+        # Escreve num temporário e renomeia: uma execução interrompida nunca
+        # deixa um arquivo pela metade
+        temporario = arquivo.with_name(f"{arquivo.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporario.write_bytes(conteudo)
+        os.replace(temporario, arquivo)
+
+    def _gravar_meta(self, entrada: EntradaCache):
+        meta = {"url": entrada.url, "etag": entrada.etag,
+                "last_modified": entrada.last_modified, "salvo_em": entrada.salvo_em}
+        self._gravar_atomico(self._arquivos(entrada.chave)[0],
+                             json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+
+    def gravar(self, url: str, params: Optional[dict], corpo: bytes,
+               etag: Optional[str] = None, last_modified: Optional[str] = None) -> EntradaCache:
+        chave = self.chave(url, params)
+        arquivo_corpo = self._arquivos(chave)[1]
+        self._gravar_atomico(arquivo_corpo, gzip.compress(corpo, compresslevel=self.nivel_compressao))
+        entrada = EntradaCache(chave, url, etag, last_modified, time.time(), arquivo_corpo, corpo)
+        self._gravar_meta(entrada)  # metadados por último: só "existe" quando o corpo está completo
+        return entrada
+
+    def renovar(self, entrada: EntradaCache, etag: Optional[str] = None,
+                last_modified: Optional[str] = None) -> EntradaCache:
+        """Resposta 304: o corpo continua valendo, só a data (e validadores) mudam"""
+        entrada.salvo_em = time.time()
+        entrada.etag = etag or entrada.etag
+        entrada.last_modified = last_modified or entrada.last_modified
+        self._gravar_meta(entrada)
+        return entrada
+
+    # -------------------------------------------------------------- requisição
+    def buscar(self, sessao, url: str, params: Optional[dict] = None, timeout=None) -> EntradaCache:
+        """GET com cache: devolve a entrada (do disco ou recém-baixada)"""
+        entrada = self.ler(url, params)
+
+        if self.offline:
+            if entrada is None:
+                raise SemCacheOffline(f"Modo offline e sem cache para {url}")
+            self._contar("offline")
+            return entrada
+
+        if entrada is not None and self.fresca(entrada):
+            self._contar("frescos")
+            return entrada
+
+        response = sessao.get(url, params=params, timeout=timeout,
+                              headers=self.cabecalhos_condicionais(entrada))
+        if response.status_code == 304 and entrada is not None:
+            self._contar("revalidados")
+            return self.renovar(entrada, response.headers.get("ETag"),
+                                response.headers.get("Last-Modified"))
+
+        response.raise_for_status()
+        self._contar("baixados")
+        return self.gravar(url, params, response.content, response.headers.get("ETag"),
+                           response.headers.get("Last-Modified"))
+
+    def limpar(self):
+        """Apaga todas as respostas guardadas"""
+        for arquivo in self.pasta.glob("*"):
+            if arquivo.suffix in (".json", ".gz", ".tmp"):
+                arquivo.unlink(missing_ok=True)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+COLETA: requisições concorrentes com conexões reaproveitadas
+=============================================================
+
+Com `requests.get(...)` solto, cada chamada abre uma conexão nova (handshake
+TCP + TLS) e só começa depois que a anterior terminou. Buscando 3 endpoints,
+o tempo total é a SOMA dos três.
+
+O `ColetorHTTP` resolve os dois problemas:
+1. Uma única `requests.Session` com pool de conexões: a conexão com o
+   servidor fica aberta (keep-alive) e é reaproveitada
+2. Um pool de threads limitado (`max_paralelo`): as requisições saem ao
+   mesmo tempo e o tempo total cai para o da MAIS LENTA
+
+Com `cache=CacheHTTP(...)` (cache_http.py), as respostas ficam em disco e só
+são baixadas de novo quando mudam.
+
+Uso:
+
+    with ColetorHTTP(max_paralelo=4) as coletor:
+        resultados = coletor.buscar_varios({
+            "livros": f"{url_base}/books",
+            "personagens": f"{url_base}/characters",
+        })
+    if resultados["livros"].ok:
+        df = pd.DataFrame(resultados["livros"].dados)
+
+Autor: Prof. Matheus C. Pestana
+Data: 2025
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from cache_http import CacheHTTP, SemCacheOffline
+
+# (conexão, leitura) em segundos: desiste logo de servidores fora do ar,
+# mas dá tempo para respostas grandes chegarem
+TIMEOUT_PADRAO = (5, 30)
+
+
+class Resultado(NamedTuple):
+    """Resultado de uma requisição: `dados` se deu certo, `erro` se falhou"""
+    nome: str
+    url: str
+    dados: Any = None
+    erro: Optional[str] = None
+    status: Optional[int] = None
+    segundos: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.erro is None
+
+
+class ColetorHTTP:
+    """
+    Busca JSON de várias URLs ao mesmo tempo, numa única sessão HTTP
+
+    - **max_paralelo**: requisições simultâneas (e conexões no pool)
+    - **timeout**: segundos, ou (conexão, leitura)
+    - **cabecalhos**: headers enviados em todas as requisições
+    - **cache**: CacheHTTP opcional (respostas em disco, revalidação condicional)
+    """
+
+    def __init__(self, max_paralelo: int = 8,
+                 timeout: Union[float, Tuple[float, float]] = TIMEOUT_PADRAO,
+                 cabecalhos: Optional[Dict[str, str]] = None,
+                 cache: Optional[CacheHTTP] = None):
+        self.max_paralelo = max_paralelo
+        self.timeout = timeout
+        self.cache = cache
+        self.sessao = requests.Session()
+        self.sessao.headers.update(cabecalhos or {})
+        # Um pool do tamanho do paralelismo: cada thread tem uma conexão livre
+        adaptador = HTTPAdapter(pool_connections=max_paralelo, pool_maxsize=max_paralelo)
+        self.sessao.mount("http://", adaptador)
+        self.sessao.mount("https://", adaptador)
+
+    def buscar_json(self, url: str, params: Optional[dict] = None) -> Any:
+        """Uma requisição GET; levanta exceção se o status não for 2xx"""
+        if self.cache is not None:
+            return self.cache.buscar(self.sessao, url, params, self.timeout).json()
+        response = self.sessao.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def buscar(self, nome: str, url: str, params: Optional[dict] = None) -> Resultado:
+        """Como buscar_json, mas devolve o erro no Resultado em vez de levantar"""
+        inicio = time.perf_counter()
+        try:
+            dados = self.buscar_json(url, params)
+        except requests.HTTPError as e:
+            return Resultado(nome, url, erro=f"HTTP {e.response.status_code}",
+                             status=e.response.status_code,
+                             segundos=time.perf_counter() - inicio)
+        except (requests.RequestException, SemCacheOffline, ValueError) as e:
+            return Resultado(nome, url, erro=str(e), segundos=time.perf_counter() - inicio)
+        return Resultado(nome, url, dados=dados, status=200, segundos=time.perf_counter() - inicio)
+
+    def buscar_varios(self, urls: Dict[str, str],
+                      params: Optional[Dict[str, dict]] = None) -> Dict[str, Resultado]:
+        """
+        Busca todas as URLs em paralelo (no máximo `max_paralelo` por vez)
+
+        `urls` é {nome: url}; `params` (opcional) é {nome: parâmetros da query}.
+        Devolve {nome: Resultado} na mesma ordem de `urls`. Uma URL que falha
+        não interrompe as outras.
+        """
+        params = params or {}
+        with ThreadPoolExecutor(max_workers=min(self.max_paralelo, len(urls)) or 1) as executor:
+            futuros = {nome: executor.submit(self.buscar, nome, url, params.get(nome))
+                       for nome, url in urls.items()}
+            return {nome: futuro.result() for nome, futuro in futuros.items()}
+
+    def fechar(self):
+        self.sessao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
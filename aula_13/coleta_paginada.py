@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+COLETA PAGINADA: milhares de páginas, com retomada
+====================================================
+
+A seção "REFLEXÃO" da aula esboça `buscar_dados_api(url, nome_dataset)`.
+Aqui está a versão para APIs paginadas de verdade (dezenas de milhares de
+páginas):
+
+- Estratégias de paginação plugáveis: número de página, offset ou cursor
+- Várias páginas ao mesmo tempo (limite de concorrência) com httpx assíncrono
+- 429 e 5xx: tenta de novo com espera exponencial e aleatória ("jitter"),
+  respeitando o header Retry-After quando existe
+- Os registros vão direto para um arquivo NDJSON (um JSON por linha), sem
+  acumular tudo na memória
+- Um arquivo de checkpoint guarda o progresso: se a coleta for interrompida
+  (Ctrl+C, queda de rede...), rodar de novo continua de onde parou
+
+Com páginas em paralelo, os registros ficam no arquivo na ordem em que as
+páginas chegaram (não necessariamente na ordem das páginas).
+
+Uso:
+
+    caminho = buscar_dados_api("https://api.exemplo.com/itens", "itens",
+                               PorPagina(tamanho=100, campo_registros="data"))
+    df = pd.read_json(caminho, lines=True)
+
+Autor: Prof. Matheus C. Pestana
+Data: 2025
+"""
+
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+import httpx
+
+STATUS_REPETIVEIS = {429, 500, 502, 503, 504}
+
+
+# =============================================================================
+# ESTRATÉGIAS DE PAGINAÇÃO
+# =============================================================================
+
+class Paginacao(ABC):
+    """
+    Base das estratégias: sabe tirar os registros da resposta e reconhecer a
+    última página. Os parâmetros de cada página vêm das subclasses:
+    PaginacaoIndexada (página i, em paralelo) ou PorCursor (sequencial)
+
+    - **campo_registros**: onde estão os registros na resposta JSON
+      (ex.: "data" ou "resultados.itens"); None se a resposta já é a lista
+    - **tamanho**: registros por página, se conhecido (página menor = última)
+    """
+
+    nome = "base"
+    sequencial = False  # True: cada página depende da anterior (cursor)
+
+    def __init__(self, campo_registros: Optional[str] = None, tamanho: Optional[int] = None):
+        self.campo_registros = campo_registros
+        self.tamanho = tamanho
+
+    def registros(self, resposta: Any) -> List[Any]:
+        if self.campo_registros:
+            for parte in self.campo_registros.split("."):
+                resposta = resposta.get(parte) if isinstance(resposta, dict) else None
+        return resposta or []
+
+    def ultima(self, resposta: Any, registros: List[Any]) -> bool:
+        """Página vazia ou incompleta = última"""
+        return not registros or (self.tamanho is not None and len(registros) < self.tamanho)
+
+
+class PaginacaoIndexada(Paginacao):
+    """Páginas endereçadas pelo índice (0, 1, 2...): podem ser pedidas em paralelo"""
+
+    @abstractmethod
+    def parametros(self, indice: int) -> Dict[str, Any]:
+        """Parâmetros da query da página `indice`"""
+
+
+class PorPagina(PaginacaoIndexada):
+    """?page=1, ?page=2, ... (opcionalmente com ?per_page=tamanho)"""
+
+    nome = "pagina"
+
+    def __init__(self, parametro: str = "page", inicio: int = 1, tamanho: Optional[int] = None,
+                 parametro_tamanho: str = "per_page", campo_registros: Optional[str] = None):
+        super().__init__(campo_registros, tamanho)
+        self.parametro = parametro
+        self.inicio = inicio
+        self.parametro_tamanho = parametro_tamanho
+
+    def parametros(self, indice: int) -> Dict[str, Any]:
+        parametros = {self.parametro: self.inicio + indice}
+        if self.tamanho is not None:
+            parametros[self.parametro_tamanho] = self.tamanho
+        return parametros
+
+
+class PorOffset(PaginacaoIndexada):
+    """?offset=0&limit=100, ?offset=100&limit=100, ..."""
+
+    nome = "offset"
+
+    def __init__(self, tamanho: int = 100, parametro_offset: str = "offset",
+                 parametro_limite: str = "limit", campo_registros: Optional[str] = None):
+        super().__init__(campo_registros, tamanho)
+        self.parametro_offset = parametro_offset
+        self.parametro_limite = parametro_limite
+
+    def parametros(self, indice: int) -> Dict[str, Any]:
+        return {self.parametro_offset: indice * self.tamanho, self.parametro_limite: self.tamanho}
+
+
+class PorCursor(Paginacao):
+    """
+    ?cursor=<valor devolvido pela página anterior>
+
+    - **campo_proximo**: onde está o próximo cursor na resposta (ex.: "next_cursor")
+    """
+
+    nome = "cursor"
+    sequencial = True
+
+    def __init__(self, campo_proximo: str = "next_cursor", parametro: str = "cursor",
+                 campo_registros: Optional[str] = "data", tamanho: Optional[int] = None,
+                 parametro_tamanho: str = "limit"):
+        super().__init__(campo_registros, tamanho)
+        self.campo_proximo = campo_proximo
+        self.parametro = parametro
+        self.parametro_tamanho = parametro_tamanho
+
+    def parametros_cursor(self, cursor: Optional[str]) -> Dict[str, Any]:
+        parametros = {} if cursor is None else {self.parametro: cursor}
+        if self.tamanho is not None:
+            parametros[self.parametro_tamanho] = self.tamanho
+        return parametros
+
+    def proximo(self, resposta: Any) -> Optional[str]:
+        for parte in self.campo_proximo.split("."):
+            resposta = resposta.get(parte) if isinstance(resposta, dict) else None
+        return resposta or None
+
+
+# =============================================================================
+# CHECKPOINT
+# =============================================================================
+
+class Checkpoint:
+    """
+    Progresso de uma coleta, salvo em JSON
+
+    - **ate**: todas as páginas com índice menor já estão no arquivo
+    - **extras**: páginas acima de `ate` que também já estão (paralelismo)
+    - **fim**: índice da primeira página depois da última (quando já se sabe)
+    - **cursor**: próximo cursor (estratégia por cursor)
+    - **bytes**: tamanho do NDJSON quando o checkpoint foi salvo; o que
+      estiver além disso é de páginas não confirmadas e é descartado
+    """
+
+    def __init__(self, caminho: Path):
+        self.caminho = caminho
+        self.ate = 0
+        self.extras: set = set()
+        self.fim: Optional[int] = None
+        self.cursor: Optional[str] = None
+        self.bytes = 0
+        self.registros = 0
+        self.concluida = False
+
+    @classmethod
+    def carregar(cls, caminho: Path) -> "Checkpoint":
+        checkpoint = cls(caminho)
+        if caminho.exists():
+            dados = json.loads(caminho.read_text(encoding="utf-8"))
+            checkpoint.ate = dados["ate"]
+            checkpoint.extras = set(dados["extras"])
+            checkpoint.fim = dados["fim"]
+            checkpoint.cursor = dados["cursor"]
+            checkpoint.bytes = dados["bytes"]
+            checkpoint.registros = dados["registros"]
+            checkpoint.concluida = dados["concluida"]
+        return checkpoint
+
+    def feita(self, indice: int) -> bool:
+        return indice < self.ate or indice in self.extras
+
+    def marcar(self, indice: int):
+        self.extras.add(indice)
+        while self.ate in self.extras:
+            self.extras.remove(self.ate)
+            self.ate += 1
+
+    def salvar(self):
+        dados = {"ate": self.ate, "extras": sorted(self.extras), "fim": self.fim,
+                 "cursor": self.cursor, "bytes": self.bytes, "registros": self.registros,
+                 "concluida": self.concluida}
+        temporario = self.caminho.with_name(self.caminho.name + ".tmp")
+        temporario.write_text(json.dumps(dados), encoding="utf-8")
+        os.replace(temporario, self.caminho)
+
+
+# =============================================================================
+# COLETOR
+# =============================================================================
+
+class ResumoColeta(NamedTuple):
+    paginas: int          # páginas baixadas nesta execução
+    registros: int        # total de registros no arquivo
+    repeticoes: int       # requisições repetidas por 429/5xx/erro de rede
+    segundos: float
+    retomada: bool        # continuou uma coleta anterior
+
+
+class ColetaFalhou(Exception):
+    """Uma página falhou mesmo depois de todas as tentativas"""
+
+
+class ColetorPaginado:
+    """
+    Coleta todas as páginas de um endpoint para um arquivo NDJSON
+
+    - **url**: endpoint paginado
+    - **paginacao**: PorPagina, PorOffset ou PorCursor
+    - **destino**: arquivo .ndjson de saída
+    - **checkpoint**: arquivo de progresso (padrão: destino + ".checkpoint.json")
+    - **params**: parâmetros fixos da query (filtros etc.)
+    - **max_paralelo**: páginas simultâneas (ignorado no cursor, que é sequencial)
+    - **max_tentativas**: tentativas por página antes de desistir
+    - **espera_base** / **espera_maxima**: backoff exponencial com jitter, em segundos
+    - **checkpoint_a_cada**: páginas entre gravações do checkpoint
+    - **max_paginas**: para depois de tantas páginas nesta execução (testes)
+    """
+
+    def __init__(self, url: str, paginacao: Paginacao, destino: Union[str, Path],
+                 checkpoint: Union[str, Path, None] = None, params: Optional[dict] = None,
+                 max_paralelo: int = 8, max_tentativas: int = 6, espera_base: float = 0.5,
+                 espera_maxima: float = 30.0, timeout: float = 30.0,
+                 cabecalhos: Optional[Dict[str, str]] = None, checkpoint_a_cada: int = 20,
+                 max_paginas: Optional[int] = None):
+        self.url = url
+        self.paginacao = paginacao
+        self.destino = Path(destino)
+        self.caminho_checkpoint = Path(checkpoint or f"{self.destino}.checkpoint.json")
+        self.params = dict(params or {})
+        self.max_paralelo = 1 if paginacao.sequencial else max_paralelo
+        self.max_tentativas = max_tentativas
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.timeout = timeout
+        self.cabecalhos = cabecalhos or {}
+        self.checkpoint_a_cada = checkpoint_a_cada
+        self.max_paginas = max_paginas
+        self.repeticoes = 0
+
+    # ------------------------------------------------------------ requisições
+    def _espera(self, tentativa: int, response: Optional[httpx.Response]) -> float:
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                return min(float(retry_after), self.espera_maxima)
+        # "Full jitter": aleatório entre 0 e o teto exponencial, para que
+        # clientes que falharam juntos não tentem de novo juntos
+        return random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** tentativa))
+
+    async def _requisitar(self, cliente: httpx.AsyncClient, parametros: dict) -> Any:
+        for tentativa in range(self.max_tentativas):
+            response = None
+            try:
+                response = await cliente.get(self.url, params={**self.params, **parametros})
+                if response.status_code not in STATUS_REPETIVEIS:
+                    response.raise_for_status()
+                    return response.json()
+                erro = f"HTTP {response.status_code}"
+            except httpx.TransportError as e:  # conexão, timeout...
+                erro = repr(e)
+            if tentativa + 1 < self.max_tentativas:
+                self.repeticoes += 1
+                await asyncio.sleep(self._espera(tentativa, response))
+        raise ColetaFalhou(f"{self.url} {parametros}: {erro} após {self.max_tentativas} tentativas")
+
+    # ----------------------------------------------------------------- arquivo
+    def _abrir_destino(self, checkpoint: Checkpoint):
+        self.destino.parent.mkdir(parents=True, exist_ok=True)
+        arquivo = open(self.destino, "ab")
+        # Descarta linhas de páginas que não chegaram a entrar no checkpoint
+        arquivo.truncate(checkpoint.bytes)
+        arquivo.seek(checkpoint.bytes)
+        return arquivo
+
+    def _gravar(self, arquivo, checkpoint: Checkpoint, registros: List[Any]):
+        if registros:
+            arquivo.write(b"".join(json.dumps(r, ensure_ascii=False).encode("utf-8") + b"\n"
+                                   for r in registros))
+        checkpoint.registros += len(registros)
+
+    def _confirmar(self, arquivo, checkpoint: Checkpoint):
+        # Primeiro os dados chegam ao disco, depois o checkpoint aponta para eles
+        arquivo.flush()
+        os.fsync(arquivo.fileno())
+        checkpoint.bytes = arquivo.tell()
+        checkpoint.salvar()
+
+    # ------------------------------------------------------------------ coleta
+    async def coletar(self) -> ResumoColeta:
+        inicio = time.perf_counter()
+        checkpoint = Checkpoint.carregar(self.caminho_checkpoint)
+        retomada = self.caminho_checkpoint.exists()
+        if checkpoint.concluida:
+            return ResumoColeta(0, checkpoint.registros, 0, 0.0, retomada)
+
+        self.repeticoes = 0
+        estado = {"paginas": 0, "desde_checkpoint": 0}
+        limites = httpx.Limits(max_connections=self.max_paralelo,
+                               max_keepalive_connections=self.max_paralelo)
+        arquivo = self._abrir_destino(checkpoint)
+        try:
+            async with httpx.AsyncClient(timeout=self.timeout, limits=limites,
+                                         headers=self.cabecalhos) as cliente:
+                if self.paginacao.sequencial:
+                    await self._coletar_cursor(cliente, arquivo, checkpoint, estado)
+                else:
+                    await self._coletar_indexado(cliente, arquivo, checkpoint, estado)
+        finally:
+            # Interrompida ou não, o que já está no arquivo fica registrado
+            self._confirmar(arquivo, checkpoint)
+            arquivo.close()
+
+        return ResumoColeta(estado["paginas"], checkpoint.registros, self.repeticoes,
+                            time.perf_counter() - inicio, retomada)
+
+    def _pagina_gravada(self, arquivo, checkpoint: Checkpoint, estado: dict):
+        estado["paginas"] += 1
+        estado["desde_checkpoint"] += 1
+        if estado["desde_checkpoint"] >= self.checkpoint_a_cada:
+            estado["desde_checkpoint"] = 0
+            self._confirmar(arquivo, checkpoint)
+
+    def _limite_atingido(self, estado: dict) -> bool:
+        return self.max_paginas is not None and estado["paginas"] >= self.max_paginas
+
+    async def _coletar_indexado(self, cliente, arquivo, checkpoint: Checkpoint, estado: dict):
+        proximo = {"indice": checkpoint.ate}
+
+        async def trabalhador():
+            while True:
+                indice = proximo["indice"]
+                if (checkpoint.fim is not None and indice >= checkpoint.fim) or self._limite_atingido(estado):
+                    return
+                proximo["indice"] += 1
+                if checkpoint.feita(indice):
+                    continue
+
+                resposta = await self._requisitar(cliente, self.paginacao.parametros(indice))
+                registros = self.paginacao.registros(resposta)
+                if checkpoint.fim is not None and indice >= checkpoint.fim:
+                    continue  # outra página já mostrou que esta passa do fim
+                if self.paginacao.ultima(resposta, registros):
+                    fim = indice + 1 if registros else indice
+                    checkpoint.fim = fim if checkpoint.fim is None else min(checkpoint.fim, fim)
+                self._gravar(arquivo, checkpoint, registros)
+                checkpoint.marcar(indice)
+                self._pagina_gravada(arquivo, checkpoint, estado)
+
+        tarefas = [asyncio.create_task(trabalhador()) for _ in range(self.max_paralelo)]
+        try:
+            await asyncio.gather(*tarefas)
+        except BaseException:
+            for tarefa in tarefas:
+                tarefa.cancel()
+            await asyncio.gather(*tarefas, return_exceptions=True)
+            raise
+        checkpoint.concluida = checkpoint.fim is not None and checkpoint.ate >= checkpoint.fim
+
+    async def _coletar_cursor(self, cliente, arquivo, checkpoint: Checkpoint, estado: dict):
+        while not self._limite_atingido(estado):
+            parametros = self.paginacao.parametros_cursor(checkpoint.cursor)
+            resposta = await self._requisitar(cliente, parametros)
+            registros = self.paginacao.registros(resposta)
+            self._gravar(arquivo, checkpoint, registros)
+            checkpoint.cursor = self.paginacao.proximo(resposta)
+            checkpoint.ate += 1
+            self._pagina_gravada(arquivo, checkpoint, estado)
+            if checkpoint.cursor is None or not registros:
+                checkpoint.concluida = True
+                return
+
+    def executar(self) -> ResumoColeta:
+        """Versão síncrona de coletar() (para scripts e notebooks sem loop)"""
+        return asyncio.run(self.coletar())
+
+
+def buscar_dados_api(url: str, nome_dataset: str, paginacao: Optional[Paginacao] = None,
+                     pasta: Union[str, Path] = ".", **opcoes) -> Path:
+    """
+    Coleta todas as páginas de `url` em `<pasta>/<nome_dataset>.ndjson`
+
+    Rodar de novo depois de uma interrupção continua de onde parou; depois
+    de concluída, não baixa nada (apague o .checkpoint.json para recomeçar).
+    Leia o resultado com `pd.read_json(caminho, lines=True)`.
+    """
+    destino = Path(pasta) / f"{nome_dataset}.ndjson"
+    coletor = ColetorPaginado(url, paginacao or PorPagina(), destino, **opcoes)
+    resumo = coletor.executar()
+    print(f"✅ {nome_dataset}: {resumo.registros} registros em {destino} "
+          f"({resumo.paginas} páginas nesta execução, {resumo.repeticoes} repetições, "
+          f"{resumo.segundos:.1f}s)")
+    return destino
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+EXPORTAÇÃO COLUNAR: Parquet particionado no lugar de CSV/XLSX/JSON
+====================================================================
+
+Antes, cada execução da aula gerava um arquivo novo com data e hora no nome
+(`harry_potter_livros_20250101_120000.csv`, `.xlsx`, `.json`). Problemas:
+- `to_excel` é muito lento para tabelas grandes
+- Os arquivos não se juntam: para analisar várias execuções é preciso ler
+  e concatenar tudo na mão
+- CSV e JSON perdem os tipos (datas viram texto, listas viram "[...]")
+
+Aqui cada exportação é mais um arquivo dentro de um DATASET particionado:
+
+    dados/
+      dataset=livros/
+        data=2025-01-01/parte-120000123456-3f2a9c01.parquet
+        data=2025-01-02/parte-093000654321-9b1c7d02.parquet
+      dataset=personagens/
+        ...
+
+- Formato Parquet (ou Arrow/Feather) com esquema explícito: tipos preservados
+- Modo "append": exportar de novo só acrescenta um arquivo
+- Colunas de texto repetitivo (ex.: casa de Hogwarts) com codificação de
+  dicionário: cada valor distinto é guardado uma vez
+- `ler_dataset` lê tudo (ou só algumas datas/colunas) como um único DataFrame
+
+Uso:
+
+    exportar_dataset(df_livros, "livros", raiz="dados")
+    df = ler_dataset("livros", raiz="dados", desde="2025-01-01", colunas=["title"])
+
+Autor: Prof. Matheus C. Pestana
+Data: 2025
+"""
+
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+FORMATOS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# Texto com até esta fração de valores distintos vira dicionário
+LIMITE_DICIONARIO = 0.5
+
+# Esquemas dos datasets da aula (API do Harry Potter). Colunas que faltarem
+# na resposta viram nulos; colunas novas entram com o tipo inferido.
+TEXTO_CATEGORICO = pa.dictionary(pa.int32(), pa.string())
+ESQUEMAS: Dict[str, pa.Schema] = {
+    "livros": pa.schema([
+        ("number", pa.int32()),
+        ("title", pa.string()),
+        ("originalTitle", pa.string()),
+        ("releaseDate", pa.string()),
+        ("description", pa.string()),
+        ("pages", pa.int32()),
+        ("cover", pa.string()),
+        ("index", pa.int32()),
+    ]),
+    "personagens": pa.schema([
+        ("fullName", pa.string()),
+        ("nickname", pa.string()),
+        ("hogwartsHouse", TEXTO_CATEGORICO),
+        ("interpretedBy", pa.string()),
+        ("children", pa.list_(pa.string())),
+        ("image", pa.string()),
+        ("birthdate", pa.string()),
+        ("index", pa.int32()),
+    ]),
+    "feiticos": pa.schema([
+        ("spell", pa.string()),
+        ("use", pa.string()),
+        ("index", pa.int32()),
+    ]),
+}
+
+ArgumentoData = Union[str, date, datetime, None]
+
+
+def _texto_data(valor: ArgumentoData) -> Optional[str]:
+    if valor is None or isinstance(valor, str):
+        return valor
+    return valor.strftime("%Y-%m-%d")
+
+
+def _pasta_dataset(raiz: Union[str, Path], dataset: str) -> Path:
+    return Path(raiz) / f"dataset={dataset}"
+
+
+def _arquivos(pasta: Path) -> List[Path]:
+    return sorted(p for extensao in FORMATOS.values() for p in pasta.glob(f"data=*/*{extensao}"))
+
+
+def _ler_esquema(arquivo: Path) -> pa.Schema:
+    if arquivo.suffix == FORMATOS["arrow"]:
+        with pa.memory_map(str(arquivo)) as fonte:
+            return pa.ipc.open_file(fonte).schema
+    return pq.read_schema(arquivo)
+
+
+def esquema_do_dataset(dataset: str, raiz: Union[str, Path] = "dados") -> Optional[pa.Schema]:
+    """Esquema já gravado (união dos esquemas de todos os arquivos), ou None"""
+    arquivos = _arquivos(_pasta_dataset(raiz, dataset))
+    if not arquivos:
+        return None
+    return pa.unify_schemas([_ler_esquema(a) for a in arquivos])
+
+
+def inferir_esquema(df: pd.DataFrame, limite_dicionario: float = LIMITE_DICIONARIO) -> pa.Schema:
+    """Tipos inferidos pelo Arrow, com texto repetitivo como dicionário"""
+    esquema = pa.Schema.from_pandas(df, preserve_index=False)
+    campos = []
+    for campo in esquema:
+        if (pa.types.is_string(campo.type) or pa.types.is_large_string(campo.type)) and len(df):
+            distintos = df[campo.name].nunique(dropna=True)
+            if distintos <= limite_dicionario * len(df):
+                campo = campo.with_type(TEXTO_CATEGORICO)
+        campos.append(campo)
+    return pa.schema(campos)
+
+
+def para_tabela(df: pd.DataFrame, esquema: pa.Schema) -> pa.Table:
+    """
+    Converte o DataFrame para o esquema: colunas do esquema que faltam viram
+    nulos, colunas a mais entram com o tipo inferido
+    """
+    df = df.reset_index(drop=True)
+    extras = [c for c in df.columns if c not in esquema.names]
+    campos = list(esquema)
+    if extras:
+        campos += list(inferir_esquema(df[extras]))
+    colunas = []
+    for campo in campos:
+        if campo.name in df.columns:
+            colunas.append(pa.array(df[campo.name], type=campo.type, from_pandas=True))
+        else:
+            colunas.append(pa.nulls(len(df), type=campo.type))
+    return pa.Table.from_arrays(colunas, schema=pa.schema(campos))
+
+
+def exportar_dataset(df: pd.DataFrame, dataset: str, raiz: Union[str, Path] = "dados",
+                     data_execucao: ArgumentoData = None, esquema: Optional[pa.Schema] = None,
+                     formato: str = "parquet", compressao: str = "zstd") -> Path:
+    """
+    Acrescenta `df` ao dataset, na partição da data de execução (padrão: hoje)
+
+    O esquema usado é, nesta ordem: `esquema`, o que o dataset já tem em
+    disco, o de ESQUEMAS[dataset] ou o inferido do DataFrame. Devolve o
+    caminho do arquivo criado.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato}. Use: {', '.join(FORMATOS)}")
+    esquema = (esquema or esquema_do_dataset(dataset, raiz)
+               or ESQUEMAS.get(dataset) or inferir_esquema(df))
+    tabela = para_tabela(df, esquema)
+
+    agora = datetime.now()
+    particao = _pasta_dataset(raiz, dataset) / f"data={_texto_data(data_execucao) or agora.strftime('%Y-%m-%d')}"
+    particao.mkdir(parents=True, exist_ok=True)
+    # Nome único e em ordem de gravação (a leitura segue a ordem dos nomes)
+    arquivo = particao / f"parte-{agora.strftime('%H%M%S%f')}-{uuid.uuid4().hex[:8]}{FORMATOS[formato]}"
+    temporario = arquivo.with_name(arquivo.name + ".tmp")
+
+    if formato == "parquet":
+        pq.write_table(tabela, temporario, compression=compressao, use_dictionary=True)
+    else:
+        feather.write_feather(tabela, temporario, compression=compressao)
+    temporario.replace(arquivo)  # quem lê nunca vê um arquivo pela metade
+    return arquivo
+
+
+def abrir_dataset(dataset: str, raiz: Union[str, Path] = "dados") -> ds.Dataset:
+    """Dataset do pyarrow (leitura preguiçosa, com filtros nas partições)"""
+    pasta = _pasta_dataset(raiz, dataset)
+    arquivos = _arquivos(pasta)
+    if not arquivos:
+        raise FileNotFoundError(f"Dataset vazio ou inexistente: {pasta}")
+    particionamento = ds.partitioning(pa.schema([("data", pa.string())]), flavor="hive")
+    esquema = pa.unify_schemas([_ler_esquema(a) for a in arquivos] + [particionamento.schema])
+    fontes = []
+    for formato, extensao in FORMATOS.items():
+        deste_formato = [str(a) for a in arquivos if a.suffix == extensao]
+        if deste_formato:
+            fontes.append(ds.dataset(deste_formato, schema=esquema,
+                                     format="ipc" if formato == "arrow" else formato,
+                                     partitioning=particionamento, partition_base_dir=str(pasta)))
+    return fontes[0] if len(fontes) == 1 else ds.dataset(fontes)
+
+
+def ler_dataset(dataset: str, raiz: Union[str, Path] = "dados", desde: ArgumentoData = None,
+                ate: ArgumentoData = None, colunas: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Lê o dataset como um DataFrame
+
+    - **desde** / **ate**: datas de execução (inclusive); só as partições
+      do intervalo são lidas
+    - **colunas**: lê só estas colunas (as outras nem saem do disco)
+    """
+    filtro = None
+    for operador, valor in ((">=", _texto_data(desde)), ("<=", _texto_data(ate))):
+        if valor is not None:
+            condicao = ds.field("data") >= valor if operador == ">=" else ds.field("data") <= valor
+            filtro = condicao if filtro is None else filtro & condicao
+    tabela = abrir_dataset(dataset, raiz).to_table(
+        columns=list(colunas) if colunas is not None else None, filter=filtro)
+    return tabela.to_pandas()
+
+
+def listar_execucoes(dataset: str, raiz: Union[str, Path] = "dados") -> List[str]:
+    """Datas de execução que têm dados, em ordem"""
+    return sorted({a.parent.name.removeprefix("data=") for a in _arquivos(_pasta_dataset(raiz, dataset))})
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON EM FLUXO: respostas enormes sem estourar a memória
+=========================================================
+
+O caminho da aula é:
+
+    dados = response.json()     # 1. corpo inteiro (bytes) + objetos Python
+    df = pd.DataFrame(dados)    # 2. ... + o DataFrame
+
+No pico, as três cópias estão na memória ao mesmo tempo. Para uma resposta
+de alguns GB isso não cabe.
+
+Aqui a resposta é lida aos pedaços (`stream=True`) e um parser iterativo
+(ijson) entrega um registro do array por vez. A cada `tamanho_bloco`
+registros sai um DataFrame, e o próximo bloco só começa depois que o
+anterior foi usado. O pico de memória passa a depender do tamanho do bloco,
+não do tamanho da resposta.
+
+Uso:
+
+    for bloco in buscar_em_blocos(url, tamanho_bloco=50_000):
+        exportar_dataset(bloco, "personagens")   # ou agregue e descarte
+
+    # Arrays dentro de um objeto ({"data": [...]}): prefixo="data.item"
+
+Autor: Prof. Matheus C. Pestana
+Data: 2025
+"""
+
+from typing import BinaryIO, Iterator, List, Optional, Sequence
+
+import ijson
+import pandas as pd
+import requests
+
+from coleta import TIMEOUT_PADRAO
+
+TAMANHO_BLOCO = 50_000
+TAMANHO_LEITURA = 1 << 16  # bytes lidos da rede por vez
+
+
+def iterar_registros(fonte: BinaryIO, prefixo: str = "item") -> Iterator[dict]:
+    """
+    Um registro por vez de um array JSON
+
+    - **fonte**: arquivo binário (open(..., "rb"), response.raw...)
+    - **prefixo**: caminho do array no ijson: "item" para um array na raiz,
+      "data.item" para {"data": [...]}
+    """
+    # use_float: números com casas decimais como float (o padrão é Decimal)
+    return ijson.items(fonte, prefixo, use_float=True, buf_size=TAMANHO_LEITURA)
+
+
+def em_blocos(registros: Iterator[dict], tamanho_bloco: int = TAMANHO_BLOCO,
+              colunas: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """Agrupa registros em DataFrames de até `tamanho_bloco` linhas"""
+    bloco: List[dict] = []
+    for registro in registros:
+        bloco.append(registro)
+        if len(bloco) >= tamanho_bloco:
+            yield pd.DataFrame(bloco, columns=colunas)
+            bloco = []
+    if bloco:
+        yield pd.DataFrame(bloco, columns=colunas)
+
+
+def ler_em_blocos(caminho, tamanho_bloco: int = TAMANHO_BLOCO, prefixo: str = "item",
+                  colunas: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+    """DataFrames em blocos a partir de um arquivo .json grande"""
+    with open(caminho, "rb") as arquivo:
+        yield from em_blocos(iterar_registros(arquivo, prefixo), tamanho_bloco, colunas)
+
+
+def buscar_em_blocos(url: str, tamanho_bloco: int = TAMANHO_BLOCO, prefixo: str = "item",
+                     colunas: Optional[Sequence[str]] = None, params: Optional[dict] = None,
+                     sessao: Optional[requests.Session] = None,
+                     timeout=TIMEOUT_PADRAO) -> Iterator[pd.DataFrame]:
+    """
+    GET em `url` lendo o corpo em fluxo; devolve DataFrames em blocos
+
+    Passe `sessao=coletor.sessao` para reaproveitar as conexões de um
+    ColetorHTTP. (O cache em disco não é usado aqui: ele guarda o corpo
+    inteiro, justamente o que este caminho evita.)
+    """
+    cliente = sessao or requests
+    with cliente.get(url, params=params, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True  # descomprime gzip/deflate no caminho
+        yield from em_blocos(iterar_registros(response.raw, prefixo), tamanho_bloco, colunas)
@@ -0,0 +1,87 @@
+# ===========================================
+# ARMAZENAMENTO COMPACTO PARA O avancado.py
+# ===========================================
+# Os "bancos" do avancado.py guardavam um modelo Pydantic inteiro por
+# registro (ProdutoResponse, PedidoResponse...). Cada instância carrega um
+# __dict__, o conjunto de campos preenchidos e um objeto datetime, o que
+# pesa muito quando há milhões de registros.
+#
+# Aqui cada registro é uma classe com __slots__ (sem __dict__), a data é
+# guardada como timestamp (float) e os itens de um pedido viram tuplas.
+# O modelo Pydantic só é montado na borda da API, a partir de para_dict().
+
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Tuple
+
+
+class Registro:
+    """
+    Base dos registros compactos
+
+    Cada subclasse declara seus __slots__ e a tupla CAMPOS com os nomes
+    expostos pela API (na ordem do modelo de resposta).
+    """
+    __slots__ = ()
+    CAMPOS: Tuple[str, ...] = ()
+
+    @property
+    def data_criacao(self) -> datetime:
+        return datetime.fromtimestamp(self.criado_em)
+
+    def para_dict(self) -> Dict[str, Any]:
+        """Monta o dicionário usado para criar/serializar o modelo Pydantic"""
+        return {campo: getattr(self, campo) for campo in self.CAMPOS}
+
+    def __repr__(self) -> str:
+        campos = ", ".join(f"{s}={getattr(self, s)!r}" for s in self.__slots__)
+        return f"{type(self).__name__}({campos})"
+
+
+class UsuarioRegistro(Registro):
+    __slots__ = ("id", "nome", "email", "idade", "ativo", "criado_em")
+    CAMPOS = ("id", "nome", "email", "idade", "ativo", "data_criacao")
+
+    def __init__(self, id: int, nome: str, email: str, idade: int, ativo: bool = True):
+        self.id = id
+        self.nome = nome
+        self.email = email
+        self.idade = idade
+        self.ativo = ativo
+        self.criado_em = time.time()
+
+
+class ProdutoRegistro(Registro):
+    __slots__ = ("id", "nome", "preco", "categoria", "descricao", "estoque", "criado_em")
+    CAMPOS = ("id", "nome", "preco", "categoria", "descricao", "estoque", "data_criacao")
+
+    def __init__(self, id: int, nome: str, preco: float, categoria: Any,
+                 descricao: Any = None, estoque: int = 0):
+        self.id = id
+        self.nome = nome
+        self.preco = preco
+        self.categoria = categoria  # membro do Enum: um único objeto compartilhado
+        self.descricao = descricao
+        self.estoque = estoque
+        self.criado_em = time.time()
+
+
+class PedidoRegistro(Registro):
+    # itens: tupla de (produto_id, quantidade, preco_unitario)
+    __slots__ = ("id", "itens_compactos", "total", "criado_em", "status")
+    CAMPOS = ("id", "itens", "total", "data_criacao", "status")
+
+    def __init__(self, id: int, itens: Iterable[Tuple[int, int, float]], total: float,
+                 status: str = "Pendente"):
+        self.id = id
+        self.itens_compactos = tuple(itens)
+        self.total = total
+        self.criado_em = time.time()
+        self.status = status
+
+    @property
+    def itens(self):
+        return [
+            {"produto_id": p, "quantidade": q, "preco_unitario": preco}
+            for p, q, preco in self.itens_compactos
+        ]
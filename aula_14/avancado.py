@@ -4,15 +4,25 @@
 # Este arquivo mostra conceitos avançados do FastAPI
 # Incluindo Pydantic, validação de dados, autenticação, e muito mais
 
-from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from typing import List, Optional, Dict, Any
-from datetime import datetime, date
+from datetime import datetime, date, time as dtime
 from enum import Enum
 import asyncio
 import json
+import sys
+from pathlib import Path
+
+# Permite importar os módulos compartilhados da raiz do repositório (api_comum/)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from api_comum.tokens import AssinadorTokens, TokenInvalido
+from api_comum.coalescencia import SingleFlight, SingleFlightMiddleware
+from api_comum.projecao import Projecao, DESCRICAO_FIELDS
+from armazenamento import UsuarioRegistro, ProdutoRegistro, PedidoRegistro
+from estoque import Estoque, EstoqueInsuficiente
 
 # ===========================================
 # 1. MODELOS PYDANTIC - VALIDAÇÃO DE DADOS
@@ -92,20 +102,44 @@ class PedidoResponse(BaseModel):
     data_criacao: datetime
     status: str
 
+# Modelos para autenticação
+class LoginRequest(BaseModel):
+    usuario: str
+    senha: str
+
+class TokenResponse(BaseModel):
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
+
 # ===========================================
 # 2. SIMULAÇÃO DE BANCO DE DADOS
 # ===========================================
 
 # Em uma aplicação real, você usaria um banco de dados real
-usuarios_db: Dict[int, UsuarioResponse] = {}
-produtos_db: Dict[int, ProdutoResponse] = {}
-pedidos_db: Dict[int, PedidoResponse] = {}
+# Os registros são objetos compactos (veja armazenamento.py); os modelos
+# Pydantic só são criados na resposta, a partir de registro.para_dict()
+usuarios_db: Dict[int, UsuarioRegistro] = {}
+produtos_db: Dict[int, ProdutoRegistro] = {}
+pedidos_db: Dict[int, PedidoRegistro] = {}
+
+# Reservas de estoque com uma trava por "listra" de produtos (veja estoque.py)
+estoque = Estoque(produtos_db)
+
+# Projeções para ?fields= sobre os registros compactos (acesso por atributo).
+# CAMPOS são os campos dos modelos de resposta, e os registros só são criados
+# a partir de dados já validados (UsuarioCreate, ProdutoCreate)
+PROJECAO_USUARIOS = Projecao(UsuarioRegistro.CAMPOS, por_atributo=True)
+PROJECAO_PRODUTOS = Projecao(ProdutoRegistro.CAMPOS, por_atributo=True)
 
 # Contadores para IDs
 usuario_counter = 0
 produto_counter = 0
 pedido_counter = 0
 
+# Segundos que processar_pedido leva (simulação); benchmarks usam 0
+TEMPO_PROCESSAMENTO_PEDIDO = 5
+
 # ===========================================
 # 3. CONFIGURAÇÃO DA APLICAÇÃO
 # ===========================================
@@ -127,29 +161,60 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Requisições idênticas e simultâneas ao relatório compartilham um único
+# cálculo (mesma rota, query, token, cookies e Origin). Veja api_comum/coalescencia.py
+coalescencia = SingleFlight()
+app.add_middleware(SingleFlightMiddleware, grupo=coalescencia, caminhos=["/relatorios/vendas"])
+
 # ===========================================
 # 4. SISTEMA DE AUTENTICAÇÃO SIMPLES
 # ===========================================
 
-# Simulando um sistema de autenticação básico
+# Tokens assinados com HMAC: qualquer worker valida o token sem consultar
+# um banco de dados (veja api_comum/tokens.py). O nome separa a chave e a
+# lista de revogação das do fastapi_completo
 security = HTTPBearer()
+tokens = AssinadorTokens("avancado", validade_segundos=3600)
 
 def verificar_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """
     Função para verificar se o token é válido
-    Em uma aplicação real, você validaria contra um banco de dados
+    A assinatura é conferida localmente e o resultado fica em cache
     """
     token = credentials.credentials
     
-    # Simulando validação de token
-    if token != "token-secreto-123":
+    try:
+        dados = tokens.verificar(token)
+    except TokenInvalido as erro:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token inválido",
+            detail=str(erro),
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    return {"usuario": "admin", "token": token}
+    return {"usuario": dados["sub"], "token": token}
+
+@app.post("/auth/token", response_model=TokenResponse)
+async def obter_token(credenciais: LoginRequest):
+    """
+    Gera um token de acesso (usuário de teste: admin / Senha123)
+    """
+    # Em uma aplicação real, você verificaria a senha no banco de dados
+    if credenciais.usuario != "admin" or credenciais.senha != "Senha123":
+        raise HTTPException(status_code=401, detail="Credenciais inválidas")
+    
+    return TokenResponse(
+        access_token=tokens.gerar(credenciais.usuario),
+        expires_in=tokens.validade_segundos
+    )
+
+@app.post("/auth/logout")
+async def logout(current_user: dict = Depends(verificar_token)):
+    """
+    Revoga o token atual
+    """
+    tokens.revogar(current_user["token"])
+    return {"mensagem": "Logout realizado com sucesso"}
 
 # ===========================================
 # 5. ENDPOINTS COM VALIDAÇÃO PYDANTIC
@@ -166,23 +231,28 @@ async def criar_usuario(usuario: UsuarioCreate):
     # Simulando hash da senha (em produção, use bcrypt ou similar)
     senha_hash = f"hash_{usuario.senha}"
     
-    novo_usuario = UsuarioResponse(
+    novo_usuario = UsuarioRegistro(
         id=usuario_counter,
         nome=usuario.nome,
         email=usuario.email,
         idade=usuario.idade,
-        ativo=usuario.ativo,
-        data_criacao=datetime.now()
+        ativo=usuario.ativo
     )
     
     usuarios_db[usuario_counter] = novo_usuario
     
-    return novo_usuario
+    return novo_usuario.para_dict()
 
 @app.get("/usuarios", response_model=List[UsuarioResponse])
-async def listar_usuarios(skip: int = 0, limit: int = 10, ativo: Optional[bool] = None):
+async def listar_usuarios(
+    skip: int = 0,
+    limit: int = 10,
+    ativo: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description=DESCRICAO_FIELDS)
+):
     """
     Lista usuários com paginação e filtros
+    Use ?fields=id,nome para receber apenas alguns campos
     """
     usuarios = list(usuarios_db.values())
     
@@ -191,7 +261,9 @@ async def listar_usuarios(skip: int = 0, limit: int = 10, ativo: Optional[bool]
         usuarios = [u for u in usuarios if u.ativo == ativo]
     
     # Aplicar paginação
-    return usuarios[skip:skip + limit]
+    if fields:
+        return PROJECAO_USUARIOS.resposta(usuarios[skip:skip + limit], fields)
+    return [u.para_dict() for u in usuarios[skip:skip + limit]]
 
 @app.get("/usuarios/{usuario_id}", response_model=UsuarioResponse)
 async def buscar_usuario(usuario_id: int):
@@ -201,7 +273,7 @@ async def buscar_usuario(usuario_id: int):
     if usuario_id not in usuarios_db:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
-    return usuarios_db[usuario_id]
+    return usuarios_db[usuario_id].para_dict()
 
 # ===========================================
 # 6. ENDPOINTS DE PRODUTOS
@@ -215,19 +287,18 @@ async def criar_produto(produto: ProdutoCreate, current_user: dict = Depends(ver
     global produto_counter
     produto_counter += 1
     
-    novo_produto = ProdutoResponse(
+    novo_produto = ProdutoRegistro(
         id=produto_counter,
         nome=produto.nome,
         preco=produto.preco,
         categoria=produto.categoria,
         descricao=produto.descricao,
-        estoque=produto.estoque,
-        data_criacao=datetime.now()
+        estoque=produto.estoque
     )
     
     produtos_db[produto_counter] = novo_produto
     
-    return novo_produto
+    return novo_produto.para_dict()
 
 @app.get("/produtos", response_model=List[ProdutoResponse])
 async def listar_produtos(
@@ -235,10 +306,12 @@ async def listar_produtos(
     preco_min: Optional[float] = None,
     preco_max: Optional[float] = None,
     skip: int = 0,
-    limit: int = 10
+    limit: int = 10,
+    fields: Optional[str] = Query(None, description=DESCRICAO_FIELDS)
 ):
     """
     Lista produtos com filtros avançados
+    Use ?fields=id,nome,preco para receber apenas alguns campos
     """
     produtos = list(produtos_db.values())
     
@@ -252,7 +325,9 @@ async def listar_produtos(
     if preco_max is not None:
         produtos = [p for p in produtos if p.preco <= preco_max]
     
-    return produtos[skip:skip + limit]
+    if fields:
+        return PROJECAO_PRODUTOS.resposta(produtos[skip:skip + limit], fields)
+    return [p.para_dict() for p in produtos[skip:skip + limit]]
 
 # ===========================================
 # 7. SISTEMA DE PEDIDOS
@@ -274,34 +349,54 @@ async def criar_pedido(pedido: PedidoCreate, background_tasks: BackgroundTasks):
                 detail=f"Produto com ID {item.produto_id} não encontrado"
             )
     
-    # Calcular total
-    total = 0
-    for item in pedido.itens:
-        produto = produtos_db[item.produto_id]
-        total += item.preco_unitario * item.quantidade
+    # Reservar o estoque de todos os itens de uma vez (tudo ou nada)
+    pedido_id = pedido_counter
+    try:
+        estoque.reservar(pedido_id, [(i.produto_id, i.quantidade) for i in pedido.itens])
+    except EstoqueInsuficiente as erro:
+        raise HTTPException(status_code=409, detail=str(erro))
     
-    # Criar pedido
-    novo_pedido = PedidoResponse(
-        id=pedido_counter,
-        itens=pedido.itens,
-        total=total,
-        data_criacao=datetime.now(),
-        status="Pendente"
-    )
-    
-    pedidos_db[pedido_counter] = novo_pedido
+    try:
+        # Calcular total
+        total = 0
+        for item in pedido.itens:
+            produto = produtos_db[item.produto_id]
+            total += item.preco_unitario * item.quantidade
+        
+        # Criar pedido
+        novo_pedido = PedidoRegistro(
+            id=pedido_id,
+            itens=[(i.produto_id, i.quantidade, i.preco_unitario) for i in pedido.itens],
+            total=total,
+            status="Pendente"
+        )
+        
+        pedidos_db[pedido_id] = novo_pedido
+    except Exception:
+        # Se algo falhar, a reserva é devolvida
+        estoque.liberar(pedido_id)
+        raise
     
     # Adicionar tarefa em background para processar o pedido
-    background_tasks.add_task(processar_pedido, pedido_counter)
+    background_tasks.add_task(processar_pedido, pedido_id)
     
-    return novo_pedido
+    return novo_pedido.para_dict()
 
 async def processar_pedido(pedido_id: int):
     """
     Função executada em background para processar pedidos
     """
-    await asyncio.sleep(5)  # Simula processamento
+    try:
+        await asyncio.sleep(TEMPO_PROCESSAMENTO_PEDIDO)  # Simula processamento
+    except BaseException:
+        # Processamento interrompido: devolve o estoque reservado
+        estoque.liberar(pedido_id)
+        if pedido_id in pedidos_db:
+            pedidos_db[pedido_id].status = "Cancelado"
+        raise
     
+    # Processado: a reserva vira baixa definitiva no estoque
+    estoque.confirmar(pedido_id)
     if pedido_id in pedidos_db:
         pedidos_db[pedido_id].status = "Processado"
         print(f"Pedido {pedido_id} processado com sucesso!")
@@ -321,12 +416,14 @@ async def relatorio_vendas(
     """
     pedidos = list(pedidos_db.values())
     
-    # Filtrar por data se especificado
+    # Filtrar por data se especificado (comparando timestamps, sem criar datetimes)
     if data_inicio:
-        pedidos = [p for p in pedidos if p.data_criacao.date() >= data_inicio]
+        inicio = datetime.combine(data_inicio, dtime.min).timestamp()
+        pedidos = [p for p in pedidos if p.criado_em >= inicio]
     
     if data_fim:
-        pedidos = [p for p in pedidos if p.data_criacao.date() <= data_fim]
+        fim = datetime.combine(data_fim, dtime.max).timestamp()
+        pedidos = [p for p in pedidos if p.criado_em <= fim]
     
     # Calcular estatísticas
     total_vendas = sum(p.total for p in pedidos)
@@ -343,7 +440,7 @@ async def relatorio_vendas(
             "total_pedidos": total_pedidos,
             "ticket_medio": round(ticket_medio, 2)
         },
-        "pedidos": pedidos
+        "pedidos": [p.para_dict() for p in pedidos]
     }
 
 # ===========================================
@@ -370,6 +467,8 @@ async def metrics():
         "usuarios_cadastrados": len(usuarios_db),
         "produtos_cadastrados": len(produtos_db),
         "pedidos_realizados": len(pedidos_db),
+        "reservas_pendentes": estoque.reservas_pendentes,
+        "coalescencia": coalescencia.metricas(),
         "timestamp": datetime.now()
     }
 
@@ -394,11 +493,13 @@ async def add_process_time_header(request, call_next):
 # uvicorn avancado:app --reload
 # 
 # Endpoints principais:
+# - POST /auth/token - Obter token (admin / Senha123)
+# - POST /auth/logout - Revogar token (requer auth)
 # - POST /usuarios - Criar usuário (com validação)
 # - GET /usuarios - Listar usuários (com paginação)
 # - POST /produtos - Criar produto (requer auth)
 # - GET /produtos - Listar produtos (com filtros)
-# - POST /pedidos - Criar pedido (com background tasks)
+# - POST /pedidos - Criar pedido (reserva estoque; 409 se faltar)
 # - GET /relatorios/vendas - Relatório (requer auth)
 # - GET /health - Status da API
 # - GET /metrics - Métricas da API
@@ -0,0 +1,114 @@
+# ===========================================
+# RESERVA DE ESTOQUE COM TRAVAS POR LISTRA
+# ===========================================
+# Um pedido só pode ser criado se houver estoque para TODOS os seus itens.
+# Uma única trava global resolveria a concorrência, mas serializaria todos
+# os pedidos. Aqui usamos "lock striping": um conjunto fixo de travas, e
+# cada produto usa a trava de índice produto_id % número_de_listras.
+# Pedidos com produtos em listras diferentes não esperam um pelo outro.
+#
+# Ciclo de vida de uma reserva:
+#   reservar()  -> separa as quantidades (o estoque ainda não muda)
+#   confirmar() -> baixa o estoque de verdade (pedido processado)
+#   liberar()   -> devolve as quantidades (pedido falhou ou foi cancelado)
+
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+
+class EstoqueInsuficiente(Exception):
+    """Não há estoque disponível para um dos itens do pedido"""
+
+    def __init__(self, produto_id: int, solicitado: int, disponivel: int):
+        self.produto_id = produto_id
+        self.solicitado = solicitado
+        self.disponivel = disponivel
+        super().__init__(
+            f"Estoque insuficiente para o produto {produto_id}: "
+            f"solicitado {solicitado}, disponível {disponivel}"
+        )
+
+
+class Estoque:
+    """
+    Controle de reservas sobre um "banco" de produtos
+
+    - **produtos**: dicionário id -> registro com o atributo `estoque`
+    - **listras**: quantidade de travas (mais listras = menos disputa)
+    """
+
+    def __init__(self, produtos: Dict[int, object], listras: int = 64):
+        self.produtos = produtos
+        self._travas = [threading.Lock() for _ in range(listras)]
+        self._reservado: Dict[int, int] = defaultdict(int)
+        self._reservas: Dict[int, Tuple[Tuple[int, int], ...]] = {}
+
+    def _indices(self, produto_ids: Iterable[int]):
+        # Ordenar os índices evita deadlock entre pedidos com vários produtos
+        return sorted({produto_id % len(self._travas) for produto_id in produto_ids})
+
+    def _travar(self, produto_ids: Iterable[int]):
+        indices = self._indices(produto_ids)
+        for indice in indices:
+            self._travas[indice].acquire()
+        return indices
+
+    def _destravar(self, indices):
+        for indice in reversed(indices):
+            self._travas[indice].release()
+
+    def disponivel(self, produto_id: int) -> int:
+        """Estoque atual menos o que está reservado"""
+        return self.produtos[produto_id].estoque - self._reservado[produto_id]
+
+    def reservar(self, pedido_id: int, itens: Iterable[Tuple[int, int]]) -> None:
+        """
+        Reserva todos os itens de uma vez (tudo ou nada)
+
+        - **itens**: pares (produto_id, quantidade); o mesmo produto pode
+          aparecer mais de uma vez
+        """
+        quantidades: Dict[int, int] = defaultdict(int)
+        for produto_id, quantidade in itens:
+            quantidades[produto_id] += quantidade
+
+        indices = self._travar(quantidades)
+        try:
+            # Primeiro verifica tudo, depois reserva: nenhum item fica
+            # reservado pela metade se outro faltar
+            for produto_id, quantidade in quantidades.items():
+                disponivel = self.disponivel(produto_id)
+                if quantidade > disponivel:
+                    raise EstoqueInsuficiente(produto_id, quantidade, disponivel)
+            for produto_id, quantidade in quantidades.items():
+                self._reservado[produto_id] += quantidade
+            self._reservas[pedido_id] = tuple(quantidades.items())
+        finally:
+            self._destravar(indices)
+
+    def _encerrar(self, pedido_id: int, baixar_estoque: bool) -> bool:
+        reserva = self._reservas.pop(pedido_id, None)
+        if reserva is None:
+            return False
+        indices = self._travar(produto_id for produto_id, _ in reserva)
+        try:
+            for produto_id, quantidade in reserva:
+                self._reservado[produto_id] -= quantidade
+                if baixar_estoque:
+                    self.produtos[produto_id].estoque -= quantidade
+        finally:
+            self._destravar(indices)
+        return True
+
+    def confirmar(self, pedido_id: int) -> bool:
+        """Baixa do estoque as quantidades reservadas para o pedido"""
+        return self._encerrar(pedido_id, baixar_estoque=True)
+
+    def liberar(self, pedido_id: int) -> bool:
+        """Devolve as quantidades reservadas, sem alterar o estoque"""
+        return self._encerrar(pedido_id, baixar_estoque=False)
+
+    @property
+    def reservas_pendentes(self) -> int:
+        return len(self._reservas)
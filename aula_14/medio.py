@@ -4,13 +4,26 @@
 # Este arquivo mostra conceitos intermediários do FastAPI
 # Incluindo dicionários, diferentes métodos HTTP, e conceitos de async
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from typing import List, Optional
 import asyncio
+import itertools
+import sys
+from pathlib import Path
+
+# Permite importar os módulos compartilhados da raiz do repositório (api_comum/)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from api_comum.cache import cache_swr
+from api_comum.coalescencia import SingleFlight, SingleFlightMiddleware
+from api_comum.projecao import Projecao, resposta_json, DESCRICAO_FIELDS
 
 # Criando nossa aplicação
 app = FastAPI(title="API Intermediária", version="1.0.0")
 
+# Requisições simultâneas às estatísticas compartilham um único cálculo
+coalescencia = SingleFlight()
+app.add_middleware(SingleFlightMiddleware, grupo=coalescencia, caminhos=["/estatisticas"])
+
 # ===========================================
 # 1. TRABALHANDO COM DICIONÁRIOS E DADOS
 # ===========================================
@@ -22,6 +35,10 @@ usuarios_db = {
     3: {"id": 3, "nome": "Helen Folasade Adu", "email": "sa@de.uk", "idade": 66}
 }
 
+# Próximo ID de usuário (auto-incremento): next() em O(1), sem repetir IDs
+# mesmo com criações simultâneas
+proximo_id_usuario = itertools.count(max(usuarios_db) + 1)
+
 produtos_db = {
     1: {"id": 1, "nome": "Notebook Gamer", "preco": 2500.00, "categoria": "Eletrônicos"},
     2: {"id": 2, "nome": "Livro Aprenda Python!", "preco": 89.90, "categoria": "Livros"},
@@ -29,17 +46,29 @@ produtos_db = {
     4: {"id": 4, "nome": "SSD 1TB", "preco": 500.99, "categoria": "Eletrônicos"}
 }
 
+# Projeções para ?fields= (ex.: /usuarios?fields=id,nome)
+PROJECAO_USUARIOS = Projecao(["id", "nome", "email", "idade"])
+PROJECAO_PRODUTOS = Projecao(["id", "nome", "preco", "categoria"])
+
+def banco_ok() -> bool:
+    """Verificação de prontidão (python -m api_comum.servidor medio --verificacao medio:banco_ok)"""
+    return bool(usuarios_db) and bool(produtos_db)
+
 # ===========================================
 # 2. MÉTODOS HTTP DIFERENTES
 # ===========================================
 
 # GET - Buscar dados
 @app.get("/usuarios")
-def listar_usuarios():
+def listar_usuarios(fields: Optional[str] = Query(None, description=DESCRICAO_FIELDS)):
     """
     Retorna todos os usuários
     GET /usuarios
+    GET /usuarios?fields=id,nome
     """
+    if fields:
+        return resposta_json({"usuarios": PROJECAO_USUARIOS.aplicar(usuarios_db.values(), fields)})
+    
     return {"usuarios": list(usuarios_db.values())}
 
 @app.get("/usuarios/{usuario_id}")
@@ -62,7 +91,7 @@ def criar_usuario(nome: str, email: str, idade: int):
     POST /usuarios?nome=Polyana&email=polyana.barboza@fgv.br&idade=30
     """
     # Gerando um novo ID (simulando auto-incremento)
-    novo_id = max(usuarios_db.keys()) + 1 if usuarios_db else 1
+    novo_id = next(proximo_id_usuario)
     
     novo_usuario = {
         "id": novo_id,
@@ -72,6 +101,7 @@ def criar_usuario(nome: str, email: str, idade: int):
     }
     
     usuarios_db[novo_id] = novo_usuario
+    estatisticas_usuarios.invalidar()  # os dados mudaram: recalcular estatísticas
     
     return {"mensagem": "Usuário criado com sucesso", "usuario": novo_usuario}
 
@@ -91,6 +121,7 @@ def atualizar_usuario(usuario_id: int, nome: str, email: str, idade: int):
         "email": email,
         "idade": idade
     }
+    estatisticas_usuarios.invalidar()
     
     return {"mensagem": "Usuário atualizado com sucesso", "usuario": usuarios_db[usuario_id]}
 
@@ -105,6 +136,7 @@ def deletar_usuario(usuario_id: int):
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     
     usuario_removido = usuarios_db.pop(usuario_id)
+    estatisticas_usuarios.invalidar()
     
     return {"mensagem": "Usuário removido com sucesso", "usuario_removido": usuario_removido}
 
@@ -125,7 +157,11 @@ async def exemplo_async():
     return {"mensagem": "Esta resposta demorou 1 segundo para ser processada"}
 
 # Função assíncrona com processamento
+# O cache_swr devolve na hora o último resultado calculado e, quando ele
+# fica velho (ou os usuários mudam), recalcula UMA vez em segundo plano.
+# O header "Age" informa há quantos segundos o resultado foi calculado.
 @app.get("/estatisticas")
+@cache_swr(max_idade=60)
 async def estatisticas_usuarios():
     """
     Calcula estatísticas dos usuários de forma assíncrona
@@ -150,13 +186,18 @@ async def estatisticas_usuarios():
 # ===========================================
 
 @app.get("/produtos")
-def listar_produtos(categoria: Optional[str] = None, preco_maximo: Optional[float] = None):
+def listar_produtos(
+    categoria: Optional[str] = None,
+    preco_maximo: Optional[float] = None,
+    fields: Optional[str] = Query(None, description=DESCRICAO_FIELDS)
+):
     """
     Lista produtos com filtros opcionais
     GET /produtos
     GET /produtos?categoria=Eletrônicos
     GET /produtos?preco_maximo=100.0
     GET /produtos?categoria=Eletrônicos&preco_maximo=100.0
+    GET /produtos?fields=nome,preco
     """
     produtos = list(produtos_db.values())
     
@@ -167,6 +208,9 @@ def listar_produtos(categoria: Optional[str] = None, preco_maximo: Optional[floa
     if preco_maximo is not None:
         produtos = [p for p in produtos if p["preco"] <= preco_maximo]
     
+    if fields:
+        return resposta_json({"produtos": PROJECAO_PRODUTOS.aplicar(produtos, fields), "total": len(produtos)})
+    
     return {"produtos": produtos, "total": len(produtos)}
 
 # ===========================================
@@ -201,7 +245,7 @@ def resposta_personalizada():
 # - PUT /usuarios/{id} - Atualiza usuário
 # - DELETE /usuarios/{id} - Remove usuário
 # - GET /async-exemplo - Exemplo de async
-# - GET /usuarios/estatisticas - Estatísticas dos usuários
+# - GET /estatisticas - Estatísticas dos usuários (com cache)
 # - GET /produtos - Lista produtos com filtros
 # - GET /resposta-personalizada - Resposta customizada
 
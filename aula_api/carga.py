@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TESTE DE CARGA: os cenários do teste_rapido.py em paralelo
+
+Repete os passos de `teste_rapido.py` (PASSOS_API_SIMPLES e
+PASSOS_API_COMPLETA, definidos só lá) com um cliente HTTP assíncrono
+(httpx), que reaproveita as conexões (keep-alive).
+Vários "usuários virtuais" repetem o cenário ao mesmo tempo durante a
+duração escolhida.
+
+No final, mostra por endpoint: requisições, erros, requisições por segundo e
+latências p50/p95/p99. Se algum limite de latência for ultrapassado, o
+programa termina com código 1 (útil em scripts e CI).
+
+Uso (com a API rodando localmente):
+    python carga.py --cenario simples --concorrencia 20 --duracao 10
+    python carga.py --cenario completa --max-p95 200 --max-p99 500
+
+Autor: LabExtracaoAnalise2025
+Data: 2025
+"""
+
+import argparse
+import asyncio
+import math
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+import httpx
+
+from teste_rapido import (PASSOS_API_COMPLETA, PASSOS_API_SIMPLES, Passo, guardar_resposta,
+                          novo_contexto, requisicao)
+
+
+def percentil(valores_ordenados: List[float], p: float) -> float:
+    """Percentil pelo método do posto mais próximo (valores já ordenados)"""
+    if not valores_ordenados:
+        return 0.0
+    posicao = max(0, min(len(valores_ordenados) - 1, math.ceil(p / 100 * len(valores_ordenados)) - 1))
+    return valores_ordenados[posicao]
+
+
+class Resultados:
+    """Latências (em segundos) e erros por endpoint"""
+
+    def __init__(self):
+        self.latencias: Dict[str, List[float]] = defaultdict(list)
+        self.erros: Dict[str, int] = defaultdict(int)
+
+    def resumo(self, duracao: float) -> Dict[str, dict]:
+        resumo = {}
+        for nome in sorted(set(self.latencias) | set(self.erros)):
+            valores = sorted(self.latencias[nome])
+            resumo[nome] = {
+                "requisicoes": len(valores),
+                "erros": self.erros[nome],
+                "rps": len(valores) / duracao if duracao else 0.0,
+                "p50_ms": percentil(valores, 50) * 1000,
+                "p95_ms": percentil(valores, 95) * 1000,
+                "p99_ms": percentil(valores, 99) * 1000,
+            }
+        return resumo
+
+
+class PassoFalhou(Exception):
+    """Um passo não respondeu o status esperado"""
+
+
+class Sessao:
+    """Cliente de um usuário virtual: faz as requisições e mede cada uma"""
+
+    def __init__(self, cliente: httpx.AsyncClient, resultados: Resultados):
+        self.cliente = cliente
+        self.resultados = resultados
+        self.passo_atual = "cenário"
+
+    async def executar(self, passos: List[Passo]):
+        """Os passos do teste_rapido.py, em ordem, registrando a latência de cada um"""
+        contexto = novo_contexto()
+        for passo in passos:
+            self.passo_atual = passo.rota
+            metodo, caminho, argumentos = requisicao(passo, contexto)
+            inicio = time.perf_counter()
+            response = await self.cliente.request(metodo, caminho, **argumentos)
+            self.resultados.latencias[passo.rota].append(time.perf_counter() - inicio)
+            if response.status_code != passo.status:
+                raise PassoFalhou(f"{passo.rota}: {response.status_code}")
+            if passo.guardar:
+                guardar_resposta(passo, response.json(), contexto)
+
+
+# Os mesmos passos do teste rápido
+CENARIOS = {
+    "simples": PASSOS_API_SIMPLES,
+    "completa": PASSOS_API_COMPLETA,
+}
+
+
+async def executar_cenario(cliente: httpx.AsyncClient, cenario: List[Passo], resultados: Resultados) -> bool:
+    """
+    Uma execução do cenário. Qualquer falha (status inesperado, erro de
+    rede, resposta sem o campo esperado...) conta como erro do passo em que
+    aconteceu e encerra só esta execução
+    """
+    sessao = Sessao(cliente, resultados)
+    try:
+        await sessao.executar(cenario)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        resultados.erros[sessao.passo_atual] += 1
+        return False
+    return True
+
+
+async def usuario_virtual(cliente, cenario, resultados, fim: float):
+    while time.perf_counter() < fim:
+        await executar_cenario(cliente, cenario, resultados)
+
+
+async def gerar_carga(base_url: str, cenario: str, concorrencia: int, duracao: float,
+                      timeout: float = 10.0):
+    """Roda `concorrencia` usuários virtuais por `duracao` segundos"""
+    cenario = CENARIOS[cenario]
+    resultados = Resultados()
+    # Um pool de conexões para todos: no máximo uma conexão por usuário virtual
+    limites = httpx.Limits(max_connections=concorrencia, max_keepalive_connections=concorrencia)
+    async with httpx.AsyncClient(base_url=base_url, limits=limites, timeout=timeout) as cliente:
+        inicio = time.perf_counter()
+        fim = inicio + duracao
+        await asyncio.gather(*(usuario_virtual(cliente, cenario, resultados, fim)
+                               for _ in range(concorrencia)))
+        tempo_total = time.perf_counter() - inicio
+    return resultados.resumo(tempo_total), tempo_total
+
+
+def imprimir_resumo(resumo: Dict[str, dict], tempo_total: float):
+    print(f"\n{'endpoint':<28}{'req':>8}{'erros':>7}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for nome, r in resumo.items():
+        print(f"{nome:<28}{r['requisicoes']:>8}{r['erros']:>7}{r['rps']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}")
+    total = sum(r["requisicoes"] for r in resumo.values())
+    print(f"\nTotal: {total} requisições em {tempo_total:.1f}s ({total / tempo_total:.1f} req/s)")
+
+
+def verificar_limites(resumo: Dict[str, dict], limites: Dict[str, float]) -> List[str]:
+    """Lista as violações dos limites de latência (ex.: {'p95_ms': 200})"""
+    violacoes = []
+    for nome, r in resumo.items():
+        for metrica, limite in limites.items():
+            if limite is not None and r[metrica] > limite:
+                violacoes.append(f"{nome}: {metrica} = {r[metrica]:.1f} > {limite}")
+    return violacoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga com os cenários do teste_rapido.py")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--cenario", choices=sorted(CENARIOS), default="simples")
+    parser.add_argument("--concorrencia", type=int, default=10, help="usuários virtuais simultâneos")
+    parser.add_argument("--duracao", type=float, default=10.0, help="segundos de teste")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--max-p50", type=float, help="limite de p50 em ms")
+    parser.add_argument("--max-p95", type=float, help="limite de p95 em ms")
+    parser.add_argument("--max-p99", type=float, help="limite de p99 em ms")
+    parser.add_argument("--max-erros", type=int, default=0, help="erros tolerados no total")
+    args = parser.parse_args(argv)
+
+    print(f"🚀 Carga: cenário '{args.cenario}' em {args.url}, "
+          f"{args.concorrencia} usuários virtuais por {args.duracao:.0f}s")
+    resumo, tempo_total = asyncio.run(
+        gerar_carga(args.url, args.cenario, args.concorrencia, args.duracao, args.timeout))
+    imprimir_resumo(resumo, tempo_total)
+
+    violacoes = verificar_limites(resumo, {"p50_ms": args.max_p50, "p95_ms": args.max_p95,
+                                           "p99_ms": args.max_p99})
+    erros = sum(r["erros"] for r in resumo.values())
+    if erros > args.max_erros:
+        violacoes.append(f"{erros} erros (máximo {args.max_erros})")
+    if not resumo:
+        violacoes.append("nenhuma requisição concluída (o servidor está rodando?)")
+
+    if violacoes:
+        print("\n❌ LIMITES ULTRAPASSADOS:")
+        for violacao in violacoes:
+            print(f"   - {violacao}")
+        return 1
+    print("\n✅ Todos os limites respeitados")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
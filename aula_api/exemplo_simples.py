@@ -328,6 +328,9 @@ if __name__ == "__main__":
     
     Ou usando uvicorn:
     uvicorn exemplo_simples:app --reload --port 8000
+    
+    Em produção (vários workers, a partir da raiz do repositório):
+    python -m api_comum.servidor exemplo_simples
     """
     print("🚀 Iniciando API Simples FastAPI...")
     print("📚 Documentação disponível em: http://localhost:8000/docs")
@@ -8,16 +8,24 @@ Data: 2025
 # =============================================================================
 # IMPORTS NECESSÁRIOS
 # =============================================================================
-from fastapi import FastAPI, HTTPException, Depends, Header, Request, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field, EmailStr, validator
-from typing import List, Optional, Dict, Any
-from uuid import uuid4, UUID
+from typing import List, Optional, Dict, Set
+from uuid import uuid4, uuid5, UUID, NAMESPACE_DNS
 import uvicorn
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 import asyncio
+import sys
+from pathlib import Path
+
+# Permite importar os módulos compartilhados da raiz do repositório (api_comum/)
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from api_comum.tokens import AssinadorTokens, TokenInvalido
+from api_comum.coalescencia import SingleFlight, SingleFlightMiddleware
+from api_comum.projecao import Projecao, DESCRICAO_FIELDS
 
 # =============================================================================
 # CONFIGURAÇÃO INICIAL DO FASTAPI
@@ -41,6 +49,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Requisições idênticas e simultâneas (mesma rota, query e token) às
+# estatísticas compartilham um único cálculo
+coalescencia = SingleFlight()
+app.add_middleware(SingleFlightMiddleware, grupo=coalescencia, caminhos=["/estatisticas"])
+
 # =============================================================================
 # MODELOS DE DADOS (Pydantic)
 # =============================================================================
@@ -85,7 +98,7 @@ class TarefaBase(BaseModel):
     """Modelo base para tarefas"""
     titulo: str = Field(..., min_length=1, max_length=200, description="Título da tarefa")
     descricao: Optional[str] = Field(None, max_length=1000, description="Descrição detalhada")
-    prioridade: str = Field("média", regex="^(baixa|média|alta)$", description="Prioridade da tarefa")
+    prioridade: str = Field("média", pattern="^(baixa|média|alta)$", description="Prioridade da tarefa")
     
 class TarefaCriar(TarefaBase):
     """Modelo para criação de tarefas"""
@@ -131,11 +144,22 @@ class TokenResponse(BaseModel):
 # Dicionários para simular um banco de dados
 USUARIOS: Dict[UUID, Usuario] = {}
 TAREFAS: Dict[UUID, Tarefa] = {}
-SESSOES: Dict[str, Dict[str, Any]] = {}
+
+# Índice email -> IDs dos usuários com esse email: o cadastro checa se o
+# email já existe sem percorrer todos os usuários (o PUT não impede emails
+# repetidos, por isso um conjunto de IDs)
+EMAILS: Dict[str, Set[UUID]] = {}
+
+# Tokens assinados: cada worker valida o token sozinho, sem um dicionário de
+# sessões compartilhado. Defina API_TOKEN_SEGREDO igual em todos os workers.
+# A lista de revogação (logout) fica na memória e é sincronizada por um
+# arquivo visto por todos os workers (API_TOKENS_REVOGADOS; veja api_comum/tokens.py).
+TOKENS = AssinadorTokens("fastapi_completo", validade_segundos=86400)
 
 # Usuário padrão para testes
+# O ID é fixo (uuid5 do email) para ser o mesmo em todos os workers
 USUARIO_PADRAO = Usuario(
-    id=uuid4(),
+    id=uuid5(NAMESPACE_DNS, "admin@sistema.com"),
     nome="Admin Sistema",
     email="admin@sistema.com",
     idade=25,
@@ -143,6 +167,15 @@ USUARIO_PADRAO = Usuario(
     ativo=True
 )
 USUARIOS[USUARIO_PADRAO.id] = USUARIO_PADRAO
+EMAILS[USUARIO_PADRAO.email] = {USUARIO_PADRAO.id}
+
+# Projeção para ?fields= em /tarefas (ex.: /tarefas?fields=id,titulo): as
+# tarefas já são instâncias validadas de Tarefa, serializadas pelo próprio modelo
+PROJECAO_TAREFAS = Projecao(
+    ["id", "titulo", "descricao", "prioridade", "usuario_id", "criada_em", "concluida", "concluida_em"],
+    por_atributo=True,
+    modelo=Tarefa
+)
 
 # =============================================================================
 # FUNÇÕES AUXILIARES E DEPENDÊNCIAS
@@ -160,31 +193,27 @@ def get_tarefa_por_id(tarefa_id: UUID) -> Tarefa:
         raise HTTPException(status_code=404, detail="Tarefa não encontrada")
     return TAREFAS[tarefa_id]
 
-async def verificar_token(authorization: str = Header(...)) -> Usuario:
-    """Verifica se o token de autorização é válido"""
+def extrair_token(authorization: str) -> str:
+    """Extrai o token do header Authorization: Bearer <token>"""
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Token inválido")
+    return authorization.replace("Bearer ", "")
+
+async def verificar_token(authorization: str = Header(...)) -> Usuario:
+    """Verifica se o token de autorização é válido"""
+    token = extrair_token(authorization)
     
-    token = authorization.replace("Bearer ", "")
-    
-    if token not in SESSOES:
-        raise HTTPException(status_code=401, detail="Token expirado ou inválido")
-    
-    sessao = SESSOES[token]
-    if datetime.now() > sessao["expira_em"]:
-        del SESSOES[token]
-        raise HTTPException(status_code=401, detail="Token expirado")
+    # A assinatura é conferida localmente (com cache), sem consultar sessões
+    try:
+        dados = TOKENS.verificar(token)
+    except TokenInvalido as erro:
+        raise HTTPException(status_code=401, detail=str(erro))
     
-    return get_usuario_por_id(sessao["usuario_id"])
+    return get_usuario_por_id(UUID(dados["sub"]))
 
 def gerar_token(usuario_id: UUID) -> str:
-    """Gera um token de acesso para o usuário"""
-    token = str(uuid4())
-    SESSOES[token] = {
-        "usuario_id": usuario_id,
-        "expira_em": datetime.now() + timedelta(hours=24)
-    }
-    return token
+    """Gera um token de acesso assinado para o usuário"""
+    return TOKENS.gerar(str(usuario_id))
 
 # =============================================================================
 # ENDPOINTS DE AUTENTICAÇÃO
@@ -207,18 +236,21 @@ async def login(credenciais: LoginRequest):
         token = gerar_token(USUARIO_PADRAO.id)
         return TokenResponse(
             access_token=token,
-            expires_in=86400  # 24 horas em segundos
+            expires_in=TOKENS.validade_segundos  # 24 horas em segundos
         )
     
     raise HTTPException(status_code=401, detail="Credenciais inválidas")
 
 @app.post("/auth/logout", tags=["Autenticação"])
-async def logout(usuario_atual: Usuario = Depends(verificar_token)):
+async def logout(
+    authorization: str = Header(...),
+    usuario_atual: Usuario = Depends(verificar_token)
+):
     """
     Endpoint para logout (invalida o token atual)
     """
-    # Em um sistema real, você invalidaria o token
-    # Aqui estamos apenas retornando sucesso
+    # O token entra na lista de revogação até expirar
+    TOKENS.revogar(extrair_token(authorization))
     return {"mensagem": "Logout realizado com sucesso"}
 
 # =============================================================================
@@ -264,9 +296,8 @@ async def criar_usuario(usuario: UsuarioCriar):
     Retorna o usuário criado com ID e data de criação
     """
     # Verificar se o email já existe
-    for u in USUARIOS.values():
-        if u.email == usuario.email:
-            raise HTTPException(status_code=400, detail="Email já cadastrado")
+    if EMAILS.get(usuario.email):
+        raise HTTPException(status_code=400, detail="Email já cadastrado")
     
     # Criar novo usuário
     novo_usuario = Usuario(
@@ -279,6 +310,7 @@ async def criar_usuario(usuario: UsuarioCriar):
     )
     
     USUARIOS[novo_usuario.id] = novo_usuario
+    EMAILS.setdefault(novo_usuario.email, set()).add(novo_usuario.id)
     return novo_usuario
 
 @app.put("/usuarios/{usuario_id}", response_model=Usuario, tags=["Usuários"])
@@ -302,6 +334,8 @@ async def atualizar_usuario(
     usuario = get_usuario_por_id(usuario_id)
     
     # Atualizar campos
+    EMAILS[usuario.email].discard(usuario.id)
+    EMAILS.setdefault(usuario_atualizado.email, set()).add(usuario.id)
     usuario.nome = usuario_atualizado.nome
     usuario.email = usuario_atualizado.email
     usuario.idade = usuario_atualizado.idade
@@ -336,7 +370,8 @@ async def listar_tarefas(
     limit: int = 100,
     usuario_id: Optional[UUID] = None,
     concluida: Optional[bool] = None,
-    prioridade: Optional[str] = None
+    prioridade: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=DESCRICAO_FIELDS)
 ):
     """
     Lista todas as tarefas com filtros e paginação
@@ -346,6 +381,7 @@ async def listar_tarefas(
     - **usuario_id**: Filtrar por usuário específico
     - **concluida**: Filtrar por status de conclusão
     - **prioridade**: Filtrar por prioridade
+    - **fields**: Campos a retornar (ex.: id,titulo,concluida)
     """
     tarefas = list(TAREFAS.values())
     
@@ -360,6 +396,8 @@ async def listar_tarefas(
         tarefas = [t for t in tarefas if t.prioridade == prioridade]
     
     # Aplicar paginação
+    if fields:
+        return PROJECAO_TAREFAS.resposta(tarefas[skip:skip + limit], fields)
     return tarefas[skip:skip + limit]
 
 @app.get("/tarefas/{tarefa_id}", response_model=Tarefa, tags=["Tarefas"])
@@ -543,7 +581,9 @@ async def health_check():
         "timestamp": datetime.now().isoformat(),
         "usuarios_cadastrados": len(USUARIOS),
         "tarefas_cadastradas": len(TAREFAS),
-        "sessoes_ativas": len(SESSOES)
+        "tokens_em_cache": TOKENS.total_em_cache,
+        "tokens_revogados": TOKENS.total_revogados,
+        "coalescencia": coalescencia.metricas()
     }
 
 # =============================================================================
@@ -552,17 +592,11 @@ async def health_check():
 
 def limpar_sessoes_expiradas():
     """
-    Função para limpar sessões expiradas
+    Função para limpar tokens expirados da lista de revogação e do cache
     """
-    tokens_para_remover = []
-    for token, sessao in SESSOES.items():
-        if datetime.now() > sessao["expira_em"]:
-            tokens_para_remover.append(token)
+    removidos = TOKENS.limpar_expirados()
     
-    for token in tokens_para_remover:
-        del SESSOES[token]
-    
-    print(f"Limpeza automática: {len(tokens_para_remover)} sessões expiradas removidas")
+    print(f"Limpeza automática: {removidos} tokens revogados expirados removidos")
 
 @app.post("/sistema/limpar-sessoes", tags=["Sistema"])
 async def limpar_sessoes(background_tasks: BackgroundTasks):
@@ -621,6 +655,9 @@ if __name__ == "__main__":
     
     Ou usando uvicorn:
     uvicorn fastapi_completo:app --reload --host 0.0.0.0 --port 8000
+    
+    Em produção (vários workers, a partir da raiz do repositório):
+    python -m api_comum.servidor fastapi_completo
     """
     print("🚀 Iniciando servidor FastAPI...")
     print("📚 Documentação disponível em: http://localhost:8000/docs")
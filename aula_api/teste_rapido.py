@@ -14,83 +14,121 @@ import requests
 import json
 import time
 from datetime import datetime
+from typing import Callable, Dict, NamedTuple, Optional
+from uuid import uuid4
+
+# =============================================================================
+# PASSOS DOS TESTES (os mesmos são repetidos em paralelo por carga.py)
+# =============================================================================
+# Cada passo é uma requisição e o status esperado. Textos entre chaves no
+# caminho, no corpo e nos cabeçalhos (ex.: "/produtos/{produto_id}") são
+# preenchidos com valores guardados de respostas anteriores (`guardar`:
+# nome -> campo da resposta) ou com "{unico}", diferente a cada execução.
+
+class Passo(NamedTuple):
+    """Uma requisição dos testes"""
+    descricao: str                       # o que está sendo testado
+    metodo: str                          # GET, POST...
+    caminho: str                         # ex.: /produtos/{produto_id}
+    corpo: Optional[dict] = None         # JSON enviado
+    status: int = 200                    # status esperado
+    cabecalhos: Optional[dict] = None
+    guardar: Optional[Dict[str, str]] = None      # nome -> campo da resposta
+    mostrar: Optional[Callable] = None   # dados da resposta -> mensagem de sucesso
+
+    @property
+    def rota(self):
+        """Nome do passo nas métricas, ex.: GET /produtos/{produto_id}"""
+        return f"{self.metodo} {self.caminho.split('?')[0]}"
+
+def _listar_produtos(produtos):
+    linhas = [f"Produtos listados: {len(produtos)} encontrados"]
+    for produto in produtos[:2]:  # Mostrar apenas os 2 primeiros
+        linhas.append(f"      - {produto['nome']} (R$ {produto['preco']})")
+    return "\n".join(linhas)
+
+PASSOS_API_SIMPLES = [
+    Passo("endpoint raiz", "GET", "/",
+          mostrar=lambda dados: f"Endpoint raiz funcionando\n   📝 Resposta: {dados}"),
+    Passo("listagem de produtos", "GET", "/produtos", mostrar=_listar_produtos),
+    Passo("criação de produto", "POST", "/produtos", status=201,
+          corpo={"nome": "Produto de Teste", "preco": 99.99, "categoria": "Teste", "em_estoque": True},
+          guardar={"produto_id": "id"}, mostrar=lambda dados: f"Produto criado com ID: {dados['id']}"),
+    Passo("busca de produto específico", "GET", "/produtos/{produto_id}",
+          mostrar=lambda dados: f"Produto encontrado: {dados['nome']}"),
+    Passo("busca por termo", "GET", "/buscar?q=teste",
+          mostrar=lambda dados: f"Busca funcionando: {len(dados)} resultados"),
+    Passo("estatísticas", "GET", "/estatisticas",
+          mostrar=lambda dados: f"Estatísticas: {dados['total_produtos']} produtos"),
+]
+
+PASSOS_API_COMPLETA = [
+    Passo("endpoint raiz", "GET", "/", mostrar=lambda dados: "Endpoint raiz funcionando"),
+    Passo("health check", "GET", "/health", mostrar=lambda dados: f"Health check: {dados['status']}"),
+    Passo("login", "POST", "/auth/login", corpo={"email": "admin@sistema.com", "senha": "123456"},
+          guardar={"token": "access_token"}, mostrar=lambda dados: "Login realizado, token obtido"),
+    # Email único a cada execução (a API recusa emails repetidos)
+    Passo("criação de usuário", "POST", "/usuarios", status=201,
+          corpo={"nome": "Usuário Teste", "email": "teste_{unico}@exemplo.com", "idade": 25, "senha": "123456"},
+          mostrar=lambda dados: f"Usuário criado: {dados['nome']}"),
+    Passo("criação de tarefa", "POST", "/tarefas", status=201,
+          corpo={"titulo": "Tarefa de Teste", "descricao": "Descrição da tarefa de teste", "prioridade": "média"},
+          cabecalhos={"Authorization": "Bearer {token}"},
+          mostrar=lambda dados: f"Tarefa criada: {dados['titulo']}"),
+]
+
+def novo_contexto():
+    """Valores de uma execução dos passos (começa só com o "{unico}")"""
+    return {"unico": uuid4().hex[:12]}
+
+def _preencher(valores, contexto):
+    if valores is None:
+        return None
+    return {chave: valor.format(**contexto) if isinstance(valor, str) else valor
+            for chave, valor in valores.items()}
+
+def requisicao(passo, contexto):
+    """(método, caminho, argumentos) do passo, com os valores do contexto"""
+    argumentos = {}
+    if passo.corpo is not None:
+        argumentos["json"] = _preencher(passo.corpo, contexto)
+    if passo.cabecalhos is not None:
+        argumentos["headers"] = _preencher(passo.cabecalhos, contexto)
+    return passo.metodo, passo.caminho.format(**contexto), argumentos
+
+def guardar_resposta(passo, dados, contexto):
+    """Guarda no contexto os campos da resposta pedidos pelo passo"""
+    for nome, campo in (passo.guardar or {}).items():
+        contexto[nome] = dados[campo]
+
+# =============================================================================
+# TESTE RÁPIDO (uma execução, passo a passo)
+# =============================================================================
+
+def executar_passos(passos, base_url="http://localhost:8000"):
+    """Executa os passos com requests, um de cada vez, mostrando cada um"""
+    contexto = novo_contexto()
+    for numero, passo in enumerate(passos, start=1):
+        if numero > 1:
+            print()
+        print(f"{numero}. Testando {passo.descricao}...")
+        metodo, caminho, argumentos = requisicao(passo, contexto)
+        response = requests.request(metodo, f"{base_url}{caminho}", **argumentos)
+        if response.status_code != passo.status:
+            print(f"   ❌ Erro em {passo.descricao}: {response.status_code}")
+            return False
+        dados = response.json()
+        guardar_resposta(passo, dados, contexto)
+        print(f"   ✅ {passo.mostrar(dados) if passo.mostrar else 'OK'}")
+    return True
 
 def testar_api_simples():
     """Testa a API simples de produtos"""
     print("🧪 TESTANDO API SIMPLES...")
     
-    base_url = "http://localhost:8000"
-    
     try:
-        # Teste 1: Endpoint raiz
-        print("1. Testando endpoint raiz...")
-        response = requests.get(f"{base_url}/")
-        if response.status_code == 200:
-            print("   ✅ Endpoint raiz funcionando")
-            print(f"   📝 Resposta: {response.json()}")
-        else:
-            print(f"   ❌ Erro no endpoint raiz: {response.status_code}")
-            return False
-        
-        # Teste 2: Listar produtos
-        print("\n2. Testando listagem de produtos...")
-        response = requests.get(f"{base_url}/produtos")
-        if response.status_code == 200:
-            produtos = response.json()
-            print(f"   ✅ Produtos listados: {len(produtos)} encontrados")
-            for produto in produtos[:2]:  # Mostrar apenas os 2 primeiros
-                print(f"      - {produto['nome']} (R$ {produto['preco']})")
-        else:
-            print(f"   ❌ Erro ao listar produtos: {response.status_code}")
-            return False
-        
-        # Teste 3: Criar produto
-        print("\n3. Testando criação de produto...")
-        novo_produto = {
-            "nome": "Produto de Teste",
-            "preco": 99.99,
-            "categoria": "Teste",
-            "em_estoque": True
-        }
-        response = requests.post(f"{base_url}/produtos", json=novo_produto)
-        if response.status_code == 201:
-            produto_criado = response.json()
-            print(f"   ✅ Produto criado com ID: {produto_criado['id']}")
-            produto_id = produto_criado['id']
-        else:
-            print(f"   ❌ Erro ao criar produto: {response.status_code}")
-            return False
-        
-        # Teste 4: Buscar produto específico
-        print("\n4. Testando busca de produto específico...")
-        response = requests.get(f"{base_url}/produtos/{produto_id}")
-        if response.status_code == 200:
-            produto = response.json()
-            print(f"   ✅ Produto encontrado: {produto['nome']}")
-        else:
-            print(f"   ❌ Erro ao buscar produto: {response.status_code}")
-            return False
-        
-        # Teste 5: Busca por termo
-        print("\n5. Testando busca por termo...")
-        response = requests.get(f"{base_url}/buscar?q=teste")
-        if response.status_code == 200:
-            resultados = response.json()
-            print(f"   ✅ Busca funcionando: {len(resultados)} resultados")
-        else:
-            print(f"   ❌ Erro na busca: {response.status_code}")
-            return False
-        
-        # Teste 6: Estatísticas
-        print("\n6. Testando estatísticas...")
-        response = requests.get(f"{base_url}/estatisticas")
-        if response.status_code == 200:
-            stats = response.json()
-            print(f"   ✅ Estatísticas: {stats['total_produtos']} produtos")
-        else:
-            print(f"   ❌ Erro nas estatísticas: {response.status_code}")
+        if not executar_passos(PASSOS_API_SIMPLES):
             return False
-        
         print("\n🎉 TODOS OS TESTES PASSARAM! API funcionando perfeitamente!")
         return True
         
@@ -106,75 +144,9 @@ def testar_api_completa():
     """Testa a API completa com autenticação"""
     print("\n🧪 TESTANDO API COMPLETA...")
     
-    base_url = "http://localhost:8000"
-    
     try:
-        # Teste 1: Endpoint raiz
-        print("1. Testando endpoint raiz...")
-        response = requests.get(f"{base_url}/")
-        if response.status_code == 200:
-            print("   ✅ Endpoint raiz funcionando")
-        else:
-            print(f"   ❌ Erro no endpoint raiz: {response.status_code}")
+        if not executar_passos(PASSOS_API_COMPLETA):
             return False
-        
-        # Teste 2: Health check
-        print("\n2. Testando health check...")
-        response = requests.get(f"{base_url}/health")
-        if response.status_code == 200:
-            health = response.json()
-            print(f"   ✅ Health check: {health['status']}")
-        else:
-            print(f"   ❌ Erro no health check: {response.status_code}")
-            return False
-        
-        # Teste 3: Login
-        print("\n3. Testando login...")
-        credenciais = {
-            "email": "admin@sistema.com",
-            "senha": "123456"
-        }
-        response = requests.post(f"{base_url}/auth/login", json=credenciais)
-        if response.status_code == 200:
-            token_data = response.json()
-            token = token_data['access_token']
-            print(f"   ✅ Login realizado, token obtido")
-        else:
-            print(f"   ❌ Erro no login: {response.status_code}")
-            return False
-        
-        # Teste 4: Criar usuário (sem autenticação)
-        print("\n4. Testando criação de usuário...")
-        novo_usuario = {
-            "nome": "Usuário Teste",
-            "email": "teste@exemplo.com",
-            "idade": 25,
-            "senha": "123456"
-        }
-        response = requests.post(f"{base_url}/usuarios", json=novo_usuario)
-        if response.status_code == 201:
-            usuario_criado = response.json()
-            print(f"   ✅ Usuário criado: {usuario_criado['nome']}")
-        else:
-            print(f"   ❌ Erro ao criar usuário: {response.status_code}")
-            return False
-        
-        # Teste 5: Criar tarefa (com autenticação)
-        print("\n5. Testando criação de tarefa...")
-        headers = {"Authorization": f"Bearer {token}"}
-        nova_tarefa = {
-            "titulo": "Tarefa de Teste",
-            "descricao": "Descrição da tarefa de teste",
-            "prioridade": "média"
-        }
-        response = requests.post(f"{base_url}/tarefas", json=nova_tarefa, headers=headers)
-        if response.status_code == 201:
-            tarefa_criada = response.json()
-            print(f"   ✅ Tarefa criada: {tarefa_criada['titulo']}")
-        else:
-            print(f"   ❌ Erro ao criar tarefa: {response.status_code}")
-            return False
-        
         print("\n🎉 TODOS OS TESTES DA API COMPLETA PASSARAM!")
         return True
         
@@ -0,0 +1,7 @@
+"""
+BENCHMARKS: medições de desempenho dos exemplos do curso
+
+Execute a partir da raiz do repositório, por exemplo:
+
+    python -m benchmarks.armazenamento_avancado
+"""
@@ -0,0 +1,152 @@
+"""
+API LOCAL: servidor HTTP de mentira para os benchmarks de coleta
+
+Substitui APIs externas (ex.: a API do Harry Potter da aula_13) por um
+servidor em uma thread local, com atraso configurável por rota. Assim os
+benchmarks medem o código de coleta, não a internet, e contam quantas
+conexões TCP foram abertas (para verificar o keep-alive) e quantos bytes
+de corpo foram enviados. Rotas com `etag`/`last_modified` respondem 304 a
+requisições condicionais. Rotas dinâmicas recebem `dados` como função da
+query string (paginação, falhas simuladas).
+
+Uso:
+
+    rotas = {"/books": Rota(dados=[...], atraso=0.3)}
+    with ApiLocal(rotas) as api:
+        requests.get(f"{api.url}/books")
+        api.conexoes, api.requisicoes
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+
+
+class Rota(NamedTuple):
+    # dados fixos, ou função(query: dict[str, str]) que devolve os dados ou
+    # uma Rota (para responder com outro status, ex.: 429)
+    dados: Any
+    atraso: float = 0.0   # segundos antes de responder (latência da API)
+    status: int = 200
+    etag: Optional[str] = None           # ex.: '"v1"'
+    last_modified: Optional[str] = None  # data HTTP, ex.: 'Wed, 01 Jan 2025 00:00:00 GMT'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with self.server.trava:
+            self.server.conexoes += 1
+
+    def do_GET(self):
+        with self.server.trava:
+            self.server.requisicoes += 1
+        partes = urlsplit(self.path)
+        rota = self.server.rotas.get(partes.path)
+        if rota is None:
+            rota = Rota({"detail": "Not Found"}, status=404)
+        if rota.atraso:
+            time.sleep(rota.atraso)
+        if callable(rota.dados):
+            query = {chave: valores[-1] for chave, valores in parse_qs(partes.query).items()}
+            resposta = rota.dados(query)
+            rota = resposta if isinstance(resposta, Rota) else rota._replace(dados=resposta)
+
+        if self._nao_modificado(rota):
+            with self.server.trava:
+                self.server.respostas_304 += 1
+            self.send_response(304)
+            self._validadores(rota)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        corpo = json.dumps(rota.dados, ensure_ascii=False).encode("utf-8")
+        with self.server.trava:
+            self.server.bytes_enviados += len(corpo)
+        self.send_response(rota.status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self._validadores(rota)
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _nao_modificado(self, rota: Rota) -> bool:
+        if rota.status != 200:
+            return False
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return rota.etag is not None and if_none_match == rota.etag
+        return rota.last_modified is not None and self.headers.get("If-Modified-Since") == rota.last_modified
+
+    def _validadores(self, rota: Rota):
+        if rota.etag:
+            self.send_header("ETag", rota.etag)
+        if rota.last_modified:
+            self.send_header("Last-Modified", rota.last_modified)
+
+    def log_message(self, formato, *args):
+        pass  # silencioso
+
+
+class _Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Cliente que desistiu no meio (cancelamento, timeout) não é erro aqui
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class ApiLocal:
+    """Servidor HTTP em segundo plano; use com `with`"""
+
+    def __init__(self, rotas: Dict[str, Rota], host: str = "127.0.0.1"):
+        self.servidor = _Servidor((host, 0), _Handler)
+        self.servidor.rotas = rotas
+        self.servidor.trava = threading.Lock()
+        self.servidor.conexoes = 0
+        self.servidor.requisicoes = 0
+        self.servidor.respostas_304 = 0
+        self.servidor.bytes_enviados = 0
+        self._thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, porta = self.servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    @property
+    def conexoes(self) -> int:
+        return self.servidor.conexoes
+
+    @property
+    def requisicoes(self) -> int:
+        return self.servidor.requisicoes
+
+    @property
+    def respostas_304(self) -> int:
+        return self.servidor.respostas_304
+
+    @property
+    def bytes_enviados(self) -> int:
+        return self.servidor.bytes_enviados
+
+    @property
+    def rotas(self) -> Dict[str, Rota]:
+        """As rotas podem ser trocadas com o servidor no ar (simula dados novos)"""
+        return self.servidor.rotas
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.servidor.shutdown()
+        self.servidor.server_close()
@@ -0,0 +1,103 @@
+"""
+BENCHMARK: registros compactos x modelos Pydantic no avancado.py
+
+Compara a representação antiga (um ProdutoResponse por registro) com a
+nova (ProdutoRegistro com __slots__, veja aula_14/armazenamento.py):
+
+1. Memória por registro, medida com tracemalloc
+2. Vazão do caminho da listagem: filtrar todos os registros por preço,
+   paginar e montar a resposta validada pelo modelo Pydantic
+
+Uso:
+    python -m benchmarks.armazenamento_avancado --registros 100000
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+from pydantic import TypeAdapter
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "aula_14"))
+
+from avancado import CategoriaProduto, ProdutoResponse  # noqa: E402
+from armazenamento import ProdutoRegistro  # noqa: E402
+
+
+def gerar_dados(n):
+    categorias = list(CategoriaProduto)
+    return [
+        (i, f"Produto {i}", round(random.uniform(1, 1000), 2), random.choice(categorias), None, random.randint(0, 50))
+        for i in range(1, n + 1)
+    ]
+
+
+def construir_pydantic(dados):
+    return {
+        i: ProdutoResponse(id=i, nome=nome, preco=preco, categoria=cat, descricao=desc,
+                           estoque=est, data_criacao=datetime.now())
+        for i, nome, preco, cat, desc, est in dados
+    }
+
+
+def construir_registros(dados):
+    return {
+        i: ProdutoRegistro(id=i, nome=nome, preco=preco, categoria=cat, descricao=desc, estoque=est)
+        for i, nome, preco, cat, desc, est in dados
+    }
+
+
+def medir_memoria(construtor, dados):
+    gc.collect()
+    tracemalloc.start()
+    db = construtor(dados)
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return db, atual / len(dados)
+
+
+VALIDADOR = TypeAdapter(List[ProdutoResponse])
+
+
+def medir_listagem(db, para_resposta, repeticoes, limit):
+    validador = VALIDADOR
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        produtos = [p for p in db.values() if p.preco >= 500]
+        validador.dump_python(validador.validate_python(para_resposta(produtos[:limit])), mode="json")
+    return repeticoes / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    dados = gerar_dados(args.registros)
+    print(f"📦 {args.registros} produtos")
+
+    db_antigo, bytes_antigo = medir_memoria(construir_pydantic, dados)
+    # O FastAPI converte modelos retornados em dicionários (model_dump) antes
+    # de validar a resposta; o benchmark reproduz esse caminho
+    vazao_antiga = medir_listagem(db_antigo, lambda ps: [p.model_dump() for p in ps], args.repeticoes, args.limit)
+    del db_antigo
+
+    db_novo, bytes_novo = medir_memoria(construir_registros, dados)
+    vazao_nova = medir_listagem(db_novo, lambda ps: [p.para_dict() for p in ps], args.repeticoes, args.limit)
+
+    print(f"{'representação':<22}{'bytes/registro':>16}{'listagens/s':>14}")
+    print(f"{'Pydantic (antigo)':<22}{bytes_antigo:>16.0f}{vazao_antiga:>14.1f}")
+    print(f"{'__slots__ (novo)':<22}{bytes_novo:>16.0f}{vazao_nova:>14.1f}")
+    print(f"Memória: {bytes_antigo / bytes_novo:.1f}x menor | Listagem: {vazao_nova / vazao_antiga:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+BENCHMARK: cache HTTP em disco da aula_13 (aula_13/cache_http.py)
+
+Simula várias execuções seguidas da aula contra a API local
+(benchmarks/api_local.py), cada uma com um ColetorHTTP novo e o mesmo
+diretório de cache:
+
+1. fria: cache vazio, tudo é baixado
+2. quente: livros/feitiços dentro do TTL (sem rede); personagens revalidados (304)
+3. revalidação: TTL zero para todos, tudo volta como 304 sem corpo
+4. dados novos: o ETag dos livros muda e só eles são baixados de novo
+5. offline: servidor desligado, tudo sai do disco
+
+Mostra tempo, requisições e bytes de corpo por rodada, e verifica que os
+dados são sempre os mesmos da API.
+
+Uso:
+    python -m benchmarks.coleta_cache --registros 5000 --atraso 0.2
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "aula_13"))
+
+from cache_http import CacheHTTP  # noqa: E402
+from coleta import ColetorHTTP  # noqa: E402
+
+from benchmarks.api_local import ApiLocal, Rota  # noqa: E402
+
+ULTIMA_MODIFICACAO = "Wed, 01 Jan 2025 00:00:00 GMT"
+TTLS = {"*/books": 24 * 3600, "*/spells": 24 * 3600}
+
+
+def dados_falsos(endpoint: str, n: int, versao: int = 1):
+    return [{"index": i, "title": f"{endpoint[1:]} {i} v{versao}", "description": "texto " * 10}
+            for i in range(n)]
+
+
+def rodada(nome, pasta, urls, esperados, api=None, ttls=TTLS, offline=False):
+    cache = CacheHTTP(pasta, ttls=ttls, offline=offline)
+    antes = (api.requisicoes, api.bytes_enviados) if api else (0, 0)
+    inicio = time.perf_counter()
+    with ColetorHTTP(max_paralelo=len(urls), cache=cache) as coletor:
+        resultados = coletor.buscar_varios(urls)
+    tempo = time.perf_counter() - inicio
+
+    for endpoint, resultado in resultados.items():
+        assert resultado.ok, f"{nome}: {endpoint}: {resultado.erro}"
+        assert resultado.dados == esperados[endpoint], f"{nome}: {endpoint} desatualizado"
+
+    requisicoes = api.requisicoes - antes[0] if api else 0
+    bytes_corpo = api.bytes_enviados - antes[1] if api else 0
+    print(f"{nome:<14}{tempo:>9.3f}{requisicoes:>6}{bytes_corpo / 1024:>11.0f}   {cache.estatisticas}")
+    return tempo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=5000, help="itens por endpoint")
+    parser.add_argument("--atraso", type=float, default=0.2, help="latência da API (s)")
+    args = parser.parse_args()
+
+    endpoints = ["/books", "/characters", "/spells"]
+    dados = {e: dados_falsos(e, args.registros) for e in endpoints}
+    rotas = {
+        "/books": Rota(dados["/books"], args.atraso, etag='"v1"'),
+        "/characters": Rota(dados["/characters"], args.atraso, last_modified=ULTIMA_MODIFICACAO),
+        "/spells": Rota(dados["/spells"], args.atraso, etag='"v1"'),
+    }
+
+    with tempfile.TemporaryDirectory() as pasta, ApiLocal(rotas) as api:
+        urls = {e: f"{api.url}{e}" for e in endpoints}
+        print(f"🌐 {len(endpoints)} endpoints, {args.registros} itens cada, latência {args.atraso}s")
+        print(f"{'rodada':<14}{'tempo s':>9}{'req':>6}{'KiB corpo':>11}   cache")
+
+        fria = rodada("fria", pasta, urls, dados, api)
+        rodada("quente", pasta, urls, dados, api)
+        rodada("revalidação", pasta, urls, dados, api, ttls={})
+
+        dados["/books"] = dados_falsos("/books", args.registros, versao=2)
+        api.rotas["/books"] = Rota(dados["/books"], args.atraso, etag='"v2"')
+        rodada("dados novos", pasta, urls, dados, api, ttls={})
+
+        api.__exit__()  # servidor fora do ar
+        offline = rodada("offline", pasta, urls, dados, offline=True)
+
+        bruto = sum(len(json.dumps(d, ensure_ascii=False).encode()) for d in dados.values())
+        em_disco = sum(f.stat().st_size for f in Path(pasta).glob("*.gz"))
+        print(f"\n💾 Corpos em disco: {em_disco / 1024:.0f} KiB (gzip) para ~{bruto / 1024:.0f} KiB de JSON")
+        print(f"📈 Execução offline {fria / offline:.0f}x mais rápida que a fria")
+    print("✅ Dados sempre iguais aos da API em todas as rodadas")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+BENCHMARK: coleta sequencial x concorrente (aula_13/coleta.py)
+
+Reproduz o exemplo do Harry Potter da aula_13 contra uma API local
+(benchmarks/api_local.py) com a latência de cada endpoint simulada:
+
+1. sequencial: um `requests.get` solto por endpoint, como era na aula
+2. concorrente: `ColetorHTTP.buscar_varios`, uma sessão com pool de conexões
+
+Verifica que os dois modos devolvem os mesmos dados, que o tempo do modo
+concorrente fica próximo ao do endpoint mais lento e que uma segunda rodada
+na mesma sessão não abre conexões novas (keep-alive).
+
+Uso:
+    python -m benchmarks.coleta_concorrente --atrasos 0.3 0.5 0.2
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import requests
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "aula_13"))
+
+from coleta import ColetorHTTP  # noqa: E402
+
+from benchmarks.api_local import ApiLocal, Rota  # noqa: E402
+
+ENDPOINTS = ["/books", "/characters", "/spells"]
+
+
+def dados_falsos(endpoint: str, n: int):
+    return [{"index": i, "title": f"{endpoint[1:]} {i}", "house": ["Grifinória", "Sonserina"][i % 2]}
+            for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--atrasos", type=float, nargs=3, default=[0.3, 0.5, 0.2],
+                        metavar=("BOOKS", "CHARACTERS", "SPELLS"), help="latência de cada endpoint (s)")
+    parser.add_argument("--registros", type=int, default=500, help="itens por endpoint")
+    args = parser.parse_args()
+
+    rotas = {e: Rota(dados_falsos(e, args.registros), atraso)
+             for e, atraso in zip(ENDPOINTS, args.atrasos)}
+
+    with ApiLocal(rotas) as api:
+        urls = {e: f"{api.url}{e}" for e in ENDPOINTS}
+
+        inicio = time.perf_counter()
+        sequencial = {e: requests.get(url, timeout=30).json() for e, url in urls.items()}
+        tempo_sequencial = time.perf_counter() - inicio
+        conexoes_sequencial = api.conexoes
+
+        with ColetorHTTP(max_paralelo=len(urls)) as coletor:
+            inicio = time.perf_counter()
+            resultados = coletor.buscar_varios(urls)
+            tempo_concorrente = time.perf_counter() - inicio
+            conexoes_primeira = api.conexoes - conexoes_sequencial
+
+            coletor.buscar_varios(urls)  # segunda rodada: mesmas conexões
+            conexoes_segunda = api.conexoes - conexoes_sequencial - conexoes_primeira
+
+    assert all(r.ok for r in resultados.values()), [r.erro for r in resultados.values()]
+    assert {e: r.dados for e, r in resultados.items()} == sequencial, "dados diferentes"
+
+    mais_lento = max(args.atrasos)
+    print(f"🌐 {len(ENDPOINTS)} endpoints, latências {args.atrasos} s, {args.registros} itens cada")
+    print(f"{'modo':<14}{'tempo s':>9}{'conexões':>10}")
+    print(f"{'sequencial':<14}{tempo_sequencial:>9.2f}{conexoes_sequencial:>10}")
+    print(f"{'concorrente':<14}{tempo_concorrente:>9.2f}{conexoes_primeira:>10}")
+    print(f"\n📈 {tempo_sequencial / tempo_concorrente:.2f}x mais rápido "
+          f"(mais lento sozinho: {mais_lento:.2f}s, soma: {sum(args.atrasos):.2f}s)")
+    print(f"🔁 Segunda rodada na mesma sessão abriu {conexoes_segunda} conexão(ões) nova(s)")
+
+    assert tempo_concorrente < mais_lento + 0.25 * mais_lento + 0.1, "concorrência não reduziu o tempo"
+    assert conexoes_segunda == 0, "keep-alive não reaproveitou as conexões"
+    print("✅ Mesmos dados, tempo ≈ endpoint mais lento e conexões reaproveitadas")
+
+
+if __name__ == "__main__":
+    main()
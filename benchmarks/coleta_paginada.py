@@ -0,0 +1,135 @@
+"""
+BENCHMARK: coleta paginada com retomada (aula_13/coleta_paginada.py)
+
+Uma API local (benchmarks/api_local.py) serve um dataset paginado de três
+jeitos (página, offset e cursor), com latência e uma fração de respostas
+429/503 sorteadas. Para cada estratégia:
+
+1. a coleta é interrompida no meio (cancelamento, como um Ctrl+C)
+2. uma segunda execução retoma pelo checkpoint e termina
+
+e verifica que o NDJSON final tem cada registro exatamente uma vez. No fim,
+compara o tempo de uma coleta completa sequencial x concorrente.
+
+Uso:
+    python -m benchmarks.coleta_paginada --registros 20000 --tamanho 100 --falhas 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "aula_13"))
+
+from coleta_paginada import ColetorPaginado, PorCursor, PorOffset, PorPagina  # noqa: E402
+
+from benchmarks.api_local import ApiLocal, Rota  # noqa: E402
+
+
+def criar_rotas(n_registros: int, taxa_falhas: float, atraso: float, semente: int = 42):
+    registros = [{"id": i, "texto": f"registro {i}"} for i in range(n_registros)]
+    sorteio = random.Random(semente)
+    trava = threading.Lock()
+
+    def falhou():
+        with trava:
+            valor = sorteio.random()
+        if valor < taxa_falhas:
+            return Rota({"detail": "tente de novo"}, status=429 if valor < taxa_falhas / 2 else 503)
+        return None
+
+    def por_pagina(query):
+        tamanho = int(query.get("per_page", 100))
+        inicio = (int(query.get("page", 1)) - 1) * tamanho
+        return falhou() or registros[inicio:inicio + tamanho]
+
+    def por_offset(query):
+        inicio, tamanho = int(query.get("offset", 0)), int(query.get("limit", 100))
+        return falhou() or {"data": registros[inicio:inicio + tamanho], "total": n_registros}
+
+    def por_cursor(query):
+        inicio, tamanho = int(query.get("cursor", "c0")[1:]), int(query.get("limit", 100))
+        proximo = inicio + tamanho
+        return falhou() or {"data": registros[inicio:proximo],
+                            "next_cursor": f"c{proximo}" if proximo < n_registros else None}
+
+    return {"/itens": Rota(por_pagina, atraso), "/offset": Rota(por_offset, atraso),
+            "/cursor": Rota(por_cursor, atraso)}
+
+
+def verificar(destino: Path, n_registros: int):
+    ids = [json.loads(linha)["id"] for linha in destino.open(encoding="utf-8")]
+    duplicados = len(ids) - len(set(ids))
+    assert duplicados == 0, f"{duplicados} registros duplicados"
+    assert sorted(ids) == list(range(n_registros)), f"{n_registros - len(ids)} registros faltando"
+    return len(ids)
+
+
+async def interromper(coletor: ColetorPaginado, api: ApiLocal, depois_de: int):
+    """Cancela a coleta (como um Ctrl+C) depois de `depois_de` requisições"""
+    alvo = api.requisicoes + depois_de
+    tarefa = asyncio.create_task(coletor.coletar())
+    while not tarefa.done() and api.requisicoes < alvo:
+        await asyncio.sleep(0.005)
+    tarefa.cancel()
+    try:
+        await tarefa
+    except asyncio.CancelledError:
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=20000)
+    parser.add_argument("--tamanho", type=int, default=100, help="registros por página")
+    parser.add_argument("--falhas", type=float, default=0.1, help="fração de respostas 429/503")
+    parser.add_argument("--atraso", type=float, default=0.01, help="latência por página (s)")
+    parser.add_argument("--paralelo", type=int, default=16)
+    args = parser.parse_args()
+
+    paginas = -(-args.registros // args.tamanho)
+    estrategias = {
+        "pagina": ("/itens", PorPagina(tamanho=args.tamanho)),
+        "offset": ("/offset", PorOffset(tamanho=args.tamanho, campo_registros="data")),
+        "cursor": ("/cursor", PorCursor(tamanho=args.tamanho)),
+    }
+    opcoes = dict(max_paralelo=args.paralelo, espera_base=0.01, espera_maxima=0.2, max_tentativas=10)
+
+    with tempfile.TemporaryDirectory() as pasta, \
+            ApiLocal(criar_rotas(args.registros, args.falhas, args.atraso)) as api:
+        print(f"📄 {args.registros} registros em {paginas} páginas, {args.falhas:.0%} de 429/503, "
+              f"latência {args.atraso * 1000:.0f} ms")
+        print(f"{'estratégia':<12}{'1ª execução':>20}{'retomada':>20}{'repetições':>12}{'registros':>11}")
+        for nome, (caminho, paginacao) in estrategias.items():
+            destino = Path(pasta) / f"{nome}.ndjson"
+            coletor = ColetorPaginado(f"{api.url}{caminho}", paginacao, destino,
+                                      checkpoint_a_cada=7, **opcoes)
+            asyncio.run(interromper(coletor, api, depois_de=paginas // 2))
+            parcial = json.loads(coletor.caminho_checkpoint.read_text())["registros"]
+
+            resumo = coletor.executar()
+            total = verificar(destino, args.registros)
+            print(f"{nome:<12}{f'{parcial} registros':>20}{f'+{resumo.paginas} páginas':>20}"
+                  f"{resumo.repeticoes:>12}{total:>11}")
+            assert resumo.retomada
+
+        tempos = {}
+        for paralelo in (1, args.paralelo):
+            destino = Path(pasta) / f"completo_{paralelo}.ndjson"
+            coletor = ColetorPaginado(f"{api.url}/itens", PorPagina(tamanho=args.tamanho), destino,
+                                      **{**opcoes, "max_paralelo": paralelo})
+            tempos[paralelo] = coletor.executar().segundos
+            verificar(destino, args.registros)
+        print(f"\n⏱️  Coleta completa: sequencial {tempos[1]:.2f}s, "
+              f"{args.paralelo} em paralelo {tempos[args.paralelo]:.2f}s "
+              f"({tempos[1] / tempos[args.paralelo]:.1f}x)")
+    print("✅ Todas as coletas terminaram com cada registro exatamente uma vez")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""
+BENCHMARK: todos os endpoints de todas as APIs, em processo (ASGI)
+
+Cada app (aula_14/basico.py, medio.py, avancado.py, aula_api/exemplo_simples.py
+e fastapi_completo.py) é chamado por um `httpx.ASGITransport`: as requisições
+passam por toda a pilha do FastAPI (middlewares, validação, serialização),
+mas sem sockets nem servidor.
+
+Para cada tamanho de base (padrão: 1e3, 1e5 e 1e6 registros):
+
+1. O módulo do app é importado de novo (bancos em memória vazios)
+2. Os dados são criados pelos próprios endpoints públicos (POST). Com
+   1e5 registros a semeadura leva de 1 a 10 minutos por app; com 1e6,
+   cerca de dez vezes isso
+3. Cada endpoint é chamado `--repeticoes` vezes; guardamos mediana, média
+   e mínimo em milissegundos. Os IDs usados vêm dos registros semeados
+   (endpoints que apagam usam um registro diferente por repetição, então
+   cada tamanho precisa ser pelo menos 2x `--repeticoes`)
+
+O resultado vai para um JSON. Os tempos absolutos só valem para a máquina
+(e a carga dela) em que foram medidos. Por isso, antes de cada chamada é
+feita uma requisição de referência ao mesmo app (um endpoint trivial, que
+passa pelos mesmos middlewares), e cada endpoint também é guardado como
+"relativo": a mediana de (tempo do endpoint / tempo da referência logo
+antes). A comparação com `--baseline` usa esse número; aumentos acima de
+`--tolerancia` são listados como regressões e o programa termina com
+código 1. Grave o baseline na mesma máquina que vai comparar: a razão
+desconta a velocidade do momento, mas não diferenças de processador ou
+de versões de bibliotecas.
+
+Uso:
+    python -m benchmarks.endpoints_asgi --tamanhos 1000 --baseline benchmarks/baseline_endpoints.json
+    python -m benchmarks.endpoints_asgi --apps avancado --tamanhos 1000 100000
+    python -m benchmarks.endpoints_asgi --tamanhos 1000 --salvar-baseline benchmarks/baseline_endpoints.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ / "aula_14"))
+sys.path.append(str(RAIZ / "aula_api"))
+
+TAMANHOS_PADRAO = [1_000, 100_000, 1_000_000]
+LOTE = 200  # requisições de semeadura disparadas juntas
+
+
+async def _em_lotes(funcao, n, lote=LOTE):
+    """Chama funcao(i) para i em 0..n-1, `lote` de cada vez; devolve os resultados"""
+    resultados = []
+    for inicio in range(0, n, lote):
+        resultados += await asyncio.gather(*(funcao(i) for i in range(inicio, min(n, inicio + lote))))
+    return resultados
+
+
+def _meio(ids):
+    """Um registro do meio da base semeada (nem o primeiro nem o último)"""
+    return ids[len(ids) // 2]
+
+
+def _ok(response, esperado=200):
+    if response.status_code != esperado:
+        raise RuntimeError(f"{response.request.method} {response.request.url.path}: "
+                           f"{response.status_code} {response.text[:200]}")
+    return response
+
+
+# =============================================================================
+# DESCRIÇÃO DE CADA APP: como semear e quais endpoints medir
+# =============================================================================
+# semear(c, n, modulo) cria os dados e devolve um contexto (tokens, ids...).
+# endpoints() devolve tuplas (nome, funcao(c, ctx, i)[, max_repeticoes]);
+# i é o número da repetição, usado para endpoints que alteram ou apagam
+# registros. Endpoints destrutivos ficam por último. `referencia` é um GET
+# trivial do app, medido antes de cada chamada para descontar a velocidade
+# da máquina no momento.
+
+class AppBasico:
+    modulo = "basico"
+    referencia = "/"
+
+    async def semear(self, c, n, modulo):
+        return {}  # sem dados
+
+    def endpoints(self):
+        return [
+            ("GET /", lambda c, ctx, i: c.get("/")),
+            ("GET /ola/{nome}", lambda c, ctx, i: c.get("/ola/Maria")),
+            ("GET /soma", lambda c, ctx, i: c.get("/soma", params={"a": 5, "b": 3})),
+        ]
+
+
+class AppMedio:
+    modulo = "medio"
+    referencia = "/resposta-personalizada"
+
+    async def semear(self, c, n, modulo):
+        respostas = await _em_lotes(lambda i: c.post("/usuarios", params={
+            "nome": f"Usuário {i}", "email": f"u{i}@exemplo.com", "idade": 18 + i % 60}), n)
+        ids = [_ok(r).json()["usuario"]["id"] for r in respostas]
+        # Primeira chamada calcula as estatísticas (3,5 s); depois vêm do cache
+        _ok(await c.get("/estatisticas"))
+        return {"ids": ids}
+
+    def endpoints(self):
+        return [
+            ("GET /usuarios", lambda c, ctx, i: c.get("/usuarios")),
+            ("GET /usuarios?fields", lambda c, ctx, i: c.get("/usuarios", params={"fields": "id,nome"})),
+            ("GET /usuarios/{id}", lambda c, ctx, i: c.get(f"/usuarios/{_meio(ctx['ids'])}")),
+            ("GET /estatisticas", lambda c, ctx, i: c.get("/estatisticas")),
+            ("GET /async-exemplo", lambda c, ctx, i: c.get("/async-exemplo"), 3),  # sempre 1 s
+            ("GET /produtos", lambda c, ctx, i: c.get("/produtos", params={"preco_maximo": 100})),
+            ("GET /resposta-personalizada", lambda c, ctx, i: c.get("/resposta-personalizada")),
+            ("POST /usuarios", lambda c, ctx, i: c.post("/usuarios", params={
+                "nome": "Novo", "email": "novo@exemplo.com", "idade": 30})),
+            ("PUT /usuarios/{id}", lambda c, ctx, i: c.put(f"/usuarios/{_meio(ctx['ids'])}", params={
+                "nome": "Editado", "email": "e@exemplo.com", "idade": 40})),
+            ("DELETE /usuarios/{id}", lambda c, ctx, i: c.delete(f"/usuarios/{ctx['ids'][-1 - i]}")),
+        ]
+
+
+class AppAvancado:
+    modulo = "avancado"
+    referencia = "/health"
+
+    def preparar(self, modulo):
+        modulo.TEMPO_PROCESSAMENTO_PEDIDO = 0
+
+    async def semear(self, c, n, modulo):
+        token = _ok(await c.post("/auth/token", json={"usuario": "admin", "senha": "Senha123"})).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        categorias = ["Eletrônicos", "Livros", "Roupas", "Casa", "Esportes"]
+        respostas = await _em_lotes(lambda i: c.post("/usuarios", json={
+            "nome": f"Usuário {i}", "email": f"u{i}@exemplo.com", "idade": 18 + i % 60,
+            "senha": "Senha123"}), n)
+        usuarios = [_ok(r, 201).json()["id"] for r in respostas]
+        respostas = await _em_lotes(lambda i: c.post("/produtos", headers=auth, json={
+            "nome": f"Produto {i}", "preco": 1 + i % 1000, "categoria": categorias[i % 5],
+            "estoque": 1_000_000}), n)
+        produtos = [_ok(r, 201).json()["id"] for r in respostas]
+        await _em_lotes(lambda i: c.post("/pedidos", json={"itens": [
+            {"produto_id": produtos[i], "quantidade": 1, "preco_unitario": 1 + i % 1000}]}), n)
+        return {"auth": auth, "usuarios": usuarios, "produtos": produtos}
+
+    def endpoints(self):
+        async def logout(c, ctx, i):
+            token = (await c.post("/auth/token", json={"usuario": "admin", "senha": "Senha123"})).json()["access_token"]
+            return await c.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+
+        return [
+            ("POST /auth/token", lambda c, ctx, i: c.post("/auth/token", json={"usuario": "admin", "senha": "Senha123"})),
+            ("GET /usuarios", lambda c, ctx, i: c.get("/usuarios", params={"ativo": True, "limit": 100})),
+            ("GET /usuarios/{id}", lambda c, ctx, i: c.get(f"/usuarios/{_meio(ctx['usuarios'])}")),
+            ("GET /produtos", lambda c, ctx, i: c.get("/produtos", params={"preco_min": 500, "limit": 100})),
+            ("GET /produtos?fields", lambda c, ctx, i: c.get("/produtos", params={
+                "preco_min": 500, "limit": 100, "fields": "id,nome,preco"})),
+            ("GET /relatorios/vendas", lambda c, ctx, i: c.get("/relatorios/vendas", headers=ctx["auth"])),
+            ("GET /health", lambda c, ctx, i: c.get("/health")),
+            ("GET /metrics", lambda c, ctx, i: c.get("/metrics")),
+            ("POST /usuarios", lambda c, ctx, i: c.post("/usuarios", json={
+                "nome": "Novo", "email": "novo@exemplo.com", "idade": 30, "senha": "Senha123"})),
+            ("POST /produtos", lambda c, ctx, i: c.post("/produtos", headers=ctx["auth"], json={
+                "nome": "Novo", "preco": 10, "categoria": "Casa", "estoque": 5})),
+            ("POST /pedidos", lambda c, ctx, i: c.post("/pedidos", json={"itens": [
+                {"produto_id": ctx["produtos"][0], "quantidade": 1, "preco_unitario": 10}]})),
+            ("POST /auth/logout", logout),
+        ]
+
+
+class AppExemploSimples:
+    modulo = "exemplo_simples"
+    referencia = "/"
+
+    async def semear(self, c, n, modulo):
+        categorias = ["Eletrônicos", "Acessórios", "Livros", "Casa"]
+        respostas = await _em_lotes(lambda i: c.post("/produtos", json={
+            "nome": f"Produto {i}", "preco": 1 + i % 1000, "categoria": categorias[i % 4],
+            "em_estoque": i % 3 != 0}), n)
+        return {"ids": [_ok(r, 201).json()["id"] for r in respostas]}
+
+    def endpoints(self):
+        produto = {"nome": "Editado", "preco": 10.0, "categoria": "Casa", "em_estoque": True}
+        return [
+            ("GET /", lambda c, ctx, i: c.get("/")),
+            ("GET /produtos", lambda c, ctx, i: c.get("/produtos", params={"categoria": "Livros"})),
+            ("GET /produtos/{id}", lambda c, ctx, i: c.get(f"/produtos/{_meio(ctx['ids'])}")),
+            ("GET /buscar", lambda c, ctx, i: c.get("/buscar", params={"q": "produto 9", "preco_max": 100})),
+            ("GET /categorias", lambda c, ctx, i: c.get("/categorias")),
+            ("GET /categorias/{categoria}", lambda c, ctx, i: c.get("/categorias/Livros")),
+            ("GET /estatisticas", lambda c, ctx, i: c.get("/estatisticas")),
+            ("POST /produtos", lambda c, ctx, i: c.post("/produtos", json=produto)),
+            ("PUT /produtos/{id}", lambda c, ctx, i: c.put(f"/produtos/{_meio(ctx['ids'])}", json=produto)),
+            ("DELETE /produtos/{id}", lambda c, ctx, i: c.delete(f"/produtos/{ctx['ids'][-1 - i]}")),
+        ]
+
+
+class AppFastapiCompleto:
+    modulo = "fastapi_completo"
+    referencia = "/"
+
+    async def semear(self, c, n, modulo):
+        token = _ok(await c.post("/auth/login", json={"email": "admin@sistema.com", "senha": "123456"})).json()["access_token"]
+        auth = {"Authorization": f"Bearer {token}"}
+        await _em_lotes(lambda i: c.post("/usuarios", json={
+            "nome": f"Usuário Número{i}", "email": f"u{i}@exemplo.com", "idade": 18 + i % 60,
+            "senha": "123456"}), n)
+        prioridades = ["baixa", "média", "alta"]
+        respostas = await _em_lotes(lambda i: c.post("/tarefas", headers=auth, json={
+            "titulo": f"Tarefa {i}", "descricao": "Gerada pelo benchmark",
+            "prioridade": prioridades[i % 3]}), n)
+        tarefas = [_ok(r, 201).json()["id"] for r in respostas]
+        admin = _ok(await c.get("/usuarios", params={"limit": 1})).json()[0]["id"]
+        return {"auth": auth, "tarefas": tarefas, "admin": admin}
+
+    def endpoints(self):
+        async def logout(c, ctx, i):
+            token = (await c.post("/auth/login", json={"email": "admin@sistema.com", "senha": "123456"})).json()["access_token"]
+            return await c.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+
+        tarefa = {"titulo": "Editada", "descricao": "x", "prioridade": "alta"}
+        return [
+            ("GET /", lambda c, ctx, i: c.get("/")),
+            ("GET /health", lambda c, ctx, i: c.get("/health")),
+            ("POST /auth/login", lambda c, ctx, i: c.post("/auth/login", json={
+                "email": "admin@sistema.com", "senha": "123456"})),
+            ("GET /usuarios", lambda c, ctx, i: c.get("/usuarios", params={"ativo": True})),
+            ("GET /usuarios/{id}", lambda c, ctx, i: c.get(f"/usuarios/{ctx['admin']}")),
+            ("GET /tarefas", lambda c, ctx, i: c.get("/tarefas", params={"prioridade": "alta"})),
+            ("GET /tarefas?fields", lambda c, ctx, i: c.get("/tarefas", params={
+                "prioridade": "alta", "fields": "id,titulo,concluida"})),
+            ("GET /tarefas/{id}", lambda c, ctx, i: c.get(f"/tarefas/{ctx['tarefas'][0]}")),
+            ("GET /estatisticas", lambda c, ctx, i: c.get("/estatisticas", headers=ctx["auth"])),
+            ("POST /usuarios", lambda c, ctx, i: c.post("/usuarios", json={
+                "nome": "Novo Usuário", "email": f"novo{i}@exemplo.com", "senha": "123456"})),
+            ("PUT /usuarios/{id}", lambda c, ctx, i: c.put(f"/usuarios/{ctx['admin']}", headers=ctx["auth"], json={
+                "nome": "Admin Sistema", "email": "admin@sistema.com", "idade": 25})),
+            ("POST /tarefas", lambda c, ctx, i: c.post("/tarefas", headers=ctx["auth"], json=tarefa)),
+            ("PUT /tarefas/{id}", lambda c, ctx, i: c.put(f"/tarefas/{_meio(ctx['tarefas'])}", headers=ctx["auth"], json=tarefa)),
+            # uma tarefa diferente por repetição (concluir de novo dá 400)
+            ("PATCH /tarefas/{id}/concluir", lambda c, ctx, i: c.patch(
+                f"/tarefas/{ctx['tarefas'][i]}/concluir", headers=ctx["auth"])),
+            ("DELETE /tarefas/{id}", lambda c, ctx, i: c.delete(f"/tarefas/{ctx['tarefas'][-1 - i]}", headers=ctx["auth"])),
+            ("POST /sistema/limpar-sessoes", lambda c, ctx, i: c.post("/sistema/limpar-sessoes")),
+            ("POST /auth/logout", logout),
+            ("DELETE /usuarios/{id}", lambda c, ctx, i: c.delete(f"/usuarios/{ctx['admin']}", headers=ctx["auth"])),
+        ]
+
+
+APPS = {
+    "basico": AppBasico(),
+    "medio": AppMedio(),
+    "avancado": AppAvancado(),
+    "exemplo_simples": AppExemploSimples(),
+    "fastapi_completo": AppFastapiCompleto(),
+}
+
+# =============================================================================
+# EXECUÇÃO
+# =============================================================================
+
+def carregar_modulo(nome):
+    """Importa o app do zero, para começar com os bancos em memória vazios"""
+    sys.modules.pop(nome, None)
+    return importlib.import_module(nome)
+
+
+async def medir_app(spec, tamanho, repeticoes):
+    modulo = carregar_modulo(spec.modulo)
+    if hasattr(spec, "preparar"):
+        spec.preparar(modulo)
+
+    transporte = httpx.ASGITransport(app=modulo.app)
+    async with httpx.AsyncClient(transport=transporte, base_url="http://benchmark") as c:
+        inicio = time.perf_counter()
+        ctx = await spec.semear(c, tamanho, modulo)
+        semeadura = time.perf_counter() - inicio
+
+        endpoints = {}
+        for nome, chamar, *limite in spec.endpoints():
+            tempos, relativos = [], []
+            n_repeticoes = min(repeticoes, *limite) if limite else repeticoes
+            for i in range(n_repeticoes):
+                inicio = time.perf_counter()
+                await c.get(spec.referencia)
+                referencia = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                response = await chamar(c, ctx, i)
+                tempo = time.perf_counter() - inicio
+                if response.status_code >= 400:
+                    raise RuntimeError(f"{spec.modulo} {nome}: {response.status_code} {response.text[:200]}")
+                tempos.append(tempo * 1000)
+                relativos.append(tempo / referencia)
+            endpoints[nome] = {
+                "mediana_ms": round(statistics.median(tempos), 4),
+                "media_ms": round(statistics.fmean(tempos), 4),
+                "minimo_ms": round(min(tempos), 4),
+                "relativo": round(statistics.median(relativos), 4),
+                "repeticoes": n_repeticoes,
+            }
+    return {"semeadura_s": round(semeadura, 3), "endpoints": endpoints}
+
+
+def comparar(resultados, baseline, tolerancia):
+    """
+    Lista os endpoints cujo tempo relativo (em múltiplos da requisição de
+    referência) piorou mais que `tolerancia` (ex.: 0.5)
+    """
+    regressoes = []
+    for app, por_tamanho in resultados.items():
+        for tamanho, medicao in por_tamanho.items():
+            base = baseline.get(app, {}).get(tamanho)
+            if not base:
+                continue
+            for nome, atual in medicao["endpoints"].items():
+                anterior = base["endpoints"].get(nome)
+                if not anterior:
+                    continue
+                if "relativo" not in anterior:
+                    continue  # baseline de uma versão antiga, só com tempos absolutos
+                razao = atual["relativo"] / max(anterior["relativo"], 1e-9)
+                if razao > 1 + tolerancia:
+                    regressoes.append(f"{app} n={tamanho} {nome}: {anterior['relativo']:.2f} -> "
+                                      f"{atual['relativo']:.2f} x referência ({razao:.2f}x)")
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", nargs="+", choices=sorted(APPS), default=list(APPS))
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=TAMANHOS_PADRAO)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--saida", type=Path, help="arquivo JSON de resultados "
+                        "(padrão: benchmarks/resultados/endpoints_<data>.json)")
+    parser.add_argument("--baseline", type=Path, help="JSON de referência para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.5, help="piora aceita (0.5 = 50%%)")
+    parser.add_argument("--salvar-baseline", type=Path, help="grava os resultados também como baseline")
+    args = parser.parse_args(argv)
+    if min(args.tamanhos) < 2 * args.repeticoes:
+        parser.error(f"cada tamanho precisa ser pelo menos 2 x --repeticoes ({2 * args.repeticoes}): "
+                     "os endpoints que apagam usam um registro diferente por repetição")
+
+    resultados = {}
+    for nome in args.apps:
+        resultados[nome] = {}
+        for tamanho in args.tamanhos:
+            print(f"⏱️  {nome} com {tamanho} registros...", flush=True)
+            # Os apps imprimem logs a cada requisição; silenciamos durante a medição
+            with contextlib.redirect_stdout(io.StringIO()):
+                medicao = asyncio.run(medir_app(APPS[nome], tamanho, args.repeticoes))
+            resultados[nome][str(tamanho)] = medicao
+            print(f"   semeadura: {medicao['semeadura_s']:.1f}s (referência: GET {APPS[nome].referencia})")
+            for endpoint, r in medicao["endpoints"].items():
+                print(f"   {endpoint:<32}{r['mediana_ms']:>10.3f} ms{r['relativo']:>9.2f}x")
+
+    documento = {
+        "meta": {
+            "data": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "repeticoes": args.repeticoes,
+        },
+        "resultados": resultados,
+    }
+    saida = args.saida or RAIZ / "benchmarks" / "resultados" / f"endpoints_{datetime.now():%Y%m%d_%H%M%S}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps(documento, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n💾 Resultados em {saida}")
+    if args.salvar_baseline:
+        args.salvar_baseline.write_text(json.dumps(documento, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 Baseline gravado em {args.salvar_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["resultados"]
+        regressoes = comparar(resultados, baseline, args.tolerancia)
+        if regressoes:
+            print(f"\n❌ {len(regressoes)} regressões acima de {args.tolerancia:.0%}:")
+            for regressao in regressoes:
+                print(f"   - {regressao}")
+            return 1
+        print(f"\n✅ Nenhuma regressão acima de {args.tolerancia:.0%} em relação ao baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
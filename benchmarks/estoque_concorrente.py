@@ -0,0 +1,108 @@
+"""
+BENCHMARK: reservas de estoque concorrentes (aula_14/estoque.py)
+
+Dispara milhares de pedidos em paralelo (threads) contra um catálogo com
+estoque limitado e verifica que:
+
+1. Nenhum produto vende mais do que tinha (sem "oversell")
+2. Estoque final + quantidade vendida = estoque inicial
+3. Nenhuma reserva fica pendurada
+
+A vazão é medida com travas por listra (padrão) e com uma única trava
+(equivalente a uma trava global), para vários níveis de concorrência.
+Para que a disputa pelas travas apareça, cada consulta de disponibilidade
+simula a latência de um banco de dados (--latencia-us), que libera o GIL.
+
+Uso:
+    python -m benchmarks.estoque_concorrente --pedidos 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "aula_14"))
+
+from estoque import Estoque, EstoqueInsuficiente  # noqa: E402
+
+
+class EstoqueComLatencia(Estoque):
+    """Estoque cuja consulta de disponibilidade simula uma ida ao banco"""
+
+    def __init__(self, produtos, listras, latencia):
+        super().__init__(produtos, listras)
+        self.latencia = latencia
+
+    def disponivel(self, produto_id):
+        if self.latencia:
+            time.sleep(self.latencia)
+        return super().disponivel(produto_id)
+
+
+def rodar(n_pedidos, n_produtos, estoque_inicial, listras, concorrencia, latencia, semente=42):
+    rng = random.Random(semente)
+    produtos = {i: SimpleNamespace(estoque=estoque_inicial) for i in range(1, n_produtos + 1)}
+    estoque = EstoqueComLatencia(produtos, listras, latencia)
+    pedidos = [
+        [(rng.randint(1, n_produtos), rng.randint(1, 3)) for _ in range(rng.randint(1, 3))]
+        for _ in range(n_pedidos)
+    ]
+
+    def processar(pedido_id):
+        itens = pedidos[pedido_id]
+        try:
+            estoque.reservar(pedido_id, itens)
+        except EstoqueInsuficiente:
+            return None
+        # 10% dos pedidos falham depois de reservar e devolvem o estoque
+        if pedido_id % 10 == 0:
+            estoque.liberar(pedido_id)
+            return None
+        estoque.confirmar(pedido_id)
+        return itens
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concorrencia) as executor:
+        confirmados = [itens for itens in executor.map(processar, range(n_pedidos)) if itens]
+    duracao = time.perf_counter() - inicio
+
+    # Conferência: a baixa de cada produto bate com os pedidos confirmados
+    vendido = {i: 0 for i in produtos}
+    for itens in confirmados:
+        for produto_id, quantidade in itens:
+            vendido[produto_id] += quantidade
+    for produto_id, produto in produtos.items():
+        assert produto.estoque >= 0, f"oversell no produto {produto_id}!"
+        assert produto.estoque + vendido[produto_id] == estoque_inicial, f"baixa errada no produto {produto_id}!"
+    assert estoque.reservas_pendentes == 0, "reservas penduradas!"
+    assert not any(estoque._reservado.values()), "reservado não zerou!"
+    aceitos = len(confirmados)
+
+    return SimpleNamespace(duracao=duracao, aceitos=aceitos, vazao=n_pedidos / duracao)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pedidos", type=int, default=5000)
+    parser.add_argument("--produtos", type=int, default=500)
+    parser.add_argument("--estoque", type=int, default=20, help="estoque inicial de cada produto")
+    parser.add_argument("--latencia-us", type=float, default=50.0)
+    parser.add_argument("--concorrencia", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    latencia = args.latencia_us / 1e6
+    print(f"📦 {args.pedidos} pedidos, {args.produtos} produtos com estoque {args.estoque}")
+    print(f"{'threads':>8}{'1 trava (ped/s)':>18}{'64 listras (ped/s)':>21}{'aceitos':>10}")
+    for concorrencia in args.concorrencia:
+        global_ = rodar(args.pedidos, args.produtos, args.estoque, 1, concorrencia, latencia)
+        listras = rodar(args.pedidos, args.produtos, args.estoque, 64, concorrencia, latencia)
+        print(f"{concorrencia:>8}{global_.vazao:>18.0f}{listras.vazao:>21.0f}{listras.aceitos:>10}")
+    print("✅ Sem oversell e sem reservas penduradas em todas as rodadas")
+
+
+if __name__ == "__main__":
+    main()
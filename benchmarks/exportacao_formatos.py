@@ -0,0 +1,111 @@
+"""
+BENCHMARK: CSV / XLSX / JSON x Parquet / Arrow (aula_13/exportacao.py)
+
+Gera uma tabela parecida com a de personagens da aula_13 (texto livre,
+casa de Hogwarts repetitiva, lista de filhos, números) e mede, para cada
+formato: tempo de escrita, tamanho em disco e tempo de leitura.
+
+- CSV, XLSX e JSON: como a aula fazia (to_csv, to_excel, to_json indentado)
+- Parquet e Arrow: `exportar_dataset` (esquema explícito, dicionário, zstd)
+
+O XLSX é limitado a --max-linhas-xlsx (o to_excel é lento demais) e é
+pulado se o openpyxl não estiver instalado.
+
+Uso:
+    python -m benchmarks.exportacao_formatos --linhas 200000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "aula_13"))
+
+from exportacao import ESQUEMAS, exportar_dataset, ler_dataset  # noqa: E402
+
+CASAS = ["Grifinória", "Sonserina", "Corvinal", "Lufa-Lufa", None]
+
+
+def personagens_falsos(n: int, semente: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(semente)
+    filhos = rng.integers(0, 4, n)
+    return pd.DataFrame({
+        "fullName": [f"Personagem {i} {rng.integers(1e9)}" for i in range(n)],
+        "nickname": [f"apelido{i % 5000}" for i in range(n)],
+        "hogwartsHouse": rng.choice(CASAS, n),
+        "interpretedBy": [f"Ator {i % 20000}" for i in range(n)],
+        "children": [[f"Filho {j}" for j in range(k)] for k in filhos],
+        "image": [f"https://exemplo.com/imagens/{i}.png" for i in range(n)],
+        "birthdate": rng.choice(["Jul 31, 1980", "Mar 1, 1980", "Sep 19, 1979", None], n),
+        "index": np.arange(n),
+    })
+
+
+def medir(nome, escrever, ler, caminho_tamanho):
+    inicio = time.perf_counter()
+    escrever()
+    escrita = time.perf_counter() - inicio
+    tamanho = sum(p.stat().st_size for p in caminho_tamanho())
+    inicio = time.perf_counter()
+    linhas = len(ler())
+    leitura = time.perf_counter() - inicio
+    return nome, escrita, tamanho, leitura, linhas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=200_000)
+    parser.add_argument("--max-linhas-xlsx", type=int, default=50_000)
+    args = parser.parse_args()
+
+    df = personagens_falsos(args.linhas)
+    with tempfile.TemporaryDirectory() as pasta:
+        pasta = Path(pasta)
+        resultados = [
+            medir("CSV", lambda: df.to_csv(pasta / "p.csv", index=False, encoding="utf-8"),
+                  lambda: pd.read_csv(pasta / "p.csv"), lambda: [pasta / "p.csv"]),
+            medir("JSON", lambda: df.to_json(pasta / "p.json", orient="records", indent=2, force_ascii=False),
+                  lambda: pd.read_json(pasta / "p.json"), lambda: [pasta / "p.json"]),
+            medir("Parquet", lambda: exportar_dataset(df, "personagens", raiz=pasta / "pq"),
+                  lambda: ler_dataset("personagens", raiz=pasta / "pq"),
+                  lambda: (pasta / "pq").rglob("*.parquet")),
+            medir("Arrow", lambda: exportar_dataset(df, "personagens", raiz=pasta / "arrow", formato="arrow"),
+                  lambda: ler_dataset("personagens", raiz=pasta / "arrow"),
+                  lambda: (pasta / "arrow").rglob("*.arrow")),
+        ]
+
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            print("⚠️  openpyxl não instalado: XLSX pulado")
+        else:
+            amostra = df.head(args.max_linhas_xlsx)
+            nome, escrita, tamanho, leitura, linhas = medir(
+                "XLSX", lambda: amostra.to_excel(pasta / "p.xlsx", index=False),
+                lambda: pd.read_excel(pasta / "p.xlsx"), lambda: [pasta / "p.xlsx"])
+            # Extrapola para o número total de linhas (é praticamente linear)
+            fator = len(df) / len(amostra)
+            resultados.append((f"XLSX (≈{len(amostra)} × {fator:.0f})", escrita * fator,
+                               tamanho * fator, leitura * fator, len(df)))
+
+        # Sanidade: o Parquet devolve os mesmos dados
+        lido = ler_dataset("personagens", raiz=pasta / "pq").drop(columns="data")
+        assert lido["fullName"].tolist() == df["fullName"].tolist()
+        assert lido["children"].map(list).tolist() == df["children"].tolist()
+        assert str(lido["hogwartsHouse"].dtype) == "category"
+
+    base = next(r for r in resultados if r[0] == "CSV")
+    print(f"📊 {args.linhas} linhas, colunas: {', '.join(ESQUEMAS['personagens'].names)}")
+    print(f"{'formato':<22}{'escrita s':>10}{'MiB':>9}{'leitura s':>11}{'tamanho x CSV':>15}")
+    for nome, escrita, tamanho, leitura, _ in resultados:
+        print(f"{nome:<22}{escrita:>10.2f}{tamanho / 2**20:>9.1f}{leitura:>11.2f}{tamanho / base[2]:>15.2f}")
+    print("✅ Parquet preserva listas, categorias e tipos")
+
+
+if __name__ == "__main__":
+    main()
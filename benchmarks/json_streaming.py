@@ -0,0 +1,124 @@
+"""
+BENCHMARK: response.json() + DataFrame x JSON em fluxo (aula_13/json_streaming.py)
+
+Gera um array JSON grande em disco e o serve por HTTP local. Cada modo roda
+em um processo separado, para medir o pico de memória (RSS máximo) de forma
+justa:
+
+1. ingênuo: `requests.get(url).json()` e `pd.DataFrame(...)`, como na aula
+2. fluxo: `buscar_em_blocos(url, tamanho_bloco=...)`, bloco a bloco
+
+Os dois calculam o mesmo resumo (linhas e soma de uma coluna), e o
+resultado é conferido.
+
+Uso:
+    python -m benchmarks.json_streaming --registros 1000000 --bloco 50000
+"""
+
+import argparse
+import functools
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ / "aula_13"))
+
+CASAS = ["Grifinória", "Sonserina", "Corvinal", "Lufa-Lufa"]
+
+
+def gerar_arquivo(caminho: Path, n: int, semente: int = 42):
+    rng = random.Random(semente)
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        arquivo.write("[")
+        for i in range(n):
+            registro = {"index": i, "fullName": f"Personagem {i}", "hogwartsHouse": rng.choice(CASAS),
+                        "pontos": rng.randint(0, 1000), "altura": round(rng.uniform(1.2, 2.1), 2),
+                        "descricao": "texto de exemplo " * 5}
+            arquivo.write(("," if i else "") + json.dumps(registro, ensure_ascii=False))
+        arquivo.write("]")
+
+
+class _Handler(SimpleHTTPRequestHandler):
+    def log_message(self, formato, *args):
+        pass
+
+
+def pico_memoria_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def rodar_modo(modo: str, url: str, bloco: int):
+    """Executado no processo filho; imprime o resultado em JSON"""
+    import pandas as pd
+    import requests
+
+    from json_streaming import buscar_em_blocos
+
+    base = pico_memoria_mb()  # interpretador + pandas, antes de qualquer dado
+    inicio = time.perf_counter()
+    if modo == "ingenuo":
+        df = pd.DataFrame(requests.get(url, timeout=600).json())
+        linhas, soma = len(df), int(df["pontos"].sum())
+    else:
+        linhas = soma = 0
+        for df in buscar_em_blocos(url, tamanho_bloco=bloco):
+            linhas += len(df)
+            soma += int(df["pontos"].sum())
+    print(json.dumps({"segundos": time.perf_counter() - inicio, "pico_mb": pico_memoria_mb(),
+                      "base_mb": base, "linhas": linhas, "soma": soma}))
+
+
+def medir(modo: str, url: str, bloco: int) -> dict:
+    saida = subprocess.run([sys.executable, "-m", "benchmarks.json_streaming", "--modo", modo,
+                            "--url", url, "--bloco", str(bloco)],
+                           cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=1_000_000)
+    parser.add_argument("--bloco", type=int, default=50_000)
+    parser.add_argument("--modo", choices=["ingenuo", "fluxo"], help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.modo:
+        rodar_modo(args.modo, args.url, args.bloco)
+        return
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = Path(pasta) / "personagens.json"
+        gerar_arquivo(caminho, args.registros)
+        tamanho_mb = caminho.stat().st_size / 2**20
+
+        handler = functools.partial(_Handler, directory=pasta)
+        servidor = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{servidor.server_address[1]}/personagens.json"
+        try:
+            ingenuo = medir("ingenuo", url, args.bloco)
+            fluxo = medir("fluxo", url, args.bloco)
+        finally:
+            servidor.shutdown()
+
+    assert (ingenuo["linhas"], ingenuo["soma"]) == (fluxo["linhas"], fluxo["soma"]), "resultados diferentes"
+    print(f"📦 {args.registros} registros, {tamanho_mb:.0f} MiB de JSON, blocos de {args.bloco}")
+    print(f"{'modo':<26}{'tempo s':>9}{'pico MiB':>10}{'acima da base':>15}")
+    for nome, r in (("json() + DataFrame", ingenuo), ("fluxo em blocos", fluxo)):
+        print(f"{nome:<26}{r['segundos']:>9.2f}{r['pico_mb']:>10.0f}{r['pico_mb'] - r['base_mb']:>15.0f}")
+    acima = (ingenuo["pico_mb"] - ingenuo["base_mb"]) / max(fluxo["pico_mb"] - fluxo["base_mb"], 1)
+    print(f"\n📉 Memória usada pelos dados {acima:.1f}x menor no fluxo; mesmos resultados")
+    print("   (no fluxo ela depende de --bloco, não do tamanho da resposta)")
+
+
+if __name__ == "__main__":
+    main()
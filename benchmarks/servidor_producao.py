@@ -0,0 +1,144 @@
+"""
+BENCHMARK: servidor de produção (api_comum/servidor.py) x modo atual
+
+Sobe a mesma app duas vezes, em processos separados, e aplica a mesma carga
+(os cenários de aula_api/teste_rapido.py, via aula_api/carga.py):
+
+1. atual: um único processo uvicorn com loop asyncio e parser h11, como o
+   `uvicorn.run(...)` dos `__main__` (sem o reload)
+2. produção: `python -m api_comum.servidor` com N workers, uvloop e httptools
+
+Mostra o tempo até o servidor aceitar requisições, o tempo de inicialização
+de cada worker e a vazão/latência sob carga. O ganho dos workers depende do
+número de núcleos da máquina (com 1 núcleo, só o loop/parser rápidos ajudam).
+
+As apps guardam os dados na memória de cada worker. Só o cenário "completa"
+funciona com vários workers (cada requisição dele se vale sozinha: o token
+é validado por qualquer worker e o usuário admin existe em todos); no
+"simples", o GET do produto recém-criado pode cair em outro worker e dar 404.
+
+Uso:
+    python -m benchmarks.servidor_producao --workers 4 --concorrencia 32 --duracao 10
+"""
+
+import argparse
+import asyncio
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ / "aula_api"))
+
+from carga import gerar_carga  # noqa: E402
+
+# cenário de carga -> app que ele exercita
+APPS_DOS_CENARIOS = {"simples": "exemplo_simples", "completa": "fastapi_completo"}
+
+
+def porta_livre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def comando_atual(app: str, porta: int):
+    pasta = "aula_api" if app in APPS_DOS_CENARIOS.values() else "aula_14"
+    return [sys.executable, "-m", "uvicorn", f"{app}:app", "--app-dir", str(RAIZ / pasta),
+            "--host", "127.0.0.1", "--port", str(porta), "--loop", "asyncio", "--http", "h11",
+            "--no-access-log"]
+
+
+def comando_producao(app: str, porta: int, workers: int):
+    comando = [sys.executable, "-m", "api_comum.servidor", app, "--host", "127.0.0.1",
+               "--port", str(porta), "--workers", str(workers), "--log-level", "warning"]
+    if workers > 1:
+        comando.append("--permitir-estado-por-worker")  # veja o começo do arquivo
+    return comando
+
+
+def esperar_pronto(porta: int, caminho: str, limite: float = 60.0) -> float:
+    """Segundos até o servidor responder 200 em `caminho`"""
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < limite:
+        try:
+            if httpx.get(f"http://127.0.0.1:{porta}{caminho}", timeout=1).status_code == 200:
+                return time.perf_counter() - inicio
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"servidor na porta {porta} não ficou pronto em {limite:.0f}s")
+
+
+def medir(nome, comando, caminho_pronto, cenario, concorrencia, duracao, workers=1):
+    porta = int(comando[comando.index("--port") + 1])
+    processo = subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, text=True)
+    try:
+        subida = esperar_pronto(porta, caminho_pronto)
+        if workers > 1:
+            # a porta responde quando o primeiro worker fica pronto; espera os outros
+            time.sleep(1.0)
+        resumo, tempo_total = asyncio.run(
+            gerar_carga(f"http://127.0.0.1:{porta}", cenario, concorrencia, duracao))
+    finally:
+        processo.terminate()
+        saida, _ = processo.communicate(timeout=60)
+
+    workers_ms = [float(ms) for ms in re.findall(r"pronto em (\d+) ms", saida)]
+    requisicoes = sum(r["requisicoes"] for r in resumo.values())
+    erros = sum(r["erros"] for r in resumo.values())
+    pior_p95 = max((r["p95_ms"] for r in resumo.values()), default=0.0)
+    pior_p99 = max((r["p99_ms"] for r in resumo.values()), default=0.0)
+    return {
+        "nome": nome,
+        "subida_s": subida,
+        "workers_ms": workers_ms,
+        "rps": requisicoes / tempo_total,
+        "erros": erros,
+        "p95_ms": pior_p95,
+        "p99_ms": pior_p99,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cenario", choices=sorted(APPS_DOS_CENARIOS), default="completa")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--concorrencia", type=int, default=32)
+    parser.add_argument("--duracao", type=float, default=10.0)
+    args = parser.parse_args()
+    if args.workers > 1 and args.cenario != "completa":
+        parser.error(f"o cenário '{args.cenario}' depende de dados criados em outra requisição; "
+                     "com vários workers use --cenario completa")
+
+    app = APPS_DOS_CENARIOS[args.cenario]
+    print(f"🏁 {app}: cenário '{args.cenario}', {args.concorrencia} usuários virtuais, "
+          f"{args.duracao:.0f}s por rodada ({os.cpu_count()} núcleo(s))")
+
+    resultados = [
+        medir("atual (1 processo, asyncio/h11)", comando_atual(app, porta_livre()), "/",
+              args.cenario, args.concorrencia, args.duracao),
+        medir(f"produção ({args.workers} workers)",
+              comando_producao(app, porta_livre(), args.workers), "/prontidao",
+              args.cenario, args.concorrencia, args.duracao, workers=args.workers),
+    ]
+
+    print(f"\n{'modo':<34}{'subida s':>9}{'req/s':>9}{'p95 ms':>9}{'p99 ms':>9}{'erros':>7}")
+    for r in resultados:
+        print(f"{r['nome']:<34}{r['subida_s']:>9.2f}{r['rps']:>9.1f}"
+              f"{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['erros']:>7}")
+    if resultados[1]["workers_ms"]:
+        tempos = ", ".join(f"{ms:.0f}" for ms in resultados[1]["workers_ms"])
+        print(f"\n⏱️  Inicialização por worker (ms): {tempos}")
+    print(f"📈 Vazão: {resultados[1]['rps'] / resultados[0]['rps']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+BENCHMARK: vários groupby por autor x tabela única (analise_tiktok/autores.py)
+
+Sobre um DataFrame sintético com --posts posts, mede:
+
+1. notebooks: a sequência do projeto2/Untitled-1.ipynb (to_numeric antes
+   de cada análise; groupby de médias e medianas, de plays com contagem, de
+   comentários por like e de seguidores) e o groupby de médias da aula_05
+2. `agregar_autores`: todas as métricas numa passada agrupada
+3. `TabelaAutores`: carga inicial e atualização com --novos posts (metade
+   vídeos novos, metade retratos mais recentes de vídeos já vistos),
+   comparada com refazer a tabela inteira
+
+Confere que a tabela única e a atualizada dão os mesmos números dos
+notebooks e de um recálculo completo.
+
+Uso:
+    python -m benchmarks.tiktok_autores --posts 1000000 --novos 10000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analise_tiktok.autores import COLUNAS_POSTS, TabelaAutores, agregar_autores  # noqa: E402
+from benchmarks.tiktok_sintetico import quadro_falso  # noqa: E402
+
+METRICAS = ['statsV2.diggCount', 'statsV2.commentCount', 'statsV2.shareCount', 'statsV2.playCount']
+
+
+def como_nos_notebooks(df: pd.DataFrame) -> dict:
+    """As células do projeto2/Untitled-1.ipynb e da aula_05, na ordem"""
+    df = df.copy()
+    autor = 'author.uniqueId'
+    df[METRICAS] = df[METRICAS].apply(pd.to_numeric, errors='coerce')
+    agr_autor = df.groupby(autor)[METRICAS].agg(['mean', 'median'])
+    agg = df.groupby(autor)['statsV2.playCount'].agg(['mean', 'median', 'count'])
+
+    likes_col, comments_col, seguidores_col = 'statsV2.diggCount', 'statsV2.commentCount', 'authorStats.followerCount'
+    df[[likes_col, comments_col]] = df[[likes_col, comments_col]].apply(pd.to_numeric, errors='coerce')
+    df['prop_comments_por_like'] = np.where(df[likes_col] > 0, df[comments_col] / df[likes_col], np.nan)
+    resultado = df.groupby(autor)['prop_comments_por_like'].mean().to_frame(name='media_prop_comments_por_like')
+    resultado = resultado.join(df.groupby(autor)['prop_comments_por_like'].count().rename('qtd_posts_validos'))
+
+    df[[likes_col, comments_col, seguidores_col]] = df[[likes_col, comments_col, seguidores_col]].apply(
+        pd.to_numeric, errors='coerce')
+    df['prop_comments_por_like'] = np.where(df[likes_col] > 0, df[comments_col] / df[likes_col], np.nan)
+    resultado = df.groupby(autor)['prop_comments_por_like'].mean().to_frame(name='media_prop_comments_por_like')
+    resultado['qtd_posts_validos'] = df.groupby(autor)['prop_comments_por_like'].count()
+    resultado = resultado.join(df.groupby(autor)[seguidores_col].max().rename('seguidores'))
+
+    medias = df.groupby(autor).agg({m: 'mean' for m in METRICAS})
+    return {"agr_autor": agr_autor, "agg": agg, "resultado": resultado, "medias": medias}
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def conferir(tabela: pd.DataFrame, notebooks: dict):
+    def igual(a, b):
+        pd.testing.assert_series_equal(a.astype("float64"), b.astype("float64"), check_names=False,
+                                       check_index_type=False, check_categorical=False)
+
+    por_autor = {str(k): v for k, v in notebooks.items()}
+    nomes = {'statsV2.diggCount': 'likes', 'statsV2.commentCount': 'comentarios',
+             'statsV2.shareCount': 'compart', 'statsV2.playCount': 'plays'}
+    agr = por_autor["agr_autor"].set_axis(por_autor["agr_autor"].index.astype("str"))
+    for coluna, nome in nomes.items():
+        igual(tabela[f"{nome}_media"], agr[(coluna, "mean")])
+        igual(tabela[f"{nome}_mediana"], agr[(coluna, "median")])
+    agg = por_autor["agg"].set_axis(por_autor["agg"].index.astype("str"))
+    igual(tabela["posts"], agg["count"])
+    resultado = por_autor["resultado"].set_axis(por_autor["resultado"].index.astype("str"))
+    for coluna in ("media_prop_comments_por_like", "qtd_posts_validos", "seguidores"):
+        igual(tabela[coluna], resultado[coluna])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--novos", type=int, default=10_000)
+    args = parser.parse_args()
+
+    dados = quadro_falso(args.posts + args.novos // 2)
+    iniciais = dados.iloc[:args.posts][COLUNAS_POSTS]
+    # Novos: vídeos ainda não vistos e retratos mais recentes (mais likes) de vídeos já vistos
+    inedito = dados.iloc[args.posts:][COLUNAS_POSTS]
+    regravado = iniciais.sample(args.novos - len(inedito), random_state=1).copy()
+    regravado["statsV2.diggCount"] *= 2
+    novos = pd.concat([inedito, regravado], ignore_index=True)
+
+    notebooks, t_notebooks = cronometrar(lambda: como_nos_notebooks(iniciais))
+    tabela, t_tabela = cronometrar(lambda: agregar_autores(iniciais))
+    conferir(tabela, notebooks)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        autores = TabelaAutores(pasta)
+        _, t_carga = cronometrar(lambda: autores.atualizar(iniciais))
+        lida, t_leitura = cronometrar(autores.ler)
+        afetados, t_atualizacao = cronometrar(lambda: autores.atualizar(novos))
+        atualizada = autores.ler()
+
+    completos = pd.concat([iniciais[~iniciais["id"].isin(regravado["id"])], novos])
+    refeita, t_refeita = cronometrar(lambda: agregar_autores(completos))
+    pd.testing.assert_frame_equal(lida, tabela, check_index_type=False)
+    pd.testing.assert_frame_equal(atualizada, refeita, check_index_type=False)
+
+    print(f"📦 {args.posts} posts, {len(tabela)} autores; atualização: {len(novos)} posts "
+          f"({len(inedito)} inéditos), {afetados} autores recalculados")
+    print(f"{'forma':<46}{'tempo s':>9}")
+    for nome, segundos in (("groupby dos notebooks (to_numeric a cada um)", t_notebooks),
+                           ("agregar_autores (uma passada)", t_tabela),
+                           ("TabelaAutores: carga inicial (com gravação)", t_carga),
+                           ("TabelaAutores.ler()", t_leitura),
+                           ("TabelaAutores: atualização incremental", t_atualizacao),
+                           ("agregar_autores de novo, tudo", t_refeita)):
+        print(f"{nome:<46}{segundos:>9.2f}")
+    print(f"\n⚡ tabela única {t_notebooks / t_tabela:.1f}x mais rápida que os groupby dos notebooks; "
+          f"ler a tabela pronta: {t_notebooks / t_leitura:.0f}x")
+    print("✅ Mesmos números dos notebooks; atualização incremental = recálculo completo")
+
+
+if __name__ == "__main__":
+    main()
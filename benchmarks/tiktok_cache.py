@@ -0,0 +1,75 @@
+"""
+BENCHMARK: NDJSON a cada execução x cache Parquet (analise_tiktok/cache.py)
+
+Gera uma captura sintética do Zeeschuimer e mede:
+
+1. primeira carga: lê o NDJSON e grava o cache (falta)
+2. cargas seguintes: lê o Parquet (acerto)
+3. NDJSON alterado (mtime novo): o cache é refeito sozinho (invalidação)
+
+Nos acertos o DataFrame é conferido contra a leitura direta do NDJSON.
+
+Uso:
+    python -m benchmarks.tiktok_cache --posts 50000 --repeticoes 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analise_tiktok.cache import CacheDatasets  # noqa: E402
+from analise_tiktok.leitura import ler_ndjson  # noqa: E402
+from benchmarks.tiktok_sintetico import gerar_captura  # noqa: E402
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=50_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = gerar_captura(Path(pasta) / "captura.ndjson", args.posts)
+        cache = CacheDatasets()
+
+        original, t_ndjson = cronometrar(lambda: ler_ndjson(caminho))
+        _, t_falta = cronometrar(lambda: cache.carregar(caminho))
+        acertos = []
+        for _ in range(args.repeticoes):
+            df, segundos = cronometrar(lambda: cache.carregar(caminho))
+            acertos.append(segundos)
+        pd.testing.assert_frame_equal(df, original)
+
+        os.utime(caminho)  # "nova versão" da captura
+        _, t_invalidado = cronometrar(lambda: cache.carregar(caminho))
+
+        tamanho_ndjson = caminho.stat().st_size / 2**20
+        tamanho_cache = cache.arquivo_cache(caminho).stat().st_size / 2**20
+        estatisticas = dict(cache.estatisticas)
+
+    t_acerto = min(acertos)
+    print(f"📦 {args.posts} posts: NDJSON {tamanho_ndjson:.0f} MiB, cache Parquet {tamanho_cache:.1f} MiB")
+    print(f"{'carga':<34}{'tempo s':>9}")
+    print(f"{'ler_ndjson (sem cache)':<34}{t_ndjson:>9.2f}")
+    print(f"{'1ª carga (lê NDJSON + grava)':<34}{t_falta:>9.2f}")
+    print(f"{'acerto (melhor de ' + str(args.repeticoes) + ')':<34}{t_acerto:>9.2f}")
+    print(f"{'NDJSON alterado (refaz o cache)':<34}{t_invalidado:>9.2f}")
+    print(f"\n⚡ Acerto {t_ndjson / t_acerto:.1f}x mais rápido que reler o NDJSON; {estatisticas}")
+    print("✅ DataFrame do cache idêntico ao do NDJSON")
+
+
+if __name__ == "__main__":
+    main()
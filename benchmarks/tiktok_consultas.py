@@ -0,0 +1,136 @@
+"""
+BENCHMARK: DataFrame inteiro x consultas DuckDB (analise_tiktok/consultas.py)
+
+Gera uma captura sintética do Zeeschuimer e responde às perguntas da
+aula_04 (total de posts, url do vídeo com mais likes, média de
+comentários, mediana de compartilhamentos) e a um groupby por autor da
+aula_05 de três formas, cada uma em um processo separado para medir o
+pico de memória (RSS máximo):
+
+1. pandas: `ler_ndjson` (DataFrame inteiro, tipos compactos) + idxmax/mean/median/groupby
+2. duckdb/ndjson: `ConsultaTikTok` direto sobre o NDJSON
+3. duckdb/parquet: `ConsultaTikTok` sobre o mesmo conteúdo em Parquet
+
+As respostas das três precisam ser iguais. --memoria é o limite do DuckDB.
+
+Uso:
+    python -m benchmarks.tiktok_consultas --posts 200000 --memoria 256MB
+"""
+
+import argparse
+import importlib
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ))
+
+MODOS = ["pandas", "duckdb/ndjson", "duckdb/parquet"]
+
+
+def pico_memoria_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def memoria_atual_mb() -> float:
+    # O pico da importação (pyarrow, duckdb) esconderia o uso das consultas
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def responder_com_pandas(caminho: str) -> dict:
+    from analise_tiktok.derivadas import url_do_video
+    from analise_tiktok.leitura import ler_ndjson
+
+    dados = ler_ndjson(caminho)
+    indice = dados["statsV2.diggCount"].idxmax()
+    por_autor = (dados.groupby("author.uniqueId", observed=True)["statsV2.diggCount"].mean()
+                 .sort_values(ascending=False, kind="stable").head(10))
+    return {"total": len(dados), "url": url_do_video(dados.loc[[indice]]).iloc[0],
+            "media_comentarios": float(dados["statsV2.commentCount"].mean()),
+            "mediana_compartilhamentos": float(dados["statsV2.shareCount"].median()),
+            "por_autor": {str(k): round(float(v), 6) for k, v in por_autor.items()}}
+
+
+def responder_com_duckdb(fonte: str, memoria: str) -> dict:
+    from analise_tiktok.consultas import ConsultaTikTok
+
+    with ConsultaTikTok(fonte, memoria_maxima=memoria) as consulta:
+        por_autor = consulta.agregar("author.uniqueId", {"statsV2.diggCount": "mean"},
+                                     ordenar_por="statsV2.diggCount", limite=10)["statsV2.diggCount"]
+        return {"total": consulta.total_posts(), "url": consulta.mais_curtido()["url"],
+                "media_comentarios": float(consulta.media("statsV2.commentCount")),
+                "mediana_compartilhamentos": float(consulta.mediana("statsV2.shareCount")),
+                "por_autor": {str(k): round(float(v), 6) for k, v in por_autor.items()}}
+
+
+def rodar_modo(modo: str, caminho: str, memoria: str):
+    """Executado no processo filho; imprime as respostas e as medidas em JSON"""
+    # As bibliotecas já carregadas entram na memória base, não na medida
+    for biblioteca in ("pandas", "duckdb"):
+        importlib.import_module(biblioteca)
+
+    base = memoria_atual_mb()
+    inicio = time.perf_counter()
+    if modo == "pandas":
+        respostas = responder_com_pandas(caminho)
+    else:
+        respostas = responder_com_duckdb(caminho if modo == "duckdb/ndjson" else f"{caminho}.parquet", memoria)
+    segundos = time.perf_counter() - inicio
+    print(json.dumps({"segundos": segundos, "pico_mb": pico_memoria_mb(), "base_mb": base, "respostas": respostas}))
+
+
+def medir(modo: str, caminho: Path, memoria: str) -> dict:
+    saida = subprocess.run([sys.executable, "-m", "benchmarks.tiktok_consultas", "--modo", modo,
+                            "--caminho", str(caminho), "--memoria", memoria],
+                           cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=200_000)
+    parser.add_argument("--memoria", default="256MB")
+    parser.add_argument("--modo", choices=MODOS, help=argparse.SUPPRESS)
+    parser.add_argument("--caminho", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.modo:
+        rodar_modo(args.modo, args.caminho, args.memoria)
+        return
+
+    import duckdb
+
+    from analise_tiktok.consultas import ConsultaTikTok
+    from benchmarks.tiktok_sintetico import gerar_captura
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = gerar_captura(Path(pasta) / "captura.ndjson", args.posts)
+        tamanho_mb = caminho.stat().st_size / 2**20
+        # O Parquet sai da própria view (sem passar pelo pandas)
+        with ConsultaTikTok(caminho) as consulta:
+            consulta.conexao.execute(f"COPY posts TO '{caminho}.parquet' (FORMAT parquet, COMPRESSION zstd)")
+        parquet_mb = Path(f"{caminho}.parquet").stat().st_size / 2**20
+        resultados = {modo: medir(modo, caminho, args.memoria) for modo in MODOS}
+
+    referencia = resultados["pandas"]["respostas"]
+    for modo in MODOS[1:]:
+        assert resultados[modo]["respostas"] == referencia, f"{modo} respondeu diferente: {resultados[modo]['respostas']}"
+
+    print(f"📦 {args.posts} posts: {tamanho_mb:.0f} MiB de NDJSON, {parquet_mb:.0f} MiB de Parquet "
+          f"(DuckDB {duckdb.__version__}, limite {args.memoria})")
+    print(f"{'modo':<18}{'tempo s':>9}{'pico MiB':>10}{'acima da base':>15}")
+    for modo, r in resultados.items():
+        print(f"{modo:<18}{r['segundos']:>9.2f}{r['pico_mb']:>10.0f}{r['pico_mb'] - r['base_mb']:>15.0f}")
+    print(f"\n🎯 mais curtido: {referencia['url']} | média de comentários {referencia['media_comentarios']:.2f} | "
+          f"mediana de compartilhamentos {referencia['mediana_compartilhamentos']:.0f}")
+    print("✅ As três formas dão as mesmas respostas")
+
+
+if __name__ == "__main__":
+    main()
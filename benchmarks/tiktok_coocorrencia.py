@@ -0,0 +1,101 @@
+"""
+BENCHMARK: pares de hashtags em Python x produto esparso (analise_tiktok/coocorrencia.py)
+
+Gera --posts listas de hashtags sorteadas (lei de Zipf) de um vocabulário
+de --vocabulario hashtags, com 0 a --max-tags por post, e conta os pares
+que aparecem juntos de duas formas:
+
+1. Python: Counter de `itertools.combinations` de cada lista
+2. `CoocorrenciaHashtags`: incidência esparsa + Xᵀ X
+
+Confere que todos os pares e contagens são iguais e mostra o tamanho da
+matriz esparsa perto do que uma densa ocuparia. Mede também os 20 pares
+mais frequentes, os 20 de maior PMI e a lista de vizinhos de todas as hashtags.
+
+Uso:
+    python -m benchmarks.tiktok_coocorrencia --posts 1000000 --vocabulario 300000
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analise_tiktok.coocorrencia import CoocorrenciaHashtags  # noqa: E402
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def listas_falsas(n_posts: int, vocabulario: int, max_tags: int, semente: int = 42) -> pd.Series:
+    rng = np.random.default_rng(semente)
+    n_tags = rng.integers(0, max_tags + 1, n_posts)
+    sorteio = rng.zipf(1.1, n_tags.sum())
+    # a cauda da Zipf passa do vocabulário: esses sorteios viram hashtags quaisquer
+    sorteio = np.where(sorteio > vocabulario, rng.integers(1, vocabulario + 1, len(sorteio)), sorteio) - 1
+    nomes = np.char.add("tag", np.arange(vocabulario).astype(str)).astype(object)[sorteio].tolist()
+    limites = np.r_[0, np.cumsum(n_tags)].tolist()
+    return pd.Series([list(dict.fromkeys(nomes[limites[i]:limites[i + 1]])) for i in range(n_posts)])
+
+
+def pares_em_python(listas: pd.Series) -> Counter:
+    pares = Counter()
+    for lista in listas.tolist():
+        pares.update(itertools.combinations(sorted(lista), 2))
+    return pares
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--vocabulario", type=int, default=300_000)
+    parser.add_argument("--max-tags", type=int, default=8)
+    args = parser.parse_args()
+
+    listas = listas_falsas(args.posts, args.vocabulario, args.max_tags)
+    python, t_python = cronometrar(lambda: pares_em_python(listas))
+    co, t_esparso = cronometrar(lambda: CoocorrenciaHashtags(listas, normalizado=False))
+    frequentes, t_frequentes = cronometrar(lambda: co.pares(20))
+    associados, t_pmi = cronometrar(lambda: co.pares(20, por="pmi", minimo=20))
+    vizinhos, t_vizinhos = cronometrar(lambda: co.vizinhos(n=10))
+
+    # Todos os pares conferem (hashtag_a < hashtag_b em ordem alfabética, como no sorted)
+    superior = sp.triu(co.coocorrencia, k=1, format="coo")
+    a, b = co.vocabulario[superior.row], co.vocabulario[superior.col]
+    esparso = Counter({(min(x, y), max(x, y)): int(n) for x, y, n in zip(a, b, superior.data)})
+    assert esparso == python, "pares diferentes"
+    mais_comuns = [(p, n) for p, n in python.most_common(20)]
+    assert sorted(n for _, n in mais_comuns) == sorted(frequentes["posts"].tolist())
+
+    usados = len(co.vocabulario)
+    bytes_esparso = co.coocorrencia.data.nbytes + co.coocorrencia.indices.nbytes + co.coocorrencia.indptr.nbytes
+    print(f"📦 {args.posts} posts, {co.incidencia.nnz} ocorrências, {usados} hashtags distintas, "
+          f"{len(python)} pares distintos")
+    print(f"💾 coocorrência esparsa: {bytes_esparso / 2**20:.0f} MiB "
+          f"(densa seria {usados ** 2 * 4 / 2**30:.0f} GiB)")
+    print(f"{'forma':<40}{'tempo s':>9}")
+    for nome, segundos in (("Counter(combinations) em Python", t_python),
+                           ("incidência + Xᵀ X", t_esparso),
+                           ("20 pares mais frequentes", t_frequentes),
+                           ("20 pares de maior PMI (>= 20 posts)", t_pmi),
+                           ("10 vizinhos de cada hashtag", t_vizinhos)):
+        print(f"{nome:<40}{segundos:>9.2f}")
+    print(f"\n⚡ contagem dos pares {t_python / t_esparso:.1f}x mais rápida")
+    print(frequentes.head(5).to_string(index=False))
+    print(associados.head(5).to_string(index=False))
+    print(f"✅ Mesmos {len(python)} pares e contagens; {len(vizinhos)} linhas de vizinhos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+BENCHMARK: colunas derivadas com apply x vetorizadas (analise_tiktok/derivadas.py)
+
+Para cada coluna derivada das aulas, mede o código original (apply linha a
+linha) e a versão vetorizada sobre o mesmo DataFrame sintético, e confere
+que os resultados são idênticos:
+
+- createdAt: apply(pd.Timestamp(x, unit='s')) x pd.to_datetime(unit='s')
+- url: apply(preenche_url, axis=1) x concatenação de colunas
+- hashtags: apply(get_hashtags) x extração das listas de challenges
+
+Uso:
+    python -m benchmarks.tiktok_derivadas --posts 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analise_tiktok.derivadas import criado_em, hashtags, url_do_video  # noqa: E402
+from benchmarks.tiktok_sintetico import quadro_falso  # noqa: E402
+
+
+# Código das aulas (aula_04/zeeschuimer.py e aula_05/analise.ipynb)
+def preenche_url(item):
+    return f"https://www.tiktok.com/@{item['author.uniqueId']}/video/{item['id']}"
+
+
+def get_hashtags(lista):
+    resultado = []
+    try:
+        for item in lista:
+            resultado.append(item['title'])
+        return resultado
+    except:  # noqa: E722
+        return resultado
+
+
+CASOS = {
+    "createdAt": (lambda d: d["createTime"].apply(lambda x: pd.Timestamp(x, unit="s")),
+                  lambda d: criado_em(d["createTime"])),
+    "url": (lambda d: d.apply(preenche_url, axis=1), url_do_video),
+    "hashtags": (lambda d: d["challenges"].apply(get_hashtags), lambda d: hashtags(d["challenges"])),
+}
+
+
+def cronometrar(funcao, dados):
+    inicio = time.perf_counter()
+    resultado = funcao(dados)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    dados = quadro_falso(args.posts)
+    # challenges fora do formato: item sem "title", item que não é dict
+    estranhos = [[{"title": "x"}, {"foo": 1}], ["texto"], [{"title": "a"}, None, {"title": "c"}], [[1]]]
+    for posicao, lista in zip(range(0, len(dados), max(len(dados) // len(estranhos), 1)), estranhos):
+        dados.at[posicao, "challenges"] = lista
+    print(f"📦 {args.posts} posts")
+    print(f"{'coluna':<12}{'apply s':>10}{'vetorizado s':>14}{'speedup':>10}")
+    total_antes = total_depois = 0.0
+    for nome, (original, vetorizado) in CASOS.items():
+        antes, t_antes = cronometrar(original, dados)
+        depois, t_depois = cronometrar(vetorizado, dados)
+        assert antes.tolist() == depois.tolist(), f"{nome}: resultados diferentes"
+        assert antes.dtype == depois.dtype or nome == "hashtags", f"{nome}: {antes.dtype} x {depois.dtype}"
+        total_antes += t_antes
+        total_depois += t_depois
+        print(f"{nome:<12}{t_antes:>10.2f}{t_depois:>14.3f}{t_antes / t_depois:>9.1f}x")
+    print(f"{'total':<12}{total_antes:>10.2f}{total_depois:>14.3f}{total_antes / total_depois:>9.1f}x")
+    print("✅ Resultados idênticos")
+
+
+if __name__ == "__main__":
+    main()
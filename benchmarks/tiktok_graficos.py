@@ -0,0 +1,119 @@
+"""
+BENCHMARK: gráficos do seaborn x gráficos de contagens (analise_tiktok/graficos.py)
+
+Sobre um DataFrame sintético com --posts posts, mede o tempo para montar e
+renderizar (savefig em PNG, backend Agg) cada gráfico da aula_05 e o
+equivalente a partir de contagens:
+
+1. `sns.histplot(x=likes, bins=100, kde=True)` x `plotar_histograma(likes, 100)`
+2. `sns.scatterplot(x=shares, y=likes)` x `plotar_hexbin(shares, likes)`
+3. `sns.pairplot(vars=4 estatísticas)` x `plotar_pares(4 estatísticas)`
+
+Confere que as contagens do histograma e dos hexágonos são as mesmas do
+np.histogram / plt.hexbin sobre os dados brutos, e mede o erro da KDE da
+amostra contra a KDE de todos os posts (a que o seaborn desenha): erro
+máximo em % do pico e quantos pontos da curva (onde ela passa de 1% do
+pico) ficam dentro de ± 2 erros padrão.
+--sem-pairplot pula o caso 3 (o pairplot do seaborn é o mais lento).
+
+Uso:
+    python -m benchmarks.tiktok_graficos --posts 1000000
+"""
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import seaborn as sns  # noqa: E402
+from scipy.stats import gaussian_kde  # noqa: E402
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analise_tiktok.graficos import (hexagonos, histograma, kde_amostra, plotar_hexbin,  # noqa: E402
+                                     plotar_histograma, plotar_pares)
+from benchmarks.tiktok_sintetico import quadro_falso  # noqa: E402
+
+ESTATISTICAS = ["statsV2.playCount", "statsV2.diggCount", "statsV2.shareCount", "statsV2.commentCount"]
+
+
+def renderizar(desenhar) -> float:
+    """Segundos para montar a figura e gravá-la em PNG"""
+    inicio = time.perf_counter()
+    figura = desenhar()
+    figura = getattr(figura, "figure", figura) or plt.gcf()
+    figura.savefig(io.BytesIO(), format="png")
+    segundos = time.perf_counter() - inicio
+    plt.close("all")
+    return segundos
+
+
+def em_figura(funcao):
+    def desenhar():
+        plt.figure(figsize=(8, 4))
+        funcao()
+        return plt.gcf()
+    return desenhar
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--sem-pairplot", action="store_true")
+    args = parser.parse_args()
+
+    dados = quadro_falso(args.posts)
+    likes, shares = dados["statsV2.diggCount"], dados["statsV2.shareCount"]
+
+    # As contagens são as mesmas dos dados brutos
+    assert np.array_equal(histograma(likes, 100).contagens, np.histogram(likes, 100)[0])
+    hexes = hexagonos(shares, likes, 50)
+    bruto = plt.hexbin(shares, likes, gridsize=50, mincnt=1)
+    assert np.array_equal(np.sort(hexes.contagens), np.sort(bruto.get_array()))
+    plt.close("all")
+
+    # Erro da KDE da amostra contra a KDE de todos os posts, nos mesmos pontos
+    densidade = kde_amostra(likes)
+    inicio = time.perf_counter()
+    completa = gaussian_kde(likes.to_numpy(dtype="float64"))(densidade.x)
+    t_completa = time.perf_counter() - inicio
+    erro = np.abs(densidade.densidade - completa)
+    # Cobertura da faixa de ± 2 erros padrão onde a curva aparece (>= 1% do pico)
+    visiveis = completa >= 0.01 * completa.max()
+    dentro = np.mean(erro[visiveis] <= 2 * densidade.erro_padrao[visiveis])
+
+    casos = [
+        ("histograma + KDE",
+         em_figura(lambda: sns.histplot(data=dados, x="statsV2.diggCount", bins=100, kde=True, color="green")),
+         em_figura(lambda: plotar_histograma(likes, 100, color="green"))),
+        ("dispersão",
+         em_figura(lambda: sns.scatterplot(data=dados, x="statsV2.shareCount", y="statsV2.diggCount",
+                                           color="purple")),
+         em_figura(lambda: plotar_hexbin(shares, likes))),
+    ]
+    if not args.sem_pairplot:
+        casos.append(("pairplot (4 estatísticas)", lambda: sns.pairplot(data=dados, vars=ESTATISTICAS),
+                      lambda: plotar_pares(dados, ESTATISTICAS, log=False)))
+
+    print(f"📦 {args.posts} posts")
+    print(f"{'gráfico':<28}{'seaborn s':>11}{'contagens s':>13}{'ganho':>9}")
+    for nome, seaborn, contagens in casos:
+        t_seaborn, t_contagens = renderizar(seaborn), renderizar(contagens)
+        print(f"{nome:<28}{t_seaborn:>11.2f}{t_contagens:>13.2f}{t_seaborn / t_contagens:>8.0f}x")
+    pior = erro.argmax()
+    print(f"\n📈 KDE com {densidade.n_amostra} posts: erro máximo {erro[pior] / completa.max():.2%} do pico, "
+          f"onde o erro padrão informado é {densidade.erro_padrao[pior] / completa.max():.2%} "
+          f"(KDE de todos os posts: {t_completa:.1f} s só para avaliar); "
+          f"{dentro:.0%} dos pontos com densidade >= 1% do pico dentro de ± 2 erros padrão")
+    print("✅ Contagens do histograma e dos hexágonos iguais às dos dados brutos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+BENCHMARK: contagem de hashtags com .sum() x tabela longa (analise_tiktok/hashtags.py)
+
+Sobre um DataFrame sintético com --posts posts, mede:
+
+1. aula: `Counter(dados['hashtags'].sum())`. A soma de listas é quadrática,
+   então roda só nos primeiros --amostras posts (e mostra quanto o tempo
+   cresce quando o número de posts dobra)
+2. `Counter(itertools.chain(...))`: o melhor que dá em Python puro
+3. `contar_hashtags(dados, k=30)`: Counter único + normalização dos distintos
+4. `tabela_hashtags` (uma vez) e `contar_hashtags(tabela)`: value_counts nos códigos
+5. `ContadorHashtags` alimentado em blocos de --bloco posts
+
+Confere que as contagens (sem normalizar) são idênticas às do Counter. Com
+o wordcloud instalado, compara também `generate(' '.join(...))` com
+`generate_from_frequencies(frequencias(...))`.
+
+Uso:
+    python -m benchmarks.tiktok_hashtags --posts 1000000 --amostras 5000 10000 20000
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analise_tiktok.derivadas import hashtags  # noqa: E402
+from analise_tiktok.hashtags import ContadorHashtags, contar_hashtags, frequencias, tabela_hashtags  # noqa: E402
+from benchmarks.tiktok_sintetico import quadro_falso  # noqa: E402
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--amostras", type=int, nargs="+", default=[5_000, 10_000, 20_000])
+    parser.add_argument("--bloco", type=int, default=100_000)
+    args = parser.parse_args()
+
+    dados = quadro_falso(args.posts)
+    dados["hashtags"] = hashtags(dados["challenges"])
+
+    somas = {}
+    for n in args.amostras:
+        contagem, somas[n] = cronometrar(lambda: Counter(dados["hashtags"].head(n).sum()))
+        assert contagem == contar_hashtags(dados.head(n), normalizado=False).to_dict()
+
+    counter, t_counter = cronometrar(lambda: Counter(itertools.chain.from_iterable(dados["hashtags"].tolist())))
+    todas, t_todas = cronometrar(lambda: contar_hashtags(dados, normalizado=False))
+    assert counter == todas.to_dict(), "contagens diferentes do Counter"
+    top, t_top = cronometrar(lambda: contar_hashtags(dados, k=30))
+    tabela, t_tabela = cronometrar(lambda: tabela_hashtags(dados))
+    da_tabela, t_da_tabela = cronometrar(lambda: contar_hashtags(tabela, k=30))
+    assert da_tabela.to_dict() == top.to_dict()
+
+    def em_blocos():
+        contador = ContadorHashtags()
+        for inicio in range(0, len(dados), args.bloco):
+            contador.atualizar(dados["hashtags"].iloc[inicio:inicio + args.bloco])
+        return contador.mais_comuns(30)
+
+    blocos, t_blocos = cronometrar(em_blocos)
+    assert blocos.to_dict() == top.to_dict()
+
+    print(f"📦 {args.posts} posts, {len(todas)} hashtags distintas, {todas.sum()} ocorrências")
+    print(f"{'forma':<44}{'posts':>10}{'tempo s':>10}")
+    anterior = None
+    for n, segundos in somas.items():
+        crescimento = f"  ({segundos / anterior[1]:.1f}x com {n / anterior[0]:.0f}x posts)" if anterior else ""
+        print(f"{'Counter(.sum()) (aula)':<44}{n:>10}{segundos:>10.2f}{crescimento}")
+        anterior = (n, segundos)
+    n, segundos = anterior
+    print(f"{'   projeção quadrática':<44}{args.posts:>10}{segundos * (args.posts / n) ** 2:>10.0f}")
+    for nome, segundos in (("Counter(itertools.chain(...))", t_counter),
+                           ("contar_hashtags (todas)", t_todas),
+                           ("contar_hashtags(k=30), normalizadas", t_top),
+                           ("tabela_hashtags (uma vez)", t_tabela),
+                           ("contar_hashtags(tabela, k=30)", t_da_tabela),
+                           (f"ContadorHashtags, blocos de {args.bloco}", t_blocos)):
+        print(f"{nome:<44}{args.posts:>10}{segundos:>10.2f}")
+
+    try:
+        from wordcloud import WordCloud
+    except ImportError:
+        print("\n(wordcloud não instalado: nuvem de palavras não medida)")
+    else:
+        nuvem = WordCloud(width=800, height=400, max_font_size=150, max_words=100, background_color="white")
+        _, t_texto = cronometrar(lambda: nuvem.generate(" ".join(itertools.chain.from_iterable(dados["hashtags"]))))
+        _, t_freq = cronometrar(lambda: nuvem.generate_from_frequencies(frequencias(contar_hashtags(dados, k=100))))
+        print(f"\n☁️  WordCloud: generate(texto) {t_texto:.2f} s | generate_from_frequencies {t_freq:.2f} s")
+    print("✅ Contagens idênticas às do Counter")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+BENCHMARK: histórico só com mudanças x uma cópia por captura (analise_tiktok/historico.py)
+
+Simula --dias capturas diárias dos mesmos --videos vídeos; a cada dia só
+--fracao deles ganha plays/likes novos. Para cada captura:
+
+- registra no `HistoricoEstatisticas` (mede o tempo de cada registro)
+- grava também a captura inteira em Parquet, como "uma cópia por dia"
+
+Compara o espaço em disco, mede as consultas (série de um vídeo,
+crescimento por vídeo e por autor) e confere o crescimento calculado com
+o valor conhecido da simulação.
+
+Uso:
+    python -m benchmarks.tiktok_historico --videos 200000 --dias 10 --fracao 0.1
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analise_tiktok.historico import COLUNA_AUTOR, COLUNA_COLETA, ESTATISTICAS, HistoricoEstatisticas  # noqa: E402
+from benchmarks.tiktok_sintetico import COLETA_PADRAO, quadro_falso  # noqa: E402
+
+DIA_MS = 24 * 3600 * 1000
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--videos", type=int, default=200_000)
+    parser.add_argument("--dias", type=int, default=10)
+    parser.add_argument("--fracao", type=float, default=0.1)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    captura = quadro_falso(args.videos)[["id", COLUNA_AUTOR] + ESTATISTICAS]
+    captura = captura.astype({c: "Int32" for c in ESTATISTICAS})
+    inicial = captura[ESTATISTICAS].astype("int64").copy()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        pasta = Path(pasta)
+        historico = HistoricoEstatisticas(pasta / "historico")
+        tamanho_copias = 0
+        tempos, gravadas = [], []
+        mudancas = np.zeros(args.videos, dtype=np.int64)
+        for dia in range(args.dias):
+            if dia:
+                mudam = rng.random(args.videos) < args.fracao
+                mudancas += mudam
+                for coluna in ESTATISTICAS:
+                    ganho = rng.integers(1, 1000, mudam.sum())
+                    captura.loc[mudam, coluna] = captura.loc[mudam, coluna] + ganho
+            captura[COLUNA_COLETA] = COLETA_PADRAO + dia * DIA_MS
+
+            linhas, segundos = cronometrar(lambda: historico.registrar(captura))
+            tempos.append(segundos)
+            gravadas.append(linhas)
+            copia = pasta / "copias" / f"dia_{dia:02d}.parquet"
+            copia.parent.mkdir(exist_ok=True)
+            captura.to_parquet(copia, index=False, compression="zstd")
+            tamanho_copias += copia.stat().st_size
+
+        # Registrar a última captura de novo não grava nada
+        assert historico.registrar(captura) == 0
+
+        alvo = captura["id"].iloc[0]
+        serie, t_serie = cronometrar(lambda: historico.serie(alvo))
+        por_video, t_video = cronometrar(lambda: historico.crescimento())
+        por_autor, t_autor = cronometrar(lambda: historico.crescimento(por=COLUNA_AUTOR))
+        tamanho_historico = historico.tamanho_em_disco()
+
+    esperado = (captura[ESTATISTICAS].astype("int64") - inicial).set_axis(captura["id"])
+    obtido = por_video[ESTATISTICAS].reindex(esperado.index)
+    assert (obtido.astype("int64") == esperado).all().all(), "crescimento por vídeo errado"
+    assert por_autor["statsV2.playCount"].sum() == esperado["statsV2.playCount"].sum()
+    assert (por_video["retratos"].reindex(esperado.index) == 1 + mudancas).all()
+    assert len(serie) == 1 + mudancas[0]
+
+    print(f"📦 {args.videos} vídeos x {args.dias} capturas ({args.fracao:.0%} mudam por dia)")
+    print(f"💾 uma cópia por captura: {tamanho_copias / 2**20:.1f} MiB | "
+          f"histórico: {tamanho_historico / 2**20:.1f} MiB "
+          f"({tamanho_copias / tamanho_historico:.1f}x menor)")
+    print(f"✍️  linhas gravadas por captura: {gravadas}")
+    print(f"⏱️  registro: 1ª captura {tempos[0]:.2f} s, demais {np.mean(tempos[1:]):.2f} s em média")
+    print(f"🔎 série de um vídeo ({len(serie)} retratos): {t_serie * 1000:.0f} ms | "
+          f"crescimento por vídeo: {t_video:.2f} s | por autor: {t_autor:.2f} s")
+    print("✅ Crescimento por vídeo e por autor confere com a simulação")
+
+
+if __name__ == "__main__":
+    main()
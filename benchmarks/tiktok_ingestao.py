@@ -0,0 +1,93 @@
+"""
+BENCHMARK: ingestão de várias capturas sobrepostas (analise_tiktok/ingestao.py)
+
+Gera --arquivos capturas sintéticas que se sobrepõem (cada uma começa
+--passo vídeos depois da anterior, foi coletada um dia depois e tem
+estatísticas maiores) e mede:
+
+1. um arquivo por vez, como nos notebooks (ler_ndjson + concat + dedupe)
+2. `ingerir(processos=N)` com o cache vazio, para N = 1, 2, 4...
+3. `ingerir` de novo, com o cache em dia
+
+Confere que sobra um post por vídeo e que, numa amostra, cada vídeo ficou
+com as estatísticas da captura mais recente. O ganho do pool depende dos
+núcleos disponíveis (os.cpu_count() é mostrado).
+
+Uso:
+    python -m benchmarks.tiktok_ingestao --arquivos 4 --posts 25000 --passo 12500
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analise_tiktok.ingestao import COLUNA_COLETA, ingerir, manter_mais_recente  # noqa: E402
+from analise_tiktok.leitura import ler_ndjson  # noqa: E402
+from benchmarks.tiktok_sintetico import COLETA_PADRAO, gerar_captura, post_falso  # noqa: E402
+
+DIA_MS = 24 * 3600 * 1000
+N_AUTORES = 20_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--arquivos", type=int, default=4)
+    parser.add_argument("--posts", type=int, default=25_000)
+    parser.add_argument("--passo", type=int, default=12_500)
+    parser.add_argument("--processos", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as pasta:
+        bases = Path(pasta) / "bases"
+        bases.mkdir()
+        for i in range(args.arquivos):
+            gerar_captura(bases / f"captura_{i:02d}.ndjson", ids=range(i * args.passo, i * args.passo + args.posts),
+                          n_autores=N_AUTORES, coletado_em=COLETA_PADRAO + i * DIA_MS, crescimento=1 + 0.1 * i)
+        total_mb = sum(a.stat().st_size for a in bases.iterdir()) / 2**20
+
+        inicio = time.perf_counter()
+        um_por_vez = manter_mais_recente(pd.concat(
+            [ler_ndjson(a, metadados=[COLUNA_COLETA]) for a in sorted(bases.glob("*.ndjson"))],
+            ignore_index=True))
+        t_sequencial = time.perf_counter() - inicio
+
+        esperado = (args.arquivos - 1) * args.passo + args.posts
+        tempos = {}
+        for processos in args.processos:
+            resultado = ingerir(bases, processos=processos, pasta_cache=Path(pasta) / f"cache_{processos}")
+            assert len(resultado.dados) == esperado
+            tempos[processos] = resultado.segundos
+        quente = ingerir(bases, pasta_cache=Path(pasta) / f"cache_{args.processos[-1]}")
+
+    dados = quente.dados
+    assert len(dados) == dados["id"].nunique() == esperado, "sobrou vídeo repetido (ou faltou algum)"
+    assert sorted(dados["id"]) == sorted(um_por_vez["id"])
+    # Cada vídeo deve ter o playCount da última captura em que aparece
+    por_id = dados.set_index("id")
+    for indice in random.Random(0).sample(range(esperado), 1000):
+        ultima = min(indice // args.passo, args.arquivos - 1)
+        post = post_falso(indice, N_AUTORES, COLETA_PADRAO + ultima * DIA_MS, 1 + 0.1 * ultima)
+        linha = por_id.loc[post["item_id"]]
+        assert linha[COLUNA_COLETA] == post["timestamp_collected"]
+        assert linha["statsV2.playCount"] == int(post["data"]["statsV2"]["playCount"])
+
+    print(f"📂 {args.arquivos} capturas, {total_mb:.0f} MiB, {quente.linhas_lidas} posts, "
+          f"{quente.duplicados} duplicados -> {len(dados)} vídeos ({os.cpu_count()} núcleo(s) disponíveis)")
+    print(f"{'modo':<34}{'tempo s':>9}{'x 1 por vez':>13}")
+    print(f"{'um arquivo por vez':<34}{t_sequencial:>9.2f}{1:>12.1f}x")
+    for processos, segundos in tempos.items():
+        print(f"{f'ingerir, {processos} processo(s)':<34}{segundos:>9.2f}{t_sequencial / segundos:>12.1f}x")
+    print(f"{'ingerir, cache em dia':<34}{quente.segundos:>9.2f}{t_sequencial / quente.segundos:>12.1f}x")
+    print("✅ Um post por vídeo, sempre o retrato mais recente")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+BENCHMARK: read_json + json_normalize x leitura em blocos (analise_tiktok/leitura.py)
+
+Gera uma captura sintética do Zeeschuimer (benchmarks/tiktok_sintetico.py)
+e a carrega das duas formas, cada uma em um processo separado para medir o
+pico de memória (RSS máximo) de forma justa:
+
+1. aula: `pd.read_json(lines=True)` + `json_normalize(dados['data'])` +
+   `[colunas_desejadas]` + `astype(float)` no statsV2, como em aula_04
+2. blocos: `ler_ndjson(caminho, tamanho_bloco=..., tipos=TIPOS_TIKTOK)`
+   (os tipos das aulas, para comparar com o mesmo resultado)
+
+Os dois DataFrames são comparados (mesmas colunas, tipos e valores).
+O caminho da aula chega a ~20x o tamanho do arquivo em memória: cuidado
+com --posts alto em máquinas pequenas.
+
+Uso:
+    python -m benchmarks.tiktok_leitura --posts 50000 --bloco 10000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.append(str(RAIZ))
+
+
+def pico_memoria_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+
+def carregar_como_na_aula(caminho):
+    import pandas as pd
+
+    from analise_tiktok.leitura import COLUNAS_TIKTOK
+
+    dados = pd.read_json(caminho, lines=True)
+    dados3 = pd.json_normalize(dados["data"])[COLUNAS_TIKTOK].copy()
+    for coluna in ("collectCount", "commentCount", "diggCount", "playCount", "shareCount"):
+        dados3[f"statsV2.{coluna}"] = dados3[f"statsV2.{coluna}"].astype(float)
+    return dados3
+
+
+def rodar_modo(modo: str, caminho: str, bloco: int):
+    """Executado no processo filho; grava o DataFrame e imprime as medidas em JSON"""
+    import pandas as pd  # noqa: F401  (entra na memória base)
+
+    from analise_tiktok.esquema import TIPOS_TIKTOK
+    from analise_tiktok.leitura import ler_ndjson
+
+    base = pico_memoria_mb()
+    inicio = time.perf_counter()
+    df = carregar_como_na_aula(caminho) if modo == "aula" else ler_ndjson(caminho, tamanho_bloco=bloco, tipos=TIPOS_TIKTOK)
+    segundos = time.perf_counter() - inicio
+    pico = pico_memoria_mb()
+    df.to_pickle(f"{caminho}.{modo}.pkl")
+    print(json.dumps({"segundos": segundos, "pico_mb": pico, "base_mb": base}))
+
+
+def medir(modo: str, caminho: Path, bloco: int) -> dict:
+    saida = subprocess.run([sys.executable, "-m", "benchmarks.tiktok_leitura", "--modo", modo,
+                            "--caminho", str(caminho), "--bloco", str(bloco)],
+                           cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=50_000)
+    parser.add_argument("--bloco", type=int, default=10_000)
+    parser.add_argument("--modo", choices=["aula", "blocos"], help=argparse.SUPPRESS)
+    parser.add_argument("--caminho", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.modo:
+        rodar_modo(args.modo, args.caminho, args.bloco)
+        return
+
+    import pandas as pd
+
+    from benchmarks.tiktok_sintetico import gerar_captura
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = gerar_captura(Path(pasta) / "captura.ndjson", args.posts)
+        tamanho_mb = caminho.stat().st_size / 2**20
+        aula = medir("aula", caminho, args.bloco)
+        blocos = medir("blocos", caminho, args.bloco)
+        pd.testing.assert_frame_equal(pd.read_pickle(f"{caminho}.aula.pkl"),
+                                      pd.read_pickle(f"{caminho}.blocos.pkl"))
+
+    print(f"📦 {args.posts} posts, {tamanho_mb:.0f} MiB de NDJSON, blocos de {args.bloco}")
+    print(f"{'modo':<32}{'tempo s':>9}{'pico MiB':>10}{'acima da base':>15}")
+    for nome, r in (("read_json + json_normalize", aula), ("ler_ndjson em blocos", blocos)):
+        print(f"{nome:<32}{r['segundos']:>9.2f}{r['pico_mb']:>10.0f}{r['pico_mb'] - r['base_mb']:>15.0f}")
+    acima = (aula["pico_mb"] - aula["base_mb"]) / max(blocos["pico_mb"] - blocos["base_mb"], 1)
+    print(f"\n⚡ {aula['segundos'] / blocos['segundos']:.1f}x mais rápido, "
+          f"{acima:.1f}x menos memória; DataFrames idênticos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+CAPTURAS SINTÉTICAS DO ZEESCHUIMER (TikTok) PARA OS BENCHMARKS
+
+As bases reais (`bases/*.ndjson`) não vêm com o repositório. Este módulo
+gera arquivos com a mesma estrutura de uma exportação do Zeeschuimer: uma
+linha JSON por post, com os metadados da coleta na raiz e o item do TikTok
+em "data" (vídeo, autor, música, challenges, stats, statsV2 com números em
+texto, authorStats, textExtra...).
+
+Cada vídeo é determinístico (mesmo id = mesmo autor, texto e hashtags), o
+que permite gerar capturas que se sobrepõem e recapturas do mesmo vídeo
+com estatísticas maiores, como acontece na prática.
+
+Para benchmarks que começam depois da leitura (1 milhão de posts ou mais),
+`quadro_falso` monta direto, com NumPy, um DataFrame como o de `ler_ndjson`.
+
+Uso:
+    gerar_captura("israel.ndjson", n_posts=100_000)
+    gerar_captura("dia2.ndjson", ids=range(50_000, 150_000), coletado_em=..., crescimento=1.3)
+    dados = quadro_falso(1_000_000)
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+HASHTAGS = [f"tag{i}" for i in range(2000)] + ["fyp", "foryou", "viral", "jiujitsu", "bjj", "israel"]
+PESOS_HASHTAGS = [1 / (i + 1) for i in range(len(HASHTAGS))]
+INICIO_POSTS = 1_600_000_000      # createTime mínimo (2020-09)
+COLETA_PADRAO = 1_735_689_600_000  # 2025-01-01, em milissegundos
+
+
+def _autor(indice: int) -> dict:
+    return {
+        "id": str(6_800_000_000_000_000_000 + indice),
+        "uniqueId": f"usuario_{indice}",
+        "nickname": f"Usuário {indice}",
+        "avatarThumb": f"https://p16.tiktokcdn.com/avatar/{indice}~100x100.jpeg",
+        "avatarMedium": f"https://p16.tiktokcdn.com/avatar/{indice}~720x720.jpeg",
+        "avatarLarger": f"https://p16.tiktokcdn.com/avatar/{indice}~1080x1080.jpeg",
+        "signature": f"Bio do usuário {indice} 🥋",
+        "verified": indice % 50 == 0,
+        "secUid": f"MS4wLjABAAAA{indice:012d}",
+        "secret": False, "ftc": False, "relation": 0, "openFavorite": False,
+        "commentSetting": 0, "duetSetting": 0, "stitchSetting": 0,
+        "privateAccount": False, "downloadSetting": 0,
+    }
+
+
+def post_falso(indice: int, n_autores: int, coletado_em: int = COLETA_PADRAO,
+               crescimento: float = 1.0) -> dict:
+    """Uma linha do Zeeschuimer para o vídeo `indice`"""
+    rng = random.Random(indice)
+    # poucos autores com muitos vídeos, muitos com poucos
+    autor = min(int(rng.paretovariate(1.2)) - 1, n_autores - 1)
+    video_id = str(7_100_000_000_000_000_000 + indice)
+    hashtags = rng.choices(HASHTAGS, weights=PESOS_HASHTAGS, k=rng.randint(0, 6))
+    criado = INICIO_POSTS + rng.randint(0, 130_000_000)
+    plays = int(rng.lognormvariate(9, 2) * crescimento)
+    likes = int(plays * rng.uniform(0.01, 0.15))
+    stats = {"diggCount": likes, "shareCount": int(likes * rng.uniform(0, 0.1)),
+             "commentCount": int(likes * rng.uniform(0, 0.05)), "playCount": plays,
+             "collectCount": int(likes * rng.uniform(0, 0.08))}
+    seguidores = int(rng.lognormvariate(8, 2.5))
+
+    data = {
+        "id": video_id,
+        "desc": " ".join([f"Vídeo {indice} sobre treino e competição"] + [f"#{h}" for h in hashtags]),
+        "createTime": criado,
+        "scheduleTime": 0,
+        "video": {
+            "id": video_id, "height": 1024, "width": 576, "duration": rng.randint(5, 180),
+            "ratio": "540p", "cover": f"https://p16.tiktokcdn.com/obj/{video_id}.jpeg",
+            "originCover": f"https://p16.tiktokcdn.com/origin/{video_id}.jpeg",
+            "dynamicCover": f"https://p16.tiktokcdn.com/dyn/{video_id}.webp",
+            "playAddr": f"https://v16.tiktokcdn.com/{video_id}/play.mp4",
+            "downloadAddr": f"https://v16.tiktokcdn.com/{video_id}/download.mp4",
+            "shareCover": ["", f"https://p16.tiktokcdn.com/share/{video_id}.jpeg"],
+            "bitrate": rng.randint(300_000, 2_000_000), "encodedType": "normal", "format": "mp4",
+            "videoQuality": "normal", "codecType": "h264", "definition": "540p",
+            "volumeInfo": {"Loudness": -14.2, "Peak": 0.89},
+            "bitrateInfo": [{"Bitrate": 800_000, "QualityType": 10, "GearName": "normal_540_0",
+                             "PlayAddr": {"UrlList": [f"https://v16.tiktokcdn.com/{video_id}/{q}.mp4"
+                                                      for q in range(3)]}}],
+        },
+        "author": _autor(autor),
+        "music": {
+            "id": str(6_900_000_000_000_000_000 + indice % 5000),
+            "title": f"som original - usuario_{autor}" if rng.random() < 0.6 else f"Música {indice % 5000}",
+            "playUrl": f"https://sf16.tiktokcdn.com/music/{indice % 5000}.mp3",
+            "coverThumb": "https://p16.tiktokcdn.com/music/thumb.jpeg",
+            "authorName": f"Usuário {autor}", "original": rng.random() < 0.6,
+            "duration": rng.randint(5, 60), "album": "",
+        },
+        "challenges": [{"id": str(1_000 + HASHTAGS.index(h)), "title": h, "desc": "",
+                        "profileThumb": "", "coverThumb": "", "isCommerce": False}
+                       for h in dict.fromkeys(hashtags)],
+        "stats": stats,
+        # No statsV2 os números vêm como texto
+        "statsV2": {**{k: str(v) for k, v in stats.items()}, "repostCount": "0"},
+        "authorStats": {"followingCount": rng.randint(0, 2000), "followerCount": seguidores,
+                        "heartCount": seguidores * 10, "videoCount": rng.randint(1, 900),
+                        "diggCount": rng.randint(0, 50_000), "heart": seguidores * 10},
+        "textExtra": [{"awemeId": "", "start": 0, "end": len(h) + 1, "hashtagId": str(1_000 + HASHTAGS.index(h)),
+                       "hashtagName": h, "type": 1, "subType": 0, "isCommerce": False}
+                      for h in hashtags],
+        "duetInfo": {"duetFromId": "0"}, "secret": False, "forFriend": False, "digged": False,
+        "itemCommentStatus": 0, "showNotPass": False, "vl1": False, "itemMute": False,
+        "privateItem": False, "duetEnabled": True, "stitchEnabled": True, "shareEnabled": True,
+        "isAd": False, "collected": False,
+    }
+    return {
+        "nav_index": f"1:1:{indice}",
+        "item_id": video_id,
+        "timestamp_collected": coletado_em,
+        "source_platform": "tiktok.com",
+        "source_platform_url": "https://www.tiktok.com/search?q=jiujitsu",
+        "source_url": "https://www.tiktok.com/api/search/general/full/",
+        "user_agent": "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0",
+        "data": data,
+    }
+
+
+def gerar_captura(caminho, n_posts: Optional[int] = None, ids: Optional[Iterable[int]] = None,
+                  n_autores: int = 20_000, coletado_em: int = COLETA_PADRAO,
+                  crescimento: float = 1.0) -> Path:
+    """Escreve uma captura NDJSON com os vídeos `ids` (ou 0..n_posts-1)"""
+    caminho = Path(caminho)
+    ids = range(n_posts) if ids is None else ids
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        for indice in ids:
+            linha = post_falso(indice, n_autores, coletado_em, crescimento)
+            arquivo.write(json.dumps(linha, ensure_ascii=False) + "\n")
+    return caminho
+
+
+def quadro_falso(n_posts: int, n_autores: int = 20_000, semente: int = 42) -> pd.DataFrame:
+    """DataFrame com as COLUNAS_TIKTOK e os tipos de `ler_ndjson`, sem passar pelo NDJSON"""
+    rng = np.random.default_rng(semente)
+    autor = np.minimum(rng.pareto(1.2, n_posts).astype(np.int64), n_autores - 1)
+    n_tags = rng.integers(0, 7, n_posts)
+    pesos = np.array(PESOS_HASHTAGS) / sum(PESOS_HASHTAGS)
+    sorteio = np.array(HASHTAGS, dtype=object)[rng.choice(len(HASHTAGS), n_tags.sum(), p=pesos)].tolist()
+    limites = np.concatenate([[0], np.cumsum(n_tags)]).tolist()
+    challenges = [[{"id": "", "title": t, "desc": ""} for t in dict.fromkeys(sorteio[limites[i]:limites[i + 1]])]
+                  for i in range(n_posts)]
+    plays = rng.lognormal(9, 2, n_posts).astype(np.int64)
+    likes = (plays * rng.uniform(0.01, 0.15, n_posts)).astype(np.int64)
+    seguidores = rng.lognormal(8, 2.5, n_posts).astype(np.int64)
+    texto_autor = autor.astype(str)
+    return pd.DataFrame({
+        "id": (7_100_000_000_000_000_000 + np.arange(n_posts)).astype(str),
+        "desc": [f"Vídeo {i} sobre treino e competição" for i in range(n_posts)],
+        "challenges": challenges,
+        "createTime": INICIO_POSTS + rng.integers(0, 130_000_000, n_posts),
+        "video.duration": rng.integers(5, 181, n_posts),
+        "video.cover": np.char.add("https://p16.tiktokcdn.com/obj/", np.arange(n_posts).astype(str)),
+        "author.id": (6_800_000_000_000_000_000 + autor).astype(str),
+        "author.nickname": np.char.add("Usuário ", texto_autor),
+        "author.uniqueId": np.char.add("usuario_", texto_autor),
+        "author.verified": autor % 50 == 0,
+        "music.title": np.char.add("Música ", (np.arange(n_posts) % 5000).astype(str)),
+        "authorStats.followingCount": rng.integers(0, 2001, n_posts),
+        "authorStats.followerCount": seguidores,
+        "authorStats.heartCount": seguidores * 10,
+        "authorStats.videoCount": rng.integers(1, 901, n_posts),
+        "authorStats.diggCount": rng.integers(0, 50_001, n_posts),
+        "authorStats.heart": seguidores * 10,
+        "statsV2.collectCount": (likes * rng.uniform(0, 0.08, n_posts)).astype(np.int64).astype(float),
+        "statsV2.commentCount": (likes * rng.uniform(0, 0.05, n_posts)).astype(np.int64).astype(float),
+        "statsV2.diggCount": likes.astype(float),
+        "statsV2.playCount": plays.astype(float),
+        "statsV2.shareCount": (likes * rng.uniform(0, 0.1, n_posts)).astype(np.int64).astype(float),
+    })
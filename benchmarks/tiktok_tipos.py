@@ -0,0 +1,58 @@
+"""
+BENCHMARK: tipos das aulas x TIPOS_COMPACTOS (analise_tiktok/esquema.py)
+
+Monta um DataFrame sintético com os tipos das aulas (statsV2 em float64,
+inteiros em int64, autor como texto) e aplica o esquema compacto. Mostra a
+memória de cada coluna antes e depois e confere que as contas das aulas
+(soma, média, mediana, idxmax e média por autor) dão o mesmo resultado.
+Também mede o tempo dessas contas nos dois casos.
+
+Uso:
+    python -m benchmarks.tiktok_tipos --posts 1000000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from analise_tiktok.esquema import TIPOS_COMPACTOS, agregados, aplicar_tipos, relatorio_memoria  # noqa: E402
+from benchmarks.tiktok_sintetico import quadro_falso  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    antes = quadro_falso(args.posts)
+    inicio = time.perf_counter()
+    depois = aplicar_tipos(antes.copy(), TIPOS_COMPACTOS)
+    t_conversao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    contas_antes = agregados(antes)
+    t_antes = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    contas_depois = agregados(depois)
+    t_depois = time.perf_counter() - inicio
+    assert contas_antes == contas_depois, "agregados diferentes"
+
+    with pd.option_context("display.width", 120, "display.max_columns", None,
+                           "display.float_format", "{:.2f}".format):
+        print(f"📦 {args.posts} posts (conversão: {t_conversao:.2f} s)\n")
+        print(relatorio_memoria(antes, depois))
+    total = relatorio_memoria(antes, depois).loc["TOTAL"]
+    sem_listas = relatorio_memoria(antes.drop(columns="challenges"), depois.drop(columns="challenges")).loc["TOTAL"]
+    print(f"\n📉 {total['MiB_antes']:.0f} -> {total['MiB_depois']:.0f} MiB ({total['reducao']:.1f}x); "
+          f"sem a coluna challenges: {sem_listas['reducao']:.1f}x")
+    print(f"⏱️  Contas das aulas: {t_antes:.2f} s -> {t_depois:.2f} s")
+    print("✅ Soma, média, mediana, idxmax e média por autor idênticos")
+
+
+if __name__ == "__main__":
+    main()